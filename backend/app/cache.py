@@ -0,0 +1,179 @@
+"""
+Content-addressed cache of serialized parse results.
+
+Keys are the SHA-256 of the uploaded PDF plus the parser version, so a
+parser change never serves stale output. Values are the exact JSON bytes
+returned by ``/api/parse``. A bounded in-memory LRU sits in front of an
+optional SQLite file that survives restarts. The file is bounded too:
+every write purges expired rows, then the oldest ones past ``disk_max_bytes``.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from app import metrics
+from app.config import Settings
+
+
+def cache_key(file_bytes: bytes, parser_version: str) -> str:
+    """Return the cache key for an uploaded PDF."""
+    return digest_cache_key(hashlib.sha256(file_bytes).hexdigest(), parser_version)
+
+
+def digest_cache_key(digest: str, parser_version: str) -> str:
+    """Return the cache key for a PDF whose SHA-256 hex digest is known."""
+    return f"{digest}:{parser_version}"
+
+
+class ResultCache:
+    """Two-tier (memory LRU + optional SQLite) cache with TTL eviction."""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 24 * 60 * 60,
+        path: str | None = None,
+        disk_max_bytes: int = 1024 * 1024 * 1024,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.disk_max_bytes = disk_max_bytes
+        self._memory: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        # SQLite has its own lock, so a commit never holds up memory hits
+        self._db_lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self._disk_bytes = 0
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.executescript(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS results_expiry ON results (expires_at);"
+            )
+            self._disk_bytes = self._db.execute(
+                "SELECT COALESCE(SUM(LENGTH(value)), 0) FROM results"
+            ).fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ResultCache":
+        return cls(
+            max_entries=settings.cache_entries,
+            max_bytes=settings.cache_max_bytes,
+            ttl=settings.cache_ttl,
+            path=settings.cache_path or None,
+            disk_max_bytes=settings.cache_disk_max_bytes,
+        )
+
+    def get(self, key: str) -> bytes | None:
+        """The cached value, or None; with a SQLite file a miss in memory
+        reads it, so run it in a thread from async code."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    metrics.inc("extrato_cache_hits_total")
+                    return value
+                self._evict(key)
+
+        row = self._disk_get(key, now)
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                metrics.inc("extrato_cache_misses_total")
+                return None
+            value, expires_at = row
+            self.hits += 1
+            self.disk_hits += 1
+            metrics.inc("extrato_cache_hits_total")
+            # Promote so the next hit skips SQLite
+            self._memory_put(key, value, expires_at)
+            return value
+
+    def put(self, key: str, value: bytes) -> None:
+        """Store ``value``; with a SQLite file this writes and commits, so
+        run it in a thread from async code."""
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._memory_put(key, value, expires_at)
+        if self._db is not None and len(value) <= self.disk_max_bytes:
+            with self._db_lock:
+                self._disk_put(key, value, expires_at)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "entries": len(self._memory),
+                "bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes,
+                "persistent": self._db is not None,
+            }
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _memory_put(self, key: str, value: bytes, expires_at: float) -> None:
+        if len(value) > self.max_bytes:
+            return
+        if key in self._memory:
+            self._evict(key)
+        self._memory[key] = (expires_at, value)
+        self._memory_bytes += len(value)
+        while len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes:
+            self._evict(next(iter(self._memory)))
+
+    def _evict(self, key: str) -> None:
+        _, value = self._memory.pop(key)
+        self._memory_bytes -= len(value)
+
+    def _disk_get(self, key: str, now: float) -> tuple[bytes, float] | None:
+        with self._db_lock:
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT value, expires_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        # An expired row is left for the next put to purge
+        if row is None or row[1] <= now:
+            return None
+        return row
+
+    def _disk_put(self, key: str, value: bytes, expires_at: float) -> None:
+        db = self._db
+        replaced = db.execute(
+            "DELETE FROM results WHERE key = ? OR expires_at <= ? RETURNING LENGTH(value)",
+            (key, time.time()),
+        ).fetchall()
+        self._disk_bytes -= sum(size for (size,) in replaced)
+        db.execute(
+            "INSERT INTO results (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, expires_at),
+        )
+        self._disk_bytes += len(value)
+        # Rows share one TTL, so the soonest to expire are the oldest
+        while self._disk_bytes > self.disk_max_bytes:
+            (size,) = db.execute(
+                "DELETE FROM results WHERE key = (SELECT key FROM results ORDER BY expires_at"
+                " LIMIT 1) RETURNING LENGTH(value)"
+            ).fetchone()
+            self._disk_bytes -= size
+        db.commit()
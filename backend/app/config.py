@@ -0,0 +1,95 @@
+"""Runtime settings, read from ``EXTRATO_*`` environment variables."""
+
+import os
+from dataclasses import dataclass, field
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    return value.lower() not in ("0", "false", "no", "off") if value else default
+
+
+@dataclass(frozen=True)
+class Settings:
+    # Process pool: 0 workers runs jobs in a thread (no isolation, no kill on timeout)
+    workers: int = field(default_factory=lambda: _env_int("EXTRATO_WORKERS", os.cpu_count() or 1))
+    # Jobs allowed to wait for a free worker before we answer 503
+    max_queue: int = field(default_factory=lambda: _env_int("EXTRATO_MAX_QUEUE", 16))
+    # Seconds a single parse may run before its worker is killed
+    job_timeout: float = field(default_factory=lambda: _env_float("EXTRATO_JOB_TIMEOUT", 60.0))
+    # Spawn and warm up the workers at startup instead of on the first parse
+    prewarm: bool = field(default_factory=lambda: _env_bool("EXTRATO_PREWARM", False))
+    # Retry-After hint (seconds) sent with 503 responses
+    retry_after: int = field(default_factory=lambda: _env_int("EXTRATO_RETRY_AFTER", 5))
+
+    # Text extraction backend: "pdfplumber" or "pdfium" (?extractor= overrides it per request)
+    extractor: str = field(default_factory=lambda: os.environ.get("EXTRATO_EXTRACTOR", "pdfplumber"))
+
+    # Statements with more pages than this are extracted in parallel page
+    # ranges, one per worker (0 = always one worker per statement)
+    split_pages: int = field(default_factory=lambda: _env_int("EXTRATO_SPLIT_PAGES", 0))
+
+    # Uploads: per-file and per-request size caps (0 = unlimited); files
+    # above spool_bytes are written to a temp file in spool_dir for workers
+    max_upload_bytes: int = field(
+        default_factory=lambda: _env_int("EXTRATO_MAX_UPLOAD_BYTES", 50 * 1024 * 1024)
+    )
+    max_request_bytes: int = field(
+        default_factory=lambda: _env_int("EXTRATO_MAX_REQUEST_BYTES", 256 * 1024 * 1024)
+    )
+    spool_bytes: int = field(default_factory=lambda: _env_int("EXTRATO_SPOOL_BYTES", 1024 * 1024))
+    spool_dir: str = field(default_factory=lambda: os.environ.get("EXTRATO_SPOOL_DIR", ""))
+
+    # Parse result cache: in-memory LRU limits, TTL, optional SQLite file and its size cap
+    cache_entries: int = field(default_factory=lambda: _env_int("EXTRATO_CACHE_ENTRIES", 256))
+    cache_max_bytes: int = field(
+        default_factory=lambda: _env_int("EXTRATO_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+    )
+    cache_ttl: float = field(default_factory=lambda: _env_float("EXTRATO_CACHE_TTL", 86400.0))
+    cache_path: str = field(default_factory=lambda: os.environ.get("EXTRATO_CACHE_PATH", ""))
+    cache_disk_max_bytes: int = field(
+        default_factory=lambda: _env_int("EXTRATO_CACHE_DISK_MAX_BYTES", 1024 * 1024 * 1024)
+    )
+
+    # /api/parse/batch: files parsed concurrently per request, and per-request cap
+    batch_concurrency: int = field(
+        default_factory=lambda: _env_int("EXTRATO_BATCH_CONCURRENCY", os.cpu_count() or 1)
+    )
+    batch_max_files: int = field(default_factory=lambda: _env_int("EXTRATO_BATCH_MAX_FILES", 100))
+
+    # Background jobs (/api/jobs): queue directory (default: <tmp>/extrato-jobs),
+    # jobs parsed at once, attempts before a job fails, seconds finished jobs are kept,
+    # seconds without a heartbeat before another process may take over a running job
+    jobs_dir: str = field(default_factory=lambda: os.environ.get("EXTRATO_JOBS_DIR", ""))
+    jobs_concurrency: int = field(
+        default_factory=lambda: _env_int("EXTRATO_JOBS_CONCURRENCY", os.cpu_count() or 1)
+    )
+    job_max_attempts: int = field(default_factory=lambda: _env_int("EXTRATO_JOB_MAX_ATTEMPTS", 3))
+    job_ttl: float = field(default_factory=lambda: _env_float("EXTRATO_JOB_TTL", 7 * 86400.0))
+    job_lease: float = field(default_factory=lambda: _env_float("EXTRATO_JOB_LEASE", 60.0))
+
+    # Transaction store (/api/ingest): SQLite file (default: <tmp>/extrato-store.db)
+    store_path: str = field(default_factory=lambda: os.environ.get("EXTRATO_STORE_PATH", ""))
+
+    # Google Sheets export: API base URL (point at a fake server in tests), rows per append call
+    sheets_url: str = field(
+        default_factory=lambda: os.environ.get("EXTRATO_SHEETS_URL", "https://sheets.googleapis.com")
+    )
+    sheets_chunk_rows: int = field(default_factory=lambda: _env_int("EXTRATO_SHEETS_CHUNK_ROWS", 1000))
+    sheets_max_retries: int = field(default_factory=lambda: _env_int("EXTRATO_SHEETS_MAX_RETRIES", 5))
+
+    # Attach a cProfile report to every /api/parse response (X-Profile: 1 does it per request)
+    profile: bool = field(default_factory=lambda: _env_bool("EXTRATO_PROFILE", False))
+
+
+settings = Settings()
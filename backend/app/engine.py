@@ -0,0 +1,372 @@
+"""
+Bounded process-pool execution layer for PDF extraction.
+
+pdfplumber's layout analysis is CPU-bound pure Python, so running it on the
+event loop stalls every other request. The engine pushes jobs to a pool of
+worker processes, caps how many jobs may be in flight, and kills workers
+that blow past the per-job timeout.
+"""
+
+import asyncio
+import itertools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, AsyncIterator, Callable, Iterator
+
+from app import metrics
+from app.config import Settings
+
+
+class EngineBusy(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Too many PDFs being parsed, try again later.")
+        self.retry_after = retry_after
+
+
+class JobTimeout(Exception):
+    """Raised when a job runs longer than the configured timeout."""
+
+
+def _call(fn: Callable[..., Any], args: tuple) -> tuple[Any, list]:
+    """Worker side of :meth:`ExtractionEngine.run`: return the result along
+    with the metric updates the job made."""
+    with metrics.capture() as events:
+        return fn(*args), events
+
+
+def _pump(fn: Callable[..., Iterator[Any]], args: tuple, items, stop) -> None:
+    """Worker side of :meth:`ExtractionEngine.stream`: forward each item
+    until the generator is exhausted or ``stop`` is set."""
+    error = None
+    with metrics.capture() as events:
+        try:
+            for item in fn(*args):
+                if stop.is_set():
+                    break
+                items.put(("item", item))
+        except Exception as e:
+            error = e
+    items.put(("metrics", events))
+    items.put(("error", error) if error is not None else ("done", None))
+
+
+class _Feed:
+    """Puts a pool worker's stream items on the engine's shared queue,
+    tagged with the stream they belong to."""
+
+    def __init__(self, shared, key: int):
+        self.shared = shared
+        self.key = key
+
+    def put(self, item) -> None:
+        self.shared.put((self.key, item))
+
+
+class _LocalFeed:
+    """Puts an inline (thread) stream's items straight on its asyncio queue."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, items: asyncio.Queue):
+        self.loop = loop
+        self.items = items
+
+    def put(self, item) -> None:
+        self.loop.call_soon_threadsafe(self.items.put_nowait, item)
+
+
+class ExtractionEngine:
+    """Run CPU-bound callables in a process pool with admission control.
+
+    ``max_workers`` processes run jobs; up to ``max_queue`` more may wait.
+    Anything beyond that is rejected with :class:`EngineBusy`. With
+    ``max_workers=0`` jobs run in a thread instead (handy for tests and
+    debugging, but timed-out jobs cannot be killed).
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue: int = 0,
+        timeout: float | None = None,
+        retry_after: int = 5,
+    ):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._executor: ProcessPoolExecutor | None = None
+        self._initializer: Callable[..., Any] | None = None
+        self._initargs: tuple = ()
+        self._manager = None
+        # Every stream's items arrive on one queue, read by one thread
+        self._shared = None
+        self._streams: dict[int, tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = {}
+        self._keys = itertools.count()
+        self._generation = 0
+        self._in_flight = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ExtractionEngine":
+        return cls(
+            max_workers=settings.workers,
+            max_queue=settings.max_queue,
+            timeout=settings.job_timeout,
+            retry_after=settings.retry_after,
+        )
+
+    @property
+    def capacity(self) -> int:
+        return max(self.max_workers, 1) + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self._initializer,
+                initargs=self._initargs,
+            )
+            self._generation += 1
+        return self._executor
+
+    def _get_manager(self):
+        # Queues that can be handed to pool workers must come from a manager
+        if self._manager is None:
+            self._manager = multiprocessing.get_context("spawn").Manager()
+            self._shared = self._manager.Queue()
+            threading.Thread(target=self._dispatch, args=(self._shared,), daemon=True).start()
+        return self._manager
+
+    def _dispatch(self, shared) -> None:
+        """Hand items from the shared queue to the streams' asyncio queues;
+        items of a stream whose consumer left are dropped."""
+        while True:
+            try:
+                message = shared.get()
+            except (EOFError, OSError):  # the manager shut down
+                return
+            if message is None:
+                return
+            key, item = message
+            target = self._streams.get(key)
+            if target is not None:
+                loop, items = target
+                try:
+                    loop.call_soon_threadsafe(items.put_nowait, item)
+                except RuntimeError:  # the loop is closed
+                    pass
+
+    async def start(self, initializer: Callable[..., Any] | None = None, *initargs: Any) -> None:
+        """Spawn the workers (and the stream queue manager) now instead of
+        on the first parse.
+
+        Every worker, including those spawned after a recycle, runs
+        ``initializer(*initargs)`` before it takes its first job. This
+        returns once the workers are spawned and at least one of them has
+        finished that, so jobs never wait on a cold worker.
+        """
+        self._initializer, self._initargs = initializer, initargs
+        if self.max_workers == 0:
+            if initializer is not None:
+                await asyncio.to_thread(initializer, *initargs)
+            return
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        # The pool spawns one more worker per job submitted while none is idle
+        await asyncio.gather(
+            *(loop.run_in_executor(executor, os.getpid) for _ in range(self.max_workers)),
+            asyncio.to_thread(self._get_manager),
+        )
+
+    def deadline(self) -> float | None:
+        """Event loop time by which a job started now must finish; pass it
+        to every step of work split over several calls, so they share one
+        timeout."""
+        if self.timeout is None:
+            return None
+        return asyncio.get_running_loop().time() + self.timeout
+
+    def _timeout(self, deadline: float | None) -> float | None:
+        if deadline is None:
+            return self.timeout
+        return max(deadline - asyncio.get_running_loop().time(), 0)
+
+    def _recycle(self) -> None:
+        """Kill all workers (including a runaway one) and drop the pool."""
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        for process in list((executor._processes or {}).values()):
+            process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn: Callable[..., Any], *args: Any, deadline: float | None = None) -> Any:
+        """Run ``fn(*args)`` off the event loop and return its result.
+
+        It times out after the engine's timeout, or at ``deadline`` (see
+        :meth:`deadline`) when given.
+        """
+        if self._in_flight >= self.capacity:
+            raise EngineBusy(self.retry_after)
+
+        self._in_flight += 1
+        try:
+            result, events = await self._call(fn, args, self._timeout(deadline))
+            metrics.replay(events)
+            return result
+        except asyncio.TimeoutError:
+            raise JobTimeout(f"Parsing took longer than {self.timeout:g}s.") from None
+        finally:
+            self._in_flight -= 1
+
+    async def map(
+        self, fn: Callable[..., Any], arg_tuples: list[tuple], deadline: float | None = None
+    ) -> list[Any]:
+        """Run ``fn(*args)`` for every tuple at once, one per worker as they
+        free up, and return the results in order.
+
+        The calls are admitted as a single job: they split one request's
+        work rather than adding to the load. They share one timeout, and a
+        call that runs past it is killed as in :meth:`run`.
+        """
+        if self._in_flight >= self.capacity:
+            raise EngineBusy(self.retry_after)
+
+        self._in_flight += 1
+        try:
+            if deadline is None:
+                deadline = self.deadline()
+            tasks = [
+                asyncio.ensure_future(self._call(fn, args, self._timeout(deadline)))
+                for args in arg_tuples
+            ]
+            try:
+                done = await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                raise
+            results = []
+            for result, events in done:
+                metrics.replay(events)
+                results.append(result)
+            return results
+        except asyncio.TimeoutError:
+            raise JobTimeout(f"Parsing took longer than {self.timeout:g}s.") from None
+        finally:
+            self._in_flight -= 1
+
+    async def _call(self, fn: Callable[..., Any], args: tuple, timeout: float | None) -> tuple:
+        if self.max_workers == 0:
+            return await asyncio.wait_for(asyncio.to_thread(_call, fn, args), timeout)
+        return await self._run_in_pool(_call, (fn, args), timeout)
+
+    async def _run_in_pool(self, fn: Callable[..., Any], args: tuple, timeout: float | None) -> Any:
+        loop = asyncio.get_running_loop()
+        # A pool recycled because of *another* job's timeout takes our job
+        # down with it; that is not this job's fault, so retry it once.
+        for attempt in range(2):
+            executor = self._get_executor()
+            generation = self._generation
+            future = loop.run_in_executor(executor, fn, *args)
+            try:
+                return await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                if generation == self._generation:
+                    self._recycle()
+                raise
+            except BrokenProcessPool:
+                if generation == self._generation:
+                    self._recycle()
+                if attempt:
+                    raise
+        raise AssertionError("unreachable")
+
+    async def stream(self, fn: Callable[..., Iterator[Any]], *args: Any) -> AsyncIterator[Any]:
+        """Run generator function ``fn(*args)`` off the event loop, yielding
+        its items as the worker produces them.
+
+        Admission control and the timeout (for the whole stream) work as in
+        :meth:`run`. Waiting for items holds no thread. When the consumer
+        stops early (closes the iterator, or its task is cancelled) the
+        worker stops after the item it is producing.
+        """
+        if self._in_flight >= self.capacity:
+            raise EngineBusy(self.retry_after)
+
+        self._in_flight += 1
+        loop = asyncio.get_running_loop()
+        items: asyncio.Queue = asyncio.Queue()
+        key = next(self._keys)
+        future = None
+        finished = False
+        try:
+            if self.max_workers == 0:
+                stop = threading.Event()
+                future = asyncio.ensure_future(
+                    asyncio.to_thread(_pump, fn, args, _LocalFeed(loop, items), stop)
+                )
+                generation = None
+            else:
+                stop = self._get_manager().Event()
+                self._streams[key] = (loop, items)
+                future = loop.run_in_executor(
+                    self._get_executor(), _pump, fn, args, _Feed(self._shared, key), stop
+                )
+                generation = self._generation
+
+            deadline = None if self.timeout is None else loop.time() + self.timeout
+            while True:
+                getter = asyncio.ensure_future(items.get())
+                # Once the worker returned, its last items are still on the way
+                waiting = {getter} if future.done() else {getter, future}
+                timeout = None if deadline is None else max(deadline - loop.time(), 0)
+                done, _ = await asyncio.wait(
+                    waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if getter not in done:
+                    getter.cancel()
+                    if future.done():
+                        # Raises if the worker died (e.g. its pool was recycled)
+                        future.result()
+                    if deadline is not None and loop.time() >= deadline:
+                        if generation is not None and generation == self._generation:
+                            self._recycle()
+                        raise JobTimeout(f"Parsing took longer than {self.timeout:g}s.")
+                    continue
+
+                kind, value = getter.result()
+                if kind == "item":
+                    yield value
+                elif kind == "metrics":
+                    metrics.replay(value)
+                elif kind == "error":
+                    finished = True
+                    raise value
+                else:
+                    finished = True
+                    return
+        finally:
+            self._streams.pop(key, None)
+            if not finished and future is not None:
+                stop.set()
+                future.cancel()
+            self._in_flight -= 1
+
+    def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        manager, self._manager = self._manager, None
+        if manager is not None:
+            self._shared.put(None)
+            self._shared = None
+            manager.shutdown()
@@ -0,0 +1,15 @@
+"""
+Exporters that write parsed transactions to files and external destinations.
+"""
+
+from app.export.formats import FormatUnavailable, TabularWriter, new_writer
+from app.export.sheets import ExportStats, SheetsClient, SheetsError
+
+__all__ = [
+    "ExportStats",
+    "FormatUnavailable",
+    "SheetsClient",
+    "SheetsError",
+    "TabularWriter",
+    "new_writer",
+]
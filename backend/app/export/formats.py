@@ -0,0 +1,330 @@
+"""
+Streaming file exports: CSV, XLSX, Parquet and Arrow.
+
+Each writer takes transactions in batches (one per parsed page, say) and
+hands back whatever bytes are ready, so a response can stream the file
+while later pages are still being parsed and the whole file never sits in
+memory. CSV and XLSX are written by hand: an XLSX file is a zip of a few
+XML parts, and the worksheet part is deflated straight into the response
+as rows arrive. Parquet and Arrow need the optional ``pyarrow`` package;
+their columns are built directly from the ``Transaction`` fields.
+"""
+
+import csv
+import io
+import re
+import zipfile
+from datetime import date
+from typing import Iterable
+from xml.sax.saxutils import escape
+
+from app.models import Transaction
+
+HEADER = ["Data", "Descrição", "Valor", "Tipo", "Operação", "Banco"]
+
+# Rows buffered before a write; Parquet row groups are this size too
+DEFAULT_CHUNK_ROWS = 10_000
+
+
+class FormatUnavailable(Exception):
+    """Raised when an export format needs a package that is not installed."""
+
+
+class _Sink:
+    """Write-only file object whose contents are drained as they arrive."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _parse_date(value: str) -> date:
+    """DD/MM/YYYY, as every parser emits it."""
+    return date(int(value[6:10]), int(value[3:5]), int(value[0:2]))
+
+
+def _format_cents(cents: int) -> str:
+    sign = "-" if cents < 0 else ""
+    reais, centavos = divmod(abs(cents), 100)
+    return f"{sign}{reais}.{centavos:02d}"
+
+
+class TabularWriter:
+    media_type = "application/octet-stream"
+    extension = "bin"
+
+    def __init__(self, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        self.chunk_rows = chunk_rows
+        self._pending: list[Transaction] = []
+        self._sink = _Sink()
+
+    def write(self, transactions: Iterable[Transaction]) -> bytes:
+        """Queue transactions; return any output that is ready."""
+        self._pending.extend(transactions)
+        if len(self._pending) >= self.chunk_rows:
+            self._write_rows(self._pending)
+            self._pending = []
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        """Flush queued rows and return the rest of the file."""
+        if self._pending:
+            self._write_rows(self._pending)
+            self._pending = []
+        self._finish()
+        return self._sink.drain()
+
+    def _write_rows(self, transactions: list[Transaction]) -> None:
+        raise NotImplementedError
+
+    def _finish(self) -> None:
+        pass
+
+
+class CsvWriter(TabularWriter):
+    """UTF-8 CSV with a BOM (so Excel picks the encoding), amounts in reais."""
+
+    media_type = "text/csv; charset=utf-8"
+    extension = "csv"
+
+    def __init__(self, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        super().__init__(chunk_rows)
+        self._text = io.StringIO()
+        self._csv = csv.writer(self._text)
+        self._text.write("\ufeff")
+        self._csv.writerow(HEADER)
+        self._flush_text()
+
+    def _write_rows(self, transactions: list[Transaction]) -> None:
+        self._csv.writerows(
+            (t.date, t.description, _format_cents(t.amount_cents),
+             t.transaction_type, t.operation_type, t.bank)
+            for t in transactions
+        )
+        self._flush_text()
+
+    def _flush_text(self) -> None:
+        self._sink.write(self._text.getvalue().encode("utf-8"))
+        self._text.seek(0)
+        self._text.truncate()
+
+
+# Characters XML 1.0 forbids outright; PDFs occasionally carry them
+_XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_EXCEL_EPOCH = date(1899, 12, 30)
+
+_XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Transações" sheetId="1" r:id="rId1"/></sheets>'
+        "</workbook>"
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        "</Relationships>"
+    ),
+    # Cell styles: 0 default, 1 built-in date format, 2 "#,##0.00"
+    "xl/styles.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="3">'
+        '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '<xf numFmtId="4" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        "</cellXfs>"
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        "</styleSheet>"
+    ),
+}
+
+
+def _xlsx_text(value: str) -> str:
+    return f'<c t="inlineStr"><is><t>{escape(_XML_ILLEGAL.sub("", value))}</t></is></c>'
+
+
+class XlsxWriter(TabularWriter):
+    """A single-sheet workbook; dates and amounts are real Excel numbers."""
+
+    media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    extension = "xlsx"
+
+    def __init__(self, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        super().__init__(chunk_rows)
+        self._zip = zipfile.ZipFile(self._sink, "w", compression=zipfile.ZIP_DEFLATED)
+        for name, xml in _XLSX_PARTS.items():
+            self._zip.writestr(name, xml)
+        self._sheet = self._zip.open("xl/worksheets/sheet1.xml", "w", force_zip64=True)
+        self._sheet.write(
+            b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            b'<sheetViews><sheetView workbookViewId="0"><pane ySplit="1" topLeftCell="A2" '
+            b'activePane="bottomLeft" state="frozen"/></sheetView></sheetViews>'
+            b"<sheetData><row>" + "".join(map(_xlsx_text, HEADER)).encode("utf-8") + b"</row>"
+        )
+
+    def _write_rows(self, transactions: list[Transaction]) -> None:
+        rows = []
+        for t in transactions:
+            try:
+                day = f'<c s="1"><v>{(_parse_date(t.date) - _EXCEL_EPOCH).days}</v></c>'
+            except ValueError:
+                day = _xlsx_text(t.date)
+            rows.append(
+                f"<row>{day}{_xlsx_text(t.description)}"
+                f'<c s="2"><v>{_format_cents(t.amount_cents)}</v></c>'
+                f"{_xlsx_text(t.transaction_type)}{_xlsx_text(t.operation_type)}"
+                f"{_xlsx_text(t.bank)}</row>"
+            )
+        self._sheet.write("".join(rows).encode("utf-8"))
+
+    def _finish(self) -> None:
+        self._sheet.write(b"</sheetData></worksheet>")
+        self._sheet.close()
+        self._zip.close()
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise FormatUnavailable(
+            "Parquet and Arrow exports need pyarrow (pip install pyarrow)."
+        ) from None
+    return pyarrow
+
+
+class _ArrowColumns(TabularWriter):
+    """Shared column building for the pyarrow-backed writers."""
+
+    def __init__(self, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        super().__init__(chunk_rows)
+        self._pa = pa = _import_pyarrow()
+        self._schema = pa.schema([
+            ("date", pa.date32()),
+            ("description", pa.string()),
+            ("amount", pa.float64()),
+            ("amount_cents", pa.int64()),
+            ("transaction_type", pa.string()),
+            ("operation_type", pa.string()),
+            ("bank", pa.string()),
+        ])
+
+    def _batch(self, transactions: list[Transaction]):
+        pa = self._pa
+        cents = [t.amount_cents for t in transactions]
+        return pa.record_batch([
+            pa.array([_parse_date(t.date) for t in transactions], pa.date32()),
+            pa.array([t.description for t in transactions], pa.string()),
+            pa.array([c / 100 for c in cents], pa.float64()),
+            pa.array(cents, pa.int64()),
+            pa.array([t.transaction_type for t in transactions], pa.string()),
+            pa.array([t.operation_type for t in transactions], pa.string()),
+            pa.array([t.bank for t in transactions], pa.string()),
+        ], schema=self._schema)
+
+
+class ParquetWriter(_ArrowColumns):
+    """Parquet, one row group per ``chunk_rows`` transactions."""
+
+    media_type = "application/vnd.apache.parquet"
+    extension = "parquet"
+
+    def __init__(self, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        super().__init__(chunk_rows)
+        import pyarrow.parquet as pq
+
+        self._writer = pq.ParquetWriter(self._sink, self._schema, compression="zstd")
+
+    def _write_rows(self, transactions: list[Transaction]) -> None:
+        self._writer.write_batch(self._batch(transactions))
+
+    def _finish(self) -> None:
+        self._writer.close()
+
+
+class ArrowWriter(_ArrowColumns):
+    """Arrow IPC stream format, one record batch per ``chunk_rows``."""
+
+    media_type = "application/vnd.apache.arrow.stream"
+    extension = "arrow"
+
+    def __init__(self, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        super().__init__(chunk_rows)
+        self._writer = self._pa.ipc.new_stream(self._sink, self._schema)
+
+    def _write_rows(self, transactions: list[Transaction]) -> None:
+        self._writer.write_batch(self._batch(transactions))
+
+    def _finish(self) -> None:
+        self._writer.close()
+
+
+WRITERS: dict[str, type[TabularWriter]] = {
+    "csv": CsvWriter,
+    "xlsx": XlsxWriter,
+    "parquet": ParquetWriter,
+    "arrow": ArrowWriter,
+}
+
+
+def new_writer(format: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> TabularWriter:
+    """Writer for ``format``; raises :class:`FormatUnavailable` when the
+    format's optional dependency is missing."""
+    return WRITERS[format](chunk_rows)
@@ -0,0 +1,237 @@
+"""
+Google Sheets export through the Sheets REST API.
+
+Rows go out in chunks of ``chunk_rows`` per ``values.append`` call, so a
+thousand-transaction statement is one or two requests rather than one per
+row. A single pooled ``httpx.Client``, created on the first export, is
+shared by every export, keeping TLS connections to the API warm between
+calls. Failed calls are retried with exponential backoff, honouring
+``Retry-After`` when the API sends one, but only when resending cannot
+write anything twice: both calls made here (``addSheet`` and
+``values.append``) are POSTs, so they are only resent after a rate limit
+(429), which the API answers without applying the request, or when the
+connection failed before the request went out.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable
+from urllib.parse import quote
+
+from app import metrics
+from app.config import Settings
+from app.export.formats import HEADER
+from app.models import Transaction
+
+if TYPE_CHECKING:
+    import httpx
+
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Methods that may be resent after a 5xx or a broken connection
+_IDEMPOTENT = frozenset({"GET", "PUT", "DELETE"})
+
+
+class SheetsError(Exception):
+    """Raised when the Sheets API rejects a request (after retries)."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Sheets API error {status_code}: {message}")
+        self.status_code = status_code
+
+
+@dataclass(slots=True)
+class ExportStats:
+    rows: int = 0
+    requests: int = 0
+    retries: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "requests": self.requests,
+            "retries": self.retries,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+def transaction_rows(transactions: Iterable[Transaction]) -> list[list]:
+    """One sheet row per transaction; amounts go out as numbers in reais."""
+    return [
+        [t.date, t.description, t.amount_cents / 100, t.transaction_type, t.operation_type, t.bank]
+        for t in transactions
+    ]
+
+
+class SheetsClient:
+    """Minimal Sheets API client: batched appends over pooled connections.
+
+    The access token is passed per call, so one client (and its
+    connection pool) serves every user.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "https://sheets.googleapis.com",
+        chunk_rows: int = 1000,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 32.0,
+        timeout: float = 30.0,
+        transport: "httpx.BaseTransport | None" = None,
+    ):
+        self.base_url = base_url
+        self.chunk_rows = chunk_rows
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self._transport = transport
+        self._lock = threading.Lock()
+        self._http: "httpx.Client | None" = None
+
+    def _client(self) -> "httpx.Client":
+        # httpx is imported here: most deployments never export to Sheets
+        with self._lock:
+            if self._http is None:
+                import httpx
+
+                self._http = httpx.Client(
+                    base_url=self.base_url,
+                    timeout=self.timeout,
+                    transport=self._transport,
+                    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                )
+            return self._http
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "SheetsClient":
+        return cls(
+            base_url=settings.sheets_url,
+            chunk_rows=settings.sheets_chunk_rows,
+            max_retries=settings.sheets_max_retries,
+        )
+
+    def _delay(self, attempt: int, response: "httpx.Response | None") -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        # Full jitter keeps concurrent exports from retrying in lockstep
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def _request(self, token: str, method: str, url: str, stats: ExportStats, **kwargs) -> dict:
+        import httpx
+
+        if method in _IDEMPOTENT:
+            retry_statuses, retry_errors = _RETRY_STATUSES, httpx.TransportError
+        else:
+            # Anything else may have reached the API and been applied
+            retry_statuses = frozenset({429})
+            retry_errors = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+        http = self._client()
+        headers = {"Authorization": f"Bearer {token}"}
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            stats.requests += 1
+            try:
+                response = http.request(method, url, headers=headers, **kwargs)
+            except httpx.TransportError as e:
+                if not isinstance(e, retry_errors) or attempt == self.max_retries:
+                    raise SheetsError(503, f"Could not reach the Sheets API: {e}") from e
+                stats.retries += 1
+                time.sleep(self._delay(attempt, None))
+                continue
+            metrics.observe(
+                "extrato_sheets_request_seconds",
+                time.perf_counter() - started,
+                status=str(response.status_code),
+            )
+            if response.status_code not in retry_statuses or attempt == self.max_retries:
+                break
+            stats.retries += 1
+            time.sleep(self._delay(attempt, response))
+
+        if response.is_error:
+            try:
+                message = response.json()["error"]["message"]
+            except (ValueError, KeyError, TypeError):
+                message = response.text or response.reason_phrase
+            raise SheetsError(response.status_code, message)
+        return response.json()
+
+    def ensure_sheet(self, token: str, spreadsheet_id: str, sheet: str, stats: ExportStats) -> bool:
+        """Add tab ``sheet`` with a frozen header row; False if it exists."""
+        body = {"requests": [{"addSheet": {"properties": {
+            "title": sheet,
+            "gridProperties": {"frozenRowCount": 1},
+        }}}]}
+        url = f"/v4/spreadsheets/{quote(spreadsheet_id, safe='')}:batchUpdate"
+        try:
+            self._request(token, "POST", url, stats, json=body)
+        except SheetsError as e:
+            if e.status_code == 400 and "already exists" in str(e):
+                return False
+            raise
+        return True
+
+    def append_rows(
+        self,
+        token: str,
+        spreadsheet_id: str,
+        sheet: str,
+        rows: list[list],
+        stats: ExportStats | None = None,
+    ) -> ExportStats:
+        """Append ``rows`` after the last row of ``sheet``, in chunks."""
+        stats = stats if stats is not None else ExportStats()
+        # A1 notation: the tab name in single quotes, its own quotes doubled
+        target = "'" + sheet.replace("'", "''") + "'!A1"
+        url = (
+            f"/v4/spreadsheets/{quote(spreadsheet_id, safe='')}"
+            f"/values/{quote(target, safe='')}:append"
+        )
+        # RAW keeps descriptions like "=HYPERLINK(...)" from being evaluated
+        params = {"valueInputOption": "RAW", "insertDataOption": "INSERT_ROWS"}
+        started = time.perf_counter()
+        for start in range(0, len(rows), self.chunk_rows):
+            chunk = rows[start:start + self.chunk_rows]
+            self._request(
+                token, "POST", url, stats,
+                params=params, json={"majorDimension": "ROWS", "values": chunk},
+            )
+            stats.rows += len(chunk)
+        stats.seconds += time.perf_counter() - started
+        return stats
+
+    def export_transactions(
+        self,
+        token: str,
+        spreadsheet_id: str,
+        transactions: list[Transaction],
+        sheet: str = "Transações",
+    ) -> ExportStats:
+        """Write transactions to tab ``sheet``, creating it with a header
+        row on first use. ``rows`` in the stats counts transactions only."""
+        stats = ExportStats()
+        started = time.perf_counter()
+        rows = transaction_rows(transactions)
+        if self.ensure_sheet(token, spreadsheet_id, sheet, stats):
+            rows.insert(0, HEADER)
+        self.append_rows(token, spreadsheet_id, sheet, rows, stats)
+        stats.rows = len(transactions)
+        stats.seconds = time.perf_counter() - started
+        metrics.inc("extrato_sheets_rows_total", len(transactions))
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
@@ -0,0 +1,418 @@
+"""
+Persistent background job queue.
+
+``POST /api/jobs`` stores the upload in a directory and a row in a SQLite
+table, then returns. A :class:`JobRunner` running in the web process
+claims queued jobs and parses them on the extraction engine's worker
+pool, recording page progress as it goes. Because the queue lives on
+disk, jobs survive a restart.
+
+Several processes (uvicorn workers, replicas) may share one queue. A
+claimed job is leased to the claiming store: its ``owner`` and a
+heartbeat in ``updated_at`` that the runner renews while the parse runs.
+Only jobs whose lease ran out, because their process died, are put back
+in the queue. Failed attempts are retried with exponential backoff, up
+to a limit.
+"""
+
+import asyncio
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from app.config import Settings
+from app.engine import EngineBusy
+from app.uploads import SpooledUpload
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    file_name TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    extractor TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    pages_done INTEGER NOT NULL DEFAULT 0,
+    total_pages INTEGER,
+    error TEXT,
+    result BLOB,
+    owner TEXT,
+    run_after REAL NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, run_after);
+"""
+
+_STATUS_COLUMNS = (
+    "id, file_name, status, attempts, pages_done, total_pages, error, created_at, updated_at"
+)
+
+
+@dataclass(slots=True)
+class Job:
+    """A claimed job, as handed to the runner's handler."""
+
+    id: str
+    file_name: str
+    path: str
+    digest: str
+    extractor: str
+    attempts: int
+
+
+class JobStore:
+    """SQLite-backed job queue; uploads are kept as files next to it.
+
+    Each store is one claimant: jobs it claims are leased to it for
+    ``lease`` seconds past their last heartbeat. ``jobs.db`` and the
+    ``files`` directory are created by the first call that needs them.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_attempts: int = 3,
+        retry_backoff: float = 5.0,
+        ttl: float = 7 * 24 * 60 * 60,
+        lease: float = 60.0,
+    ):
+        self.directory = directory
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.ttl = ttl
+        self.lease = lease
+        self.owner = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "JobStore":
+        return cls(
+            directory=settings.jobs_dir or os.path.join(tempfile.gettempdir(), "extrato-jobs"),
+            max_attempts=settings.job_max_attempts,
+            ttl=settings.job_ttl,
+            lease=settings.job_lease,
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            os.makedirs(os.path.join(self.directory, "files"), exist_ok=True)
+            db = sqlite3.connect(os.path.join(self.directory, "jobs.db"), check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(_SCHEMA)
+            columns = {row[1] for row in db.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:  # queue created before leases
+                db.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            self._db = db
+        return self._db
+
+    def _file_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, "files", f"{job_id}.pdf")
+
+    def submit(self, upload: SpooledUpload, extractor: str, result: bytes | None = None) -> dict:
+        """Queue a parse of ``upload``, taking over its spool file.
+
+        With ``result`` (e.g. from the result cache) the job is created
+        already done and nothing is stored on disk.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            db = self._connect()
+            if result is None:
+                path = self._file_path(job_id)
+                if upload.path is not None:
+                    shutil.move(upload.path, path)
+                    upload.path = None
+                else:
+                    with open(path, "wb") as f:
+                        f.write(upload.data)
+            db.execute(
+                "INSERT INTO jobs (id, file_name, digest, extractor, status, result,"
+                " run_after, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id, upload.file_name, upload.digest, extractor,
+                    QUEUED if result is None else DONE, result, now, now, now,
+                ),
+            )
+            db.commit()
+        return self.get(job_id)
+
+    def claim(self) -> Job | None:
+        """Lease the oldest due job to this store and return it, or None.
+
+        A single UPDATE picks and marks the job, so two processes sharing
+        the queue never claim the same one.
+        """
+        now = time.time()
+        with self._lock:
+            db = self._connect()
+            row = db.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, owner = ?, updated_at = ?"
+                " WHERE id = (SELECT id FROM jobs WHERE status = ? AND run_after <= ?"
+                " ORDER BY run_after LIMIT 1) AND status = ?"
+                " RETURNING id, file_name, digest, extractor, attempts",
+                (RUNNING, self.owner, now, QUEUED, now, QUEUED),
+            ).fetchone()
+            db.commit()
+        if row is None:
+            return None
+        job_id, file_name, digest, extractor, attempts = row
+        return Job(job_id, file_name, self._file_path(job_id), digest, extractor, attempts)
+
+    def heartbeat(self, job_id: str) -> bool:
+        """Renew this store's lease on a running job; False if it was lost."""
+        with self._lock:
+            db = self._connect()
+            cursor = db.execute(
+                "UPDATE jobs SET updated_at = ? WHERE id = ? AND status = ? AND owner = ?",
+                (time.time(), job_id, RUNNING, self.owner),
+            )
+            db.commit()
+        return cursor.rowcount == 1
+
+    def next_due(self) -> float | None:
+        """Seconds until the next queued job may run, or None if none is queued."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT MIN(run_after) FROM jobs WHERE status = ?", (QUEUED,)
+            ).fetchone()
+        return None if row[0] is None else max(row[0] - time.time(), 0.0)
+
+    # The writes below are made as the job's leaseholder: once the lease
+    # was lost (and the job maybe claimed again elsewhere) they do nothing
+
+    def progress(self, job_id: str, pages_done: int, total_pages: int) -> None:
+        self._update_owned(job_id, pages_done=pages_done, total_pages=total_pages)
+
+    def finish(self, job_id: str, result: bytes) -> None:
+        if self._update_owned(job_id, status=DONE, result=result, error=None, owner=None):
+            self._remove_file(job_id)
+
+    def fail(self, job_id: str, error: str, retry: bool = True) -> None:
+        """Record a failed attempt; queue a retry unless the job is out of
+        attempts or ``retry`` is False."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT attempts FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if retry and row is not None and row[0] < self.max_attempts:
+            delay = self.retry_backoff * 2 ** (row[0] - 1)
+            self._update_owned(
+                job_id, status=QUEUED, error=error, run_after=time.time() + delay, owner=None
+            )
+        elif self._update_owned(job_id, status=FAILED, error=error, owner=None):
+            self._remove_file(job_id)
+
+    def release(self, job_id: str, delay: float) -> None:
+        """Put a claimed job back without counting the attempt."""
+        with self._lock:
+            db = self._connect()
+            db.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts - 1, run_after = ?,"
+                " updated_at = ?, owner = NULL WHERE id = ? AND status = ? AND owner = ?",
+                (QUEUED, time.time() + delay, time.time(), job_id, RUNNING, self.owner),
+            )
+            db.commit()
+
+    def get(self, job_id: str) -> dict | None:
+        """The job's status, without its result."""
+        with self._lock:
+            row = self._connect().execute(
+                f"SELECT {_STATUS_COLUMNS} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(_STATUS_COLUMNS.split(", "), row))
+
+    def result(self, job_id: str) -> bytes | None:
+        """The serialized ``/api/parse`` result of a finished job."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT result FROM jobs WHERE id = ? AND status = ?", (job_id, DONE)
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def recover(self) -> int:
+        """Requeue running jobs whose lease expired (their process died),
+        failing those already out of attempts, and drop finished jobs past
+        the TTL. Jobs another live process is running are left alone.
+
+        Returns the number of jobs requeued.
+        """
+        now = time.time()
+        with self._lock:
+            db = self._connect()
+            stale = db.execute(
+                "SELECT id, attempts, updated_at FROM jobs WHERE status = ? AND updated_at < ?",
+                (RUNNING, now - self.lease),
+            ).fetchall()
+            expired = db.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (DONE, FAILED, now - self.ttl),
+            ).fetchall()
+            db.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (DONE, FAILED, now - self.ttl),
+            )
+            db.commit()
+        for (job_id,) in expired:
+            self._remove_file(job_id)
+        requeued = 0
+        for job_id, attempts, heartbeat in stale:
+            # Only if the lease is still the expired one just read
+            if attempts < self.max_attempts:
+                requeued += self._expire(job_id, heartbeat, status=QUEUED, run_after=now)
+            elif self._expire(job_id, heartbeat, status=FAILED, error="Interrupted too many times."):
+                self._remove_file(job_id)
+        return requeued
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        return {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0, **dict(rows)}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _update(self, job_id: str, where: str, params: tuple, **columns) -> bool:
+        columns["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in columns)
+        with self._lock:
+            db = self._connect()
+            cursor = db.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND {where}",
+                (*columns.values(), job_id, *params),
+            )
+            db.commit()
+        return cursor.rowcount == 1
+
+    def _update_owned(self, job_id: str, **columns) -> bool:
+        return self._update(job_id, "status = ? AND owner = ?", (RUNNING, self.owner), **columns)
+
+    def _expire(self, job_id: str, heartbeat: float, **columns) -> bool:
+        return self._update(
+            job_id, "status = ? AND updated_at = ?", (RUNNING, heartbeat), owner=None, **columns
+        )
+
+    def _remove_file(self, job_id: str) -> None:
+        try:
+            os.unlink(self._file_path(job_id))
+        except FileNotFoundError:
+            pass
+
+
+# handler(job, progress) -> serialized result; await progress(pages_done, total_pages)
+JobHandler = Callable[[Job, Callable[[int, int], Awaitable[None]]], Awaitable[bytes]]
+
+
+class JobRunner:
+    """Drain a :class:`JobStore` with up to ``concurrency`` jobs at a time.
+
+    ``handler`` does the parsing. Exceptions listed in ``retry_on`` (a
+    killed or timed-out worker) are retried; any other one means the PDF
+    itself is bad and fails the job at once. :class:`EngineBusy` puts the
+    job back without using up an attempt, since the pool being full says
+    nothing about the PDF.
+
+    The store blocks on SQLite and the disk, so every call to it is made
+    with ``asyncio.to_thread``.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        handler: JobHandler,
+        concurrency: int,
+        retry_on: tuple[type[BaseException], ...] = (Exception,),
+        poll: float = 5.0,
+    ):
+        self.store = store
+        self.handler = handler
+        self.concurrency = concurrency
+        self.retry_on = retry_on
+        self.poll = poll
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._loop()) for _ in range(self.concurrency)]
+        self._tasks.append(asyncio.create_task(self._recover_loop()))
+
+    def wake(self) -> None:
+        """Tell idle workers a job was queued."""
+        self._wakeup.set()
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _loop(self) -> None:
+        while True:
+            job = await asyncio.to_thread(self.store.claim)
+            if job is None:
+                await self._idle()
+                continue
+            await self._process(job)
+
+    async def _recover_loop(self) -> None:
+        """Pick up jobs of processes that died, at startup and then while
+        this one runs."""
+        while True:
+            if await asyncio.to_thread(self.store.recover):
+                self.wake()
+            await asyncio.sleep(self.store.lease)
+
+    async def _idle(self) -> None:
+        self._wakeup.clear()
+        due = await asyncio.to_thread(self.store.next_due)
+        timeout = self.poll if due is None else min(due, self.poll)
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _process(self, job: Job) -> None:
+        async def progress(pages_done: int, total_pages: int) -> None:
+            await asyncio.to_thread(self.store.progress, job.id, pages_done, total_pages)
+
+        async def heartbeat() -> None:
+            while True:
+                await asyncio.sleep(self.store.lease / 3)
+                await asyncio.to_thread(self.store.heartbeat, job.id)
+
+        renewing = asyncio.create_task(heartbeat())
+        try:
+            result = await self.handler(job, progress)
+        except asyncio.CancelledError:
+            # Shutting down: the attempt was not the job's fault
+            await asyncio.to_thread(self.store.release, job.id, 0)
+            raise
+        except EngineBusy as e:
+            await asyncio.to_thread(self.store.release, job.id, e.retry_after)
+        except Exception as e:
+            error, retry = str(e) or type(e).__name__, isinstance(e, self.retry_on)
+            await asyncio.to_thread(self.store.fail, job.id, error, retry=retry)
+        else:
+            await asyncio.to_thread(self.store.finish, job.id, result)
+        finally:
+            renewing.cancel()
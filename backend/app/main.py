@@ -1,16 +1,83 @@
 """FastAPI app for PDF bank statement parsing."""
 
-from fastapi import FastAPI, UploadFile, HTTPException
+import asyncio
+import datetime
+import json
+import time
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import AsyncIterator, Callable, Literal
+
+from fastapi import Depends, FastAPI, Header, Query, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
+
+from app import metrics
+from app.cache import ResultCache, digest_cache_key
+from app.config import settings
+from app.engine import EngineBusy, ExtractionEngine, JobTimeout
+from app.export import FormatUnavailable, SheetsClient, SheetsError, new_writer
+from app.jobs import DONE, FAILED, Job, JobRunner, JobStore
+from app.models import Transaction
+from app.parsers import DEFAULT_EXTRACTOR, iter_parse_pdf, parse_pdf, result_version, warm_up
+from app.serialize import dumps, dumps_result
+from app.split import parse_split
+from app.store import Filters, TransactionStore
+from app.summary import summarize
+from app.uploads import BodyLimit, SpooledUpload, UploadRejected, receive_uploads
+
+# Text extraction backends selectable with ?extractor= (see app.parsers.extractors)
+Extractor = Literal["pdfplumber", "pdfium"]
+
+# What /api/parse returns with ?include=: the rows, their summary, or both
+Include = Literal["transactions", "summary", "all"]
+
+# Worker processes are spawned lazily on the first parse, or at startup
+# with EXTRATO_PREWARM
+engine = ExtractionEngine.from_settings(settings)
+cache = ResultCache.from_settings(settings)
+sheets = SheetsClient.from_settings(settings)
+jobs = JobStore.from_settings(settings)
+store = TransactionStore.from_settings(settings)
+# Drains ``jobs``; started with the app
+runner: JobRunner | None = None
+
+metrics.gauge("extrato_engine_in_flight", "Parse jobs running or queued.", lambda: engine.in_flight)
+metrics.gauge("extrato_cache_entries", "Parse results held in memory.", lambda: cache.stats()["entries"])
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global runner
+    if settings.prewarm:
+        await engine.start(warm_up, settings.extractor)
+    runner = JobRunner(
+        jobs, _run_job, settings.jobs_concurrency,
+        retry_on=(JobTimeout, BrokenProcessPool, OSError),
+    )
+    runner.start()
+    yield
+    await runner.stop()
+    runner = None
+    engine.shutdown()
+    cache.close()
+    sheets.close()
+    jobs.close()
+    store.close()
 
-from app.parsers import parse_pdf
 
 app = FastAPI(
     title="PDF Extrato Parser",
     description="Parse Brazilian bank statement PDFs into structured transaction data",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+# Oversized requests are cut off while the body streams in
+app.add_middleware(BodyLimit, max_bytes=settings.max_request_bytes)
+
 # Allow SvelteKit dev server
 app.add_middleware(
     CORSMiddleware,
@@ -21,8 +88,281 @@ app.add_middleware(
 )
 
 
-@app.post("/api/parse")
-async def parse_statement(file: UploadFile):
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    # The route template, not the raw path, keeps label cardinality bounded
+    route = request.scope.get("route")
+    metrics.observe(
+        "extrato_http_request_seconds",
+        time.perf_counter() - started,
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        status=str(response.status_code),
+    )
+    return response
+
+
+async def _receive(
+    request: Request, field: str, max_files: int, fail_fast: bool
+) -> list[SpooledUpload | UploadRejected]:
+    """Read the PDFs uploaded as ``field`` off the request body (see
+    :func:`app.uploads.receive_uploads`).
+
+    The caller must ``close()`` the uploads to delete any spool file.
+    """
+    try:
+        with metrics.timed("read"):
+            received = await receive_uploads(
+                request.headers.get("content-type"), request.stream(), field, max_files,
+                settings.max_upload_bytes, settings.spool_bytes, settings.spool_dir, fail_fast,
+            )
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    for upload in received:
+        if isinstance(upload, SpooledUpload):
+            metrics.inc("extrato_bytes_in_total", upload.size)
+    return received
+
+
+async def _upload(request: Request) -> SpooledUpload:
+    """The PDF uploaded as ``file``; any problem with it fails the request."""
+    upload, = await _receive(request, "file", 1, fail_fast=True)
+    return upload
+
+
+async def _batch_uploads(request: Request) -> list[SpooledUpload | UploadRejected]:
+    """The PDFs uploaded as ``files``, at most ``EXTRATO_BATCH_MAX_FILES``,
+    each read or refused on its own."""
+    return await _receive(request, "files", settings.batch_max_files, fail_fast=False)
+
+
+async def _all_uploads(request: Request) -> list[SpooledUpload]:
+    """The PDFs uploaded as ``files``, as for :func:`_batch_uploads`, but
+    any refused file fails the request."""
+    return await _receive(request, "files", settings.batch_max_files, fail_fast=True)
+
+
+def _upload_form(field: str, many: bool) -> dict:
+    """OpenAPI request body of a route that reads its uploads itself."""
+    schema = {"type": "string", "format": "binary"}
+    if many:
+        schema = {"type": "array", "items": schema}
+    form = {"type": "object", "properties": {field: schema}, "required": [field]}
+    return {"requestBody": {"required": True, "content": {"multipart/form-data": {"schema": form}}}}
+
+
+def _with_extractor(fn: Callable, extractor: str) -> Callable:
+    """``fn`` with ``extractor`` bound, unless it is the default."""
+    return fn if extractor == DEFAULT_EXTRACTOR else partial(fn, extractor=extractor)
+
+
+def _parse_error(e: Exception) -> HTTPException:
+    """Map an exception raised while parsing to the HTTP error we return."""
+    if isinstance(e, EngineBusy):
+        return HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    if isinstance(e, JobTimeout):
+        return HTTPException(status_code=504, detail=str(e))
+    if isinstance(e, ValueError):
+        return HTTPException(status_code=422, detail=str(e))
+    return HTTPException(status_code=500, detail=f"Error parsing PDF: {str(e)}")
+
+
+async def _parse_upload_transactions(
+    upload: SpooledUpload, extractor: str | None = None
+) -> tuple[bytes, list[Transaction] | None]:
+    """Parse one uploaded PDF, and close it.
+
+    Returns the serialized ``/api/parse`` result and the parsed
+    transactions, or None for those when the result came from the cache.
+    Raises HTTPException with the status code ``/api/parse`` responds with.
+    """
+    extractor = extractor or settings.extractor
+
+    # Identical uploads skip pdfplumber entirely
+    key = digest_cache_key(upload.digest, result_version(extractor))
+    cached = await asyncio.to_thread(cache.get, key)
+    if cached is not None:
+        upload.close()
+        return cached, None
+
+    try:
+        if settings.split_pages:
+            transactions = await parse_split(
+                engine, upload.source, settings.split_pages, max(engine.max_workers, 1), extractor
+            )
+        else:
+            transactions = await engine.run(_with_extractor(parse_pdf, extractor), upload.source)
+    except Exception as e:
+        raise _parse_error(e)
+    finally:
+        upload.close()
+
+    with metrics.timed("serialize"):
+        body = dumps_result(transactions)
+    await asyncio.to_thread(cache.put, key, body)
+    return body, transactions
+
+
+def _summarize(transactions: list[Transaction]) -> dict:
+    with metrics.timed("summarize"):
+        return summarize(transactions)
+
+
+def _with_summary(
+    body: bytes, transactions: list[Transaction] | None, include: str
+) -> tuple[bytes, list[Transaction]]:
+    """Reshape a serialized ``/api/parse`` result for ``?include=``.
+
+    ``transactions`` are rebuilt from ``body`` when None (a cache hit), and
+    returned along with the new body. CPU-bound: call it off the event loop.
+    """
+    if transactions is None:
+        transactions = _result_transactions(body)
+    if include == "transactions":
+        return body, transactions
+    summary = dumps(_summarize(transactions))
+    if include == "summary":
+        bank = transactions[0].bank if transactions else "unknown"
+        body = dumps({"bank": bank, "total_transactions": len(transactions)})
+    return body[:-1] + b',"summary":' + summary + b"}", transactions
+
+
+async def _profile_upload(upload: SpooledUpload, extractor: str | None, include: str) -> bytes:
+    """Parse one upload under cProfile, bypassing the cache, and return the
+    ``/api/parse`` body (shaped by ``include``) with the report added as
+    ``"profile"``."""
+    parse = _with_extractor(parse_pdf, extractor or settings.extractor)
+    try:
+        transactions, report = await engine.run(metrics.profile_call, parse, upload.source)
+    except Exception as e:
+        raise _parse_error(e)
+    finally:
+        upload.close()
+    body = dumps_result(transactions)
+    if include != "transactions":
+        body, _ = await asyncio.to_thread(_with_summary, body, transactions, include)
+    return body[:-1] + b',"profile":' + dumps(report) + b"}"
+
+
+async def _stream_parse(file_name: str, upload: SpooledUpload, extractor: str) -> AsyncIterator[dict]:
+    """Yield stream events for one PDF as its pages are parsed."""
+    key = digest_cache_key(upload.digest, result_version(extractor))
+    cached = await asyncio.to_thread(cache.get, key)
+    if cached is not None:
+        result = json.loads(cached)
+        yield {"event": "start", "file_name": file_name, "bank": result["bank"], "total_pages": None}
+        for row in result["transactions"]:
+            yield {"event": "transaction", "file_name": file_name, "transaction": row}
+        yield {"event": "end", "file_name": file_name, "total_transactions": result["total_transactions"]}
+        return
+
+    transactions: list[Transaction] = []
+    try:
+        async for event in engine.stream(_with_extractor(iter_parse_pdf, extractor), upload.source):
+            if event["event"] == "start":
+                yield {
+                    "event": "start",
+                    "file_name": file_name,
+                    "bank": event["bank"],
+                    "total_pages": event["total_pages"],
+                }
+                continue
+            for tx in event["transactions"]:
+                transactions.append(tx)
+                yield {"event": "transaction", "file_name": file_name, "transaction": tx}
+            yield {
+                "event": "progress",
+                "file_name": file_name,
+                "pages_done": event["page"],
+                "total_pages": event["total_pages"],
+            }
+    except Exception as e:
+        yield {"event": "error", "file_name": file_name, "detail": _parse_error(e).detail}
+        return
+
+    await asyncio.to_thread(cache.put, key, dumps_result(transactions))
+    yield {"event": "end", "file_name": file_name, "total_transactions": len(transactions)}
+
+
+def _row_transaction(row: dict) -> Transaction:
+    """Rebuild a transaction from its serialized row."""
+    return Transaction(
+        row["date"], row["description"], row["amount_cents"],
+        row["transaction_type"], row["operation_type"], row["bank"],
+    )
+
+
+def _result_transactions(body: bytes) -> list[Transaction]:
+    """Rebuild the transactions of a serialized ``/api/parse`` result."""
+    return [_row_transaction(row) for row in json.loads(body)["transactions"]]
+
+
+async def _iter_pages(upload: SpooledUpload, extractor: str) -> AsyncIterator[list[Transaction]]:
+    """Yield one PDF's transactions a page at a time (all at once when the
+    result is cached), filling the cache once the last page is parsed."""
+    key = digest_cache_key(upload.digest, result_version(extractor))
+    cached = await asyncio.to_thread(cache.get, key)
+    if cached is not None:
+        yield _result_transactions(cached)
+        return
+
+    transactions: list[Transaction] = []
+    async for event in engine.stream(_with_extractor(iter_parse_pdf, extractor), upload.source):
+        if event["event"] == "page":
+            transactions.extend(event["transactions"])
+            yield event["transactions"]
+    await asyncio.to_thread(cache.put, key, dumps_result(transactions))
+
+
+async def _merge_streams(
+    uploads: list[tuple[str, SpooledUpload | None, str | None]],
+    extractor: str,
+) -> AsyncIterator[dict]:
+    """Interleave the event streams of several uploads as they are produced."""
+    events: asyncio.Queue = asyncio.Queue()
+    semaphore = asyncio.Semaphore(settings.batch_concurrency)
+    done = object()
+
+    async def pump(file_name: str, upload: SpooledUpload | None, error: str | None):
+        try:
+            if error is not None:
+                await events.put({"event": "error", "file_name": file_name, "detail": error})
+                return
+            async with semaphore:
+                async for event in _stream_parse(file_name, upload, extractor):
+                    await events.put(event)
+        finally:
+            if upload is not None:
+                upload.close()
+            await events.put(done)
+
+    tasks = [asyncio.create_task(pump(*upload)) for upload in uploads]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            event = await events.get()
+            if event is done:
+                remaining -= 1
+            else:
+                yield event
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@app.post("/api/parse", openapi_extra=_upload_form("file", many=False))
+async def parse_statement(
+    upload: SpooledUpload = Depends(_upload),
+    extractor: Extractor | None = None,
+    include: Include = "transactions",
+    x_profile: str | None = Header(default=None),
+):
     """
     Upload a bank statement PDF and get structured transaction data back.
 
@@ -30,31 +370,460 @@ async def parse_statement(file: UploadFile):
     - bank: detected bank name
     - transactions: list of transaction objects
     - total_transactions: count of transactions
+
+    ``extractor`` picks the text extraction backend (``pdfplumber`` or
+    ``pdfium``) over ``EXTRATO_EXTRACTOR``.
+
+    ``include=all`` adds a ``summary`` (see :func:`app.summary.summarize`)
+    next to the rows; ``include=summary`` returns it instead of them.
+
+    With ``X-Profile: 1`` (or ``EXTRATO_PROFILE`` set) the file is parsed
+    under cProfile and the report is returned as ``profile``.
+    """
+    if settings.profile or x_profile not in (None, "", "0"):
+        body = await _profile_upload(upload, extractor, include)
+    else:
+        body, transactions = await _parse_upload_transactions(upload, extractor)
+        if include != "transactions":
+            body, _ = await asyncio.to_thread(_with_summary, body, transactions, include)
+    return Response(content=body, media_type="application/json")
+
+
+@app.post("/api/parse/batch", openapi_extra=_upload_form("files", many=True))
+async def parse_statements(
+    uploads: list[SpooledUpload | UploadRejected] = Depends(_batch_uploads),
+    extractor: Extractor | None = None,
+    include: Include = "transactions",
+):
     """
-    if not file.filename or not file.filename.lower().endswith(".pdf"):
-        raise HTTPException(status_code=400, detail="Only PDF files are accepted.")
+    Upload several bank statement PDFs in one request.
+
+    Files are parsed in parallel, at most ``EXTRATO_BATCH_CONCURRENCY`` at a
+    time. Returns ``{"results": [...]}`` in upload order, where each item is
+    either the ``/api/parse`` object plus ``file_name`` and
+    ``"success": true``, or ``{"file_name", "success": false, "error"}``.
+
+    With ``include=summary`` or ``all`` each result is shaped as by
+    ``/api/parse``, and a ``summary`` of every file's transactions together
+    is added next to ``results``.
+    """
+    semaphore = asyncio.Semaphore(settings.batch_concurrency)
+
+    merged: list[Transaction] = []
 
-    contents = await file.read()
+    async def parse_one(upload: SpooledUpload | UploadRejected) -> bytes:
+        if isinstance(upload, UploadRejected):
+            return dumps({"file_name": upload.file_name, "success": False, "error": upload.detail})
+        async with semaphore:
+            try:
+                body, transactions = await _parse_upload_transactions(upload, extractor)
+            except HTTPException as e:
+                return dumps({"file_name": upload.file_name, "success": False, "error": e.detail})
+        if include != "transactions":
+            body, transactions = await asyncio.to_thread(_with_summary, body, transactions, include)
+            merged.extend(transactions)
+        # Splice the (possibly cached) serialized result instead of re-decoding it
+        head = dumps({"file_name": upload.file_name, "success": True})
+        return head[:-1] + b"," + body[1:]
 
-    if len(contents) == 0:
-        raise HTTPException(status_code=400, detail="Empty file.")
+    results = await asyncio.gather(*(parse_one(upload) for upload in uploads))
+    body = b'{"results":[' + b",".join(results) + b"]"
+    if include != "transactions":
+        body += b',"summary":' + dumps(await asyncio.to_thread(_summarize, merged))
+    return Response(content=body + b"}", media_type="application/json")
 
+
+@app.post("/api/parse/stream", openapi_extra=_upload_form("files", many=True))
+async def stream_statements(
+    received: list[SpooledUpload | UploadRejected] = Depends(_batch_uploads),
+    format: Literal["ndjson", "sse"] = "ndjson",
+    extractor: Extractor | None = None,
+    include: Include = "transactions",
+):
+    """
+    Upload one or more bank statement PDFs and stream results as they parse.
+
+    Emits one event per line (NDJSON) or per Server-Sent Event, each with
+    an ``event`` and ``file_name`` field:
+    - start: bank and total_pages, once per file
+    - transaction: one parsed transaction, as soon as its page is parsed
+    - progress: pages_done / total_pages after each page
+    - end: total_transactions for the file
+    - error: detail, if the file could not be parsed
+
+    With ``include=all`` a last ``summary`` event (no ``file_name``) carries
+    the summary of every file's transactions together, as in
+    ``/api/parse/batch``; ``include=summary`` also leaves out the
+    transaction events.
+    """
+    uploads = [
+        (upload.file_name, None, upload.detail) if isinstance(upload, UploadRejected)
+        else (upload.file_name, upload, None)
+        for upload in received
+    ]
+
+    def encode(event: dict) -> bytes:
+        if format == "sse":
+            return b"event: " + event["event"].encode() + b"\ndata: " + dumps(event) + b"\n\n"
+        return dumps(event) + b"\n"
+
+    async def body():
+        merged: list[Transaction | dict] = []
+        async for event in _merge_streams(uploads, extractor or settings.extractor):
+            if event["event"] == "transaction" and include != "transactions":
+                merged.append(event["transaction"])
+                if include == "summary":
+                    continue
+            yield encode(event)
+        if include != "transactions":
+            # Cached files stream their rows as dicts
+            merged = [row if isinstance(row, Transaction) else _row_transaction(row) for row in merged]
+            summary = await asyncio.to_thread(_summarize, merged)
+            yield encode({"event": "summary", "summary": summary})
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream" if format == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/api/export", openapi_extra=_upload_form("files", many=True))
+async def export_statements(
+    uploads: list[SpooledUpload] = Depends(_all_uploads),
+    format: Literal["csv", "xlsx", "parquet", "arrow"] = "csv",
+    extractor: Extractor | None = None,
+):
+    """
+    Upload one or more bank statement PDFs and download their transactions
+    as a single CSV, XLSX, Parquet or Arrow (IPC stream) file.
+
+    The file is streamed while pages are parsed, in upload order. Parquet
+    and Arrow need pyarrow on the server (``501`` otherwise). A file that
+    fails to parse once streaming has started aborts the download.
+    """
     try:
-        transactions = parse_pdf(contents)
-    except ValueError as e:
-        raise HTTPException(status_code=422, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error parsing PDF: {str(e)}")
+        writer = new_writer(format)
+    except FormatUnavailable as e:
+        for upload in uploads:
+            upload.close()
+        raise HTTPException(status_code=501, detail=str(e))
+
+    extractor = extractor or settings.extractor
+
+    async def body():
+        try:
+            for upload in uploads:
+                async for transactions in _iter_pages(upload, extractor):
+                    chunk = await asyncio.to_thread(writer.write, transactions)
+                    if chunk:
+                        yield chunk
+                upload.close()
+            yield await asyncio.to_thread(writer.close)
+        finally:
+            for upload in uploads:
+                upload.close()
+
+    return StreamingResponse(
+        body(),
+        media_type=writer.media_type,
+        headers={"Content-Disposition": f'attachment; filename="extrato.{writer.extension}"'},
+    )
+
+
+async def _run_job(job: Job, progress) -> bytes:
+    """Parse a queued job's PDF, reporting page progress; the result is
+    cached like any other parse."""
+    key = digest_cache_key(job.digest, result_version(job.extractor))
+    cached = await asyncio.to_thread(cache.get, key)
+    if cached is not None:
+        return cached
+
+    transactions: list[Transaction] = []
+    async for event in engine.stream(_with_extractor(iter_parse_pdf, job.extractor), job.path):
+        if event["event"] == "start":
+            await progress(0, event["total_pages"])
+        elif event["event"] == "page":
+            transactions.extend(event["transactions"])
+            await progress(event["page"], event["total_pages"])
+    with metrics.timed("serialize"):
+        body = dumps_result(transactions)
+    await asyncio.to_thread(cache.put, key, body)
+    return body
+
+
+@app.post("/api/jobs", status_code=202, openapi_extra=_upload_form("files", many=True))
+async def submit_jobs(
+    uploads: list[SpooledUpload | UploadRejected] = Depends(_batch_uploads),
+    extractor: Extractor | None = None,
+):
+    """
+    Queue one or more bank statement PDFs for background parsing.
+
+    Returns ``{"jobs": [...]}`` in upload order: the job status (see
+    ``GET /api/jobs/{id}``) for each accepted file, or
+    ``{"file_name", "success": false, "error"}`` for a rejected one.
+    Already-parsed files get a job that is done from the start.
+    """
+    extractor = extractor or settings.extractor
+    accepted = []
+    for upload in uploads:
+        if isinstance(upload, UploadRejected):
+            accepted.append({"file_name": upload.file_name, "success": False, "error": upload.detail})
+            continue
+        try:
+            key = digest_cache_key(upload.digest, result_version(extractor))
+            cached = await asyncio.to_thread(cache.get, key)
+            accepted.append(await asyncio.to_thread(jobs.submit, upload, extractor, result=cached))
+        finally:
+            upload.close()
+
+    if runner is not None:
+        runner.wake()
+    return {"jobs": accepted}
+
+
+@app.get("/api/jobs/{job_id}")
+async def job_status(job_id: str):
+    """
+    Report a job's progress: ``status`` (queued, running, done or failed),
+    ``attempts``, ``pages_done`` of ``total_pages`` and the last ``error``.
+    """
+    job = await asyncio.to_thread(jobs.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
+
+
+@app.get("/api/jobs/{job_id}/result")
+async def job_result(
+    job_id: str,
+    format: Literal["json", "csv", "xlsx", "parquet", "arrow"] = "json",
+):
+    """
+    Fetch a finished job's result: the ``/api/parse`` object, or with
+    ``format`` a streamed CSV, XLSX, Parquet or Arrow file as from
+    ``/api/export``. ``409`` while the job is queued or running, ``422``
+    with its error if it failed.
+    """
+    job = await asyncio.to_thread(jobs.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    if job["status"] == FAILED:
+        raise HTTPException(status_code=422, detail=job["error"])
+    body = await asyncio.to_thread(jobs.result, job_id) if job["status"] == DONE else None
+    if body is None:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}.")
+
+    if format == "json":
+        return Response(content=body, media_type="application/json")
+    try:
+        writer = new_writer(format)
+    except FormatUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
 
-    bank = transactions[0].bank if transactions else "unknown"
+    async def stream():
+        transactions = await asyncio.to_thread(_result_transactions, body)
+        chunk = await asyncio.to_thread(writer.write, transactions)
+        if chunk:
+            yield chunk
+        yield await asyncio.to_thread(writer.close)
 
+    return StreamingResponse(
+        stream(),
+        media_type=writer.media_type,
+        headers={"Content-Disposition": f'attachment; filename="extrato.{writer.extension}"'},
+    )
+
+
+async def _ingest_upload(account: str, upload: SpooledUpload, extractor: str) -> dict:
+    """Add one PDF to ``account``'s stored transactions and report the new ones."""
+    previous = await asyncio.to_thread(store.statement, account, upload.digest)
+    if previous is not None:
+        return {
+            "bank": previous["bank"],
+            "already_ingested": True,
+            "total_transactions": previous["total_transactions"],
+            "new_transactions": 0,
+            "duplicates": previous["total_transactions"],
+            "transactions": [],
+        }
+
+    ingestion = store.ingest(account, upload.digest)
+    async for transactions in _iter_pages(upload, extractor):
+        await asyncio.to_thread(ingestion.add, transactions)
+    new = await asyncio.to_thread(ingestion.finish)
+    duplicates = ingestion.total_transactions - len(new)
+    metrics.inc("extrato_ingested_transactions_total", len(new), result="new")
+    metrics.inc("extrato_ingested_transactions_total", duplicates, result="duplicate")
     return {
-        "bank": bank,
-        "transactions": [t.to_dict() for t in transactions],
-        "total_transactions": len(transactions),
+        "bank": ingestion.bank,
+        "already_ingested": False,
+        "total_transactions": ingestion.total_transactions,
+        "new_transactions": len(new),
+        "duplicates": duplicates,
+        "transactions": new,
     }
 
 
+@app.post("/api/ingest", openapi_extra=_upload_form("files", many=True))
+async def ingest_statements(
+    uploads: list[SpooledUpload | UploadRejected] = Depends(_batch_uploads),
+    account: str = Query(default="default", min_length=1, max_length=200),
+    extractor: Extractor | None = None,
+):
+    """
+    Add bank statement PDFs to an account's stored transactions.
+
+    Files are ingested in upload order, so overlaps between them are
+    deduplicated too. Returns ``{"account", "results": [...]}`` where each
+    item is ``{"file_name", "success": true, "bank", "already_ingested",
+    "total_transactions", "new_transactions", "duplicates",
+    "transactions"}`` with only the transactions the account did not have
+    yet, or ``{"file_name", "success": false, "error"}``.
+    """
+    extractor = extractor or settings.extractor
+    results = []
+    for upload in uploads:
+        if isinstance(upload, UploadRejected):
+            results.append({"file_name": upload.file_name, "success": False, "error": upload.detail})
+            continue
+        try:
+            result = await _ingest_upload(account, upload, extractor)
+        except Exception as e:
+            results.append({"file_name": upload.file_name, "success": False, "error": _parse_error(e).detail})
+            continue
+        finally:
+            upload.close()
+        results.append({"file_name": upload.file_name, "success": True, **result})
+
+    return Response(content=dumps({"account": account, "results": results}), media_type="application/json")
+
+
+def _filters(
+    bank: str | None = None,
+    transaction_type: str | None = None,
+    operation_type: Literal["deposit", "withdrawal"] | None = None,
+    date_from: datetime.date | None = None,
+    date_to: datetime.date | None = None,
+    min_amount_cents: int | None = None,
+    max_amount_cents: int | None = None,
+    q: str | None = Query(default=None, max_length=200),
+) -> Filters:
+    """Query parameters shared by the stored transaction endpoints."""
+    return Filters(
+        bank=bank,
+        transaction_type=transaction_type,
+        operation_type=operation_type,
+        date_from=date_from and date_from.isoformat(),
+        date_to=date_to and date_to.isoformat(),
+        min_amount_cents=min_amount_cents,
+        max_amount_cents=max_amount_cents,
+        search=q,
+    )
+
+
+@app.get("/api/transactions")
+async def list_transactions(
+    account: str = Query(default="default", min_length=1, max_length=200),
+    filters: Filters = Depends(_filters),
+    sort: Literal["date", "amount"] = "date",
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: str | None = None,
+):
+    """
+    Page through an account's stored transactions (see ``/api/ingest``).
+
+    Filters: ``bank``, ``transaction_type``, ``operation_type``,
+    ``date_from`` / ``date_to`` (YYYY-MM-DD, inclusive),
+    ``min_amount_cents`` / ``max_amount_cents`` and ``q`` (description
+    substring). Returns ``{"transactions", "next_cursor"}``; pass
+    ``next_cursor`` back as ``cursor`` for the next page, with the same
+    filters and sort. It is null on the last page.
+    """
+    try:
+        transactions, next_cursor = await asyncio.to_thread(
+            store.query, account, filters, sort, order == "desc", limit, cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(
+        content=dumps({"transactions": transactions, "next_cursor": next_cursor}),
+        media_type="application/json",
+    )
+
+
+@app.get("/api/transactions/summary")
+async def summarize_transactions(
+    group_by: Literal["bank", "transaction_type", "operation_type", "month"],
+    account: str = Query(default="default", min_length=1, max_length=200),
+    filters: Filters = Depends(_filters),
+):
+    """
+    Count and sum an account's stored transactions per ``group_by`` value,
+    with the same filters as ``/api/transactions``. Returns ``{"groups":
+    [{"key", "count", "total_cents", "deposits_cents",
+    "withdrawals_cents"}]}`` in key order.
+    """
+    return {"groups": await asyncio.to_thread(store.summary, account, group_by, filters)}
+
+
+class ExportedTransaction(BaseModel):
+    date: str
+    description: str
+    amount_cents: int
+    transaction_type: str
+    operation_type: str
+    bank: str
+
+
+class SheetsExport(BaseModel):
+    spreadsheet_id: str
+    sheet: str = "Transações"
+    transactions: list[ExportedTransaction]
+
+
+@app.post("/api/export/sheets")
+async def export_to_sheets(export: SheetsExport, authorization: str | None = Header(default=None)):
+    """
+    Append parsed transactions to a Google Sheets spreadsheet.
+
+    Takes the ``transactions`` of a ``/api/parse`` response and the target
+    ``spreadsheet_id`` (plus optional tab name), authenticated with the
+    user's Google OAuth access token as ``Authorization: Bearer <token>``.
+    Returns the write stats: rows, API requests, retries, seconds and
+    rows_per_second.
+    """
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(status_code=401, detail="A Google access token is required.")
+
+    transactions = [
+        Transaction(t.date, t.description, t.amount_cents, t.transaction_type, t.operation_type, t.bank)
+        for t in export.transactions
+    ]
+    try:
+        stats = await asyncio.to_thread(
+            sheets.export_transactions, token, export.spreadsheet_id, transactions, export.sheet
+        )
+    except SheetsError as e:
+        # Auth and "no such spreadsheet" errors are the caller's to fix
+        status = e.status_code if e.status_code in (400, 401, 403, 404) else 502
+        raise HTTPException(status_code=status, detail=str(e))
+    return stats.to_dict()
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    return cache.stats()
+
+
 @app.get("/api/health")
 async def health():
     return {"status": "ok"}
@@ -0,0 +1,245 @@
+"""
+Prometheus metrics and per-request profiling.
+
+Counters, histograms and gauges live in a process-local registry that
+:func:`render` writes out in the Prometheus text exposition format, so no
+client library is needed. Parsing runs in pool worker processes, whose
+registry nobody scrapes: while a job runs under :func:`capture`, metric
+updates are buffered instead, the engine ships the buffer back with the
+job's result and :func:`replay` applies it to the parent's registry.
+"""
+
+import cProfile
+import io
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+# Seconds; spans a header-only detect up to a job timeout
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_lock = threading.Lock()
+_buffer: ContextVar[list | None] = ContextVar("metrics_buffer", default=None)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else f"{int(value)}.0"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float, key: tuple[str, ...]) -> None:
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Iterator[str]:
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # key -> [per-bucket counts..., +Inf count, sum]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, key: tuple[str, ...]) -> None:
+        row = self._values.get(key)
+        if row is None:
+            row = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                row[i] += 1
+                break
+        else:
+            row[len(self.buckets)] += 1
+        row[-1] += value
+
+    def samples(self) -> Iterator[str]:
+        for key, row in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), row):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _format_labels(self.labels, key, f'le="{le}"')
+                yield f"{self.name}_bucket{labels} {_format_value(cumulative)}"
+            labels = _format_labels(self.labels, key)
+            yield f"{self.name}_sum{labels} {_format_value(row[-1])}"
+            yield f"{self.name}_count{labels} {_format_value(cumulative)}"
+
+
+class Gauge:
+    """A value read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, read: Callable[[], float]):
+        self.name = name
+        self.help = help
+        self.read = read
+
+    def samples(self) -> Iterator[str]:
+        yield f"{self.name} {_format_value(self.read())}"
+
+
+_REGISTRY: dict[str, Counter | Histogram | Gauge] = {}
+
+
+def _register(metric):
+    _REGISTRY[metric.name] = metric
+    return metric
+
+
+_register(Histogram(
+    "extrato_stage_seconds",
+    "Seconds spent per parse stage (read, open, detect, extract, parse, serialize, summarize), per statement.",
+    ("stage",),
+))
+_register(Histogram(
+    "extrato_http_request_seconds",
+    "Time until the response headers are sent, per route.",
+    ("method", "route", "status"),
+))
+_register(Counter("extrato_bytes_in_total", "Bytes of PDF uploaded."))
+_register(Counter("extrato_pages_total", "PDF pages extracted.", ("bank",)))
+_register(Counter(
+    "extrato_pages_skipped_total", "PDF pages the bank parser had no use for, never laid out.", ("bank",)
+))
+_register(Counter("extrato_transactions_total", "Transactions parsed.", ("bank",)))
+_register(Counter(
+    "extrato_lines_total",
+    "Statement text lines seen by the bank parsers, by whether they produced a transaction.",
+    ("bank", "outcome"),
+))
+_register(Histogram(
+    "extrato_detect_confidence",
+    "Share of the bank signatures on page one that name the detected bank.",
+    ("bank",),
+    buckets=(0.25, 0.5, 0.75, 0.9, 1.0),
+))
+_register(Histogram(
+    "extrato_sheets_request_seconds",
+    "Google Sheets API call latency, by response status.",
+    ("status",),
+))
+_register(Counter("extrato_cache_hits_total", "Parse results served from the cache."))
+_register(Counter("extrato_cache_misses_total", "Parse result cache lookups that found nothing."))
+_register(Counter("extrato_sheets_rows_total", "Transactions exported to Google Sheets."))
+_register(Counter(
+    "extrato_ingested_transactions_total",
+    "Transactions ingested into the store, new or already stored.",
+    ("result",),
+))
+
+
+def gauge(name: str, help: str, read: Callable[[], float]) -> None:
+    """Register a gauge whose value is read from ``read()`` on every scrape."""
+    _register(Gauge(name, help, read))
+
+
+def _apply(kind: str, name: str, value: float, labels: dict[str, str]) -> None:
+    metric = _REGISTRY[name]
+    key = tuple(str(labels[label]) for label in metric.labels)
+    with _lock:
+        if kind == "inc":
+            metric.inc(value, key)
+        else:
+            metric.observe(value, key)
+
+
+def inc(name: str, amount: float = 1, **labels: str) -> None:
+    """Add ``amount`` to counter ``name``."""
+    buffer = _buffer.get()
+    if buffer is not None:
+        buffer.append(("inc", name, amount, labels))
+    else:
+        _apply("inc", name, amount, labels)
+
+
+def observe(name: str, value: float, **labels: str) -> None:
+    """Record ``value`` in histogram ``name``."""
+    buffer = _buffer.get()
+    if buffer is not None:
+        buffer.append(("observe", name, value, labels))
+    else:
+        _apply("observe", name, value, labels)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Observe the duration of the block as ``extrato_stage_seconds{stage}``."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe("extrato_stage_seconds", time.perf_counter() - started, stage=stage)
+
+
+@contextmanager
+def capture() -> Iterator[list]:
+    """Buffer metric updates made inside the block (in this context) into
+    the yielded list instead of applying them."""
+    events: list = []
+    token = _buffer.set(events)
+    try:
+        yield events
+    finally:
+        _buffer.reset(token)
+
+
+def replay(events: list) -> None:
+    """Apply updates buffered by :func:`capture`, e.g. in a worker."""
+    for kind, name, value, labels in events:
+        _apply(kind, name, value, labels)
+
+
+def render() -> str:
+    """The registry in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        for metric in _REGISTRY.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+def profile_call(fn: Callable[..., Any], *args: Any) -> tuple[Any, str]:
+    """Run ``fn(*args)`` under cProfile; return its result and a report of
+    the top functions by cumulative time."""
+    profiler = cProfile.Profile()
+    result = profiler.runcall(fn, *args)
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(40)
+    return result, report.getvalue()
@@ -1,16 +1,36 @@
 """Unified transaction model for all bank parsers."""
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
 
-@dataclass
+# Slotted: no per-instance __dict__, which matters at 100k+ rows. The
+# bank / type / operation fields always hold string literals from the
+# parsers, so they are interned and shared between rows.
+# The parsers construct it positionally, in field order: keyword
+# arguments cost measurably more per row on that hot path.
+@dataclass(slots=True)
 class Transaction:
     date: str  # DD/MM/YYYY
     description: str
-    amount: float  # negative = withdrawal, positive = deposit
+    amount_cents: int  # centavos; negative = withdrawal, positive = deposit
     transaction_type: str  # PIX, TED, BOLETO, TARIFA, RENDIMENTO, SALARIO, etc.
     operation_type: str  # "deposit" or "withdrawal"
     bank: str  # "itau", "nubank", "inter"
 
+    @property
+    def amount(self) -> float:
+        """Amount in reais, for display. Aggregate ``amount_cents`` instead."""
+        # Exact: the nearest float to N/100 always prints as the decimal N/100
+        return self.amount_cents / 100
+
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Built directly; dataclasses.asdict deep-copies recursively
+        return {
+            "date": self.date,
+            "description": self.description,
+            "amount": self.amount,
+            "amount_cents": self.amount_cents,
+            "transaction_type": self.transaction_type,
+            "operation_type": self.operation_type,
+            "bank": self.bank,
+        }
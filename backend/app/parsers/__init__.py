@@ -4,58 +4,295 @@ Bank statement PDF parsers.
 Auto-detects the bank from PDF content and routes to the correct parser.
 """
 
-from app.parsers.itau import parse_itau
-from app.parsers.nubank import parse_nubank
-from app.parsers.inter import parse_inter
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+from app import metrics
+from app.parsers.itau import ItauParser, parse_itau
+from app.parsers.nubank import NubankParser, parse_nubank
+from app.parsers.inter import InterParser, parse_inter
+from app.parsers.registry import BANKS, Bank, Detection, new_parser as _new_parser, register
+from app.parsers.registry import detect as _registry_detect
+from app.parsers.extractors import DEFAULT_EXTRACTOR, EXTRACTORS, open_document, preload
 from app.models import Transaction
 
-import pdfplumber
+# Bump whenever parser output changes; it is part of the result cache key.
+PARSER_VERSION = "2"
+
+
+def result_version(extractor: str = DEFAULT_EXTRACTOR) -> str:
+    """PARSER_VERSION qualified by the text extractor, for cache keys."""
+    return PARSER_VERSION if extractor == DEFAULT_EXTRACTOR else f"{PARSER_VERSION}+{extractor}"
+
+
+# Top slice of the first page scanned for bank branding before the full
+# page goes through layout analysis.
+_HEADER_FRACTION = 0.2
+
+
+def detect(text: str) -> Detection | None:
+    """Detect the bank of a statement page, with a confidence score.
+
+    Every registered bank's signatures are found in one scan; when several
+    banks are mentioned (Nubank and Inter transactions name Itaú accounts)
+    the highest priority one wins, at lower confidence.
+    """
+    return _registry_detect(text)
+
+
+def _unsupported_bank() -> ValueError:
+    return ValueError(
+        "Could not detect bank from PDF content. "
+        f"Supported banks: {', '.join(bank.label for bank in BANKS.values())}."
+    )
 
 
 def detect_bank(text: str) -> str:
-    """Detect bank from the first page text content.
-
-    Order matters: Nubank and Inter PDFs can mention "Itaú" in transaction
-    descriptions, so we check for their distinctive keywords first.
-    """
-    text_lower = text.lower()
-
-    # Check Nubank first — their PDFs always contain "Nu Financeira" or "Nu Pagamentos"
-    if "nu financeira" in text_lower or "nu pagamentos" in text_lower or "nubank" in text_lower:
-        return "nubank"
-    elif "banco inter" in text_lower:
-        return "inter"
-    elif "itaú" in text_lower or "itau" in text_lower:
-        return "itau"
-    else:
-        raise ValueError(
-            "Could not detect bank from PDF content. "
-            "Supported banks: Itaú, Nubank, Banco Inter."
-        )
-
-
-def parse_pdf(file_bytes: bytes) -> list[Transaction]:
-    """Parse a bank statement PDF and return a list of transactions."""
-    import io
-
-    with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-        if not pdf.pages:
-            raise ValueError("PDF has no pages.")
-
-        # Gather all text for bank detection
-        first_page_text = pdf.pages[0].extract_text() or ""
-        bank = detect_bank(first_page_text)
-
-        # Gather full text from all pages
-        full_text = "\n".join(
-            page.extract_text() or "" for page in pdf.pages
-        )
-
-        if bank == "itau":
-            return parse_itau(full_text)
-        elif bank == "nubank":
-            return parse_nubank(full_text)
-        elif bank == "inter":
-            return parse_inter(full_text)
-        else:
-            raise ValueError(f"No parser for bank: {bank}")
+    """Detect bank from the first page text content."""
+    detection = detect(text)
+    if detection is None:
+        raise _unsupported_bank()
+    return detection.bank
+
+
+def _detect_from_header(doc, index: int = 0) -> Detection | None:
+    """Detect the bank from the page header alone, if it is conclusive.
+
+    With pdfplumber this only lays out the header slice. A hit on a bank
+    that is not ``header_conclusive`` (Itaú) needs the full-page check.
+    """
+    detection = detect(doc.header_text(index, _HEADER_FRACTION))
+    if detection is None or not BANKS[detection.bank].header_conclusive:
+        return None
+    return detection
+
+
+class _Stats:
+    """Stage timings and counts for one statement, sent to metrics once."""
+
+    def __init__(self, bank: str = "unknown"):
+        self.bank = bank
+        self.seconds: dict[str, float] = {}
+        self.pages = 0
+        self.skipped = 0
+        self.lines = 0
+        self.transactions = 0
+        self.confidence: float | None = None
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + time.perf_counter() - started
+
+    def feed(self, parser, chunk: str) -> list[Transaction]:
+        with self.timed("parse"):
+            transactions = list(parser.feed(chunk))
+        self.lines += chunk.count("\n") + 1
+        self.transactions += len(transactions)
+        return transactions
+
+    def record(self) -> None:
+        for stage, seconds in self.seconds.items():
+            metrics.observe("extrato_stage_seconds", seconds, stage=stage)
+        if self.confidence is not None:
+            metrics.observe("extrato_detect_confidence", self.confidence, bank=self.bank)
+        if self.pages:
+            metrics.inc("extrato_pages_total", self.pages, bank=self.bank)
+        if self.skipped:
+            metrics.inc("extrato_pages_skipped_total", self.skipped, bank=self.bank)
+        if self.lines:
+            metrics.inc("extrato_transactions_total", self.transactions, bank=self.bank)
+            metrics.inc("extrato_lines_total", self.transactions, bank=self.bank, outcome="parsed")
+            metrics.inc(
+                "extrato_lines_total", self.lines - self.transactions,
+                bank=self.bank, outcome="skipped",
+            )
+
+
+def _detect_first_page(doc, stats: _Stats) -> tuple[str, str]:
+    """Return ``(bank, first_page_text)``, laying out page one only once."""
+    if not len(doc):
+        raise ValueError("PDF has no pages.")
+
+    # Each page is laid out exactly once; the first page's text serves
+    # both bank detection and the bank parser. Cropping the header makes
+    # pdfminer interpret the whole page, so that cost lands in "detect".
+    with stats.timed("detect"):
+        detection = _detect_from_header(doc)
+    with stats.timed("extract"):
+        first_page_text = doc.page_text(0)
+    if detection is None:
+        with stats.timed("detect"):
+            detection = detect(first_page_text)
+        if detection is None:
+            raise _unsupported_bank()
+    stats.bank = detection.bank
+    stats.confidence = detection.confidence
+    return detection.bank, first_page_text
+
+
+def iter_transactions(bank: str, chunks: Iterable[str]) -> Iterator[Transaction]:
+    """Incrementally parse a statement given as page texts (or lines).
+
+    Chunks are pulled lazily, one at a time, and parser state such as the
+    current date header or Nubank's "Movimentações" flag carries across
+    chunk boundaries, so the result matches parsing the joined text.
+    """
+    parser = _new_parser(bank)
+    stats = _Stats(bank)
+    try:
+        for chunk in chunks:
+            yield from stats.feed(parser, chunk)
+    finally:
+        stats.record()
+
+
+def _iter_page_texts(doc, first_page_text: str, parser, stats: _Stats) -> Iterator[str | None]:
+    """Lay out pages one at a time, releasing each page's parsed objects.
+
+    Once the parser is ``done`` the remaining pages are yielded as None
+    without being laid out. The caller must feed each text to ``parser``
+    before pulling the next one, since that is what updates its state.
+    """
+    stats.pages += 1
+    yield first_page_text
+    doc.release(0)
+    for index in range(1, len(doc)):
+        if getattr(parser, "done", False):
+            stats.skipped += 1
+            yield None
+            continue
+        with stats.timed("extract"):
+            text = doc.page_text(index)
+            doc.release(index)
+        stats.pages += 1
+        yield text
+
+
+@contextmanager
+def _open(source: bytes | str, stats: _Stats, extractor: str) -> Iterator:
+    """Open a PDF given as bytes or as a path to a (spooled) file."""
+    with stats.timed("open"):
+        doc = open_document(source, extractor)
+    try:
+        yield doc
+    finally:
+        doc.close()
+
+
+def _parse_pages(doc, stats: _Stats) -> list[Transaction]:
+    bank, first_page_text = _detect_first_page(doc, stats)
+    parser = _new_parser(bank)
+    # Pages stream through the parser; no full-document text is built
+    transactions = []
+    for text in _iter_page_texts(doc, first_page_text, parser, stats):
+        if text is not None:
+            transactions.extend(stats.feed(parser, text))
+    return transactions
+
+
+def parse_pdf(file_bytes: bytes | str, extractor: str = DEFAULT_EXTRACTOR) -> list[Transaction]:
+    """Parse a bank statement PDF (bytes or a file path) and return a list
+    of transactions, extracting its text with ``extractor``."""
+    stats = _Stats()
+    try:
+        with _open(file_bytes, stats, extractor) as doc:
+            return _parse_pages(doc, stats)
+    finally:
+        stats.record()
+
+
+def parse_pdf_if_short(
+    file_bytes: bytes | str,
+    max_pages: int,
+    extractor: str = DEFAULT_EXTRACTOR,
+) -> tuple[int, list[Transaction] | None]:
+    """Parse a PDF of at most ``max_pages`` pages like :func:`parse_pdf`.
+
+    Returns ``(total_pages, transactions)``. Longer PDFs are only opened,
+    and come back as ``(total_pages, None)`` so the caller can split their
+    extraction with :func:`extract_pages`.
+    """
+    stats = _Stats()
+    try:
+        with _open(file_bytes, stats, extractor) as doc:
+            total_pages = len(doc)
+            if total_pages > max_pages:
+                return total_pages, None
+            return total_pages, _parse_pages(doc, stats)
+    finally:
+        stats.record()
+
+
+def extract_pages(
+    file_bytes: bytes | str,
+    start: int,
+    stop: int,
+    extractor: str = DEFAULT_EXTRACTOR,
+) -> tuple[str | None, list[str]]:
+    """Lay out pages ``start`` to ``stop`` (0-based, exclusive) only.
+
+    Returns ``(bank, page_texts)``; the bank is detected by the chunk that
+    holds page one and is None for every other chunk. Pages are left for
+    the caller to count, since only it knows the bank to label them with.
+    """
+    stats = _Stats()
+    try:
+        with _open(file_bytes, stats, extractor) as doc:
+            bank = None
+            texts = []
+            if start == 0:
+                bank, first_page_text = _detect_first_page(doc, stats)
+                texts.append(first_page_text)
+                doc.release(0)
+                start = 1
+            for index in range(start, stop):
+                with stats.timed("extract"):
+                    texts.append(doc.page_text(index))
+                    doc.release(index)
+            return bank, texts
+    finally:
+        stats.record()
+
+
+def iter_parse_pdf(file_bytes: bytes | str, extractor: str = DEFAULT_EXTRACTOR) -> Iterator[dict]:
+    """Parse a bank statement PDF page by page, yielding progress events.
+
+    Yields ``{"event": "start", "bank", "total_pages"}`` once, then one
+    ``{"event": "page", "page", "total_pages", "transactions"}`` per page
+    as soon as that page has been extracted and parsed. Pages the bank
+    parser skips come with no transactions.
+    """
+    stats = _Stats()
+    try:
+        with _open(file_bytes, stats, extractor) as doc:
+            bank, first_page_text = _detect_first_page(doc, stats)
+            parser = _new_parser(bank)
+
+            total_pages = len(doc)
+            yield {"event": "start", "bank": bank, "total_pages": total_pages}
+
+            page_texts = _iter_page_texts(doc, first_page_text, parser, stats)
+            for number, text in enumerate(page_texts, start=1):
+                yield {
+                    "event": "page",
+                    "page": number,
+                    "total_pages": total_pages,
+                    "transactions": [] if text is None else stats.feed(parser, text),
+                }
+    finally:
+        stats.record()
+
+
+def warm_up(extractor: str = DEFAULT_EXTRACTOR) -> None:
+    """Load what the first parse would otherwise pay for.
+
+    Meant as a pool worker's initializer: importing this package has
+    already compiled the bank parsers' regexes, and this imports the
+    extraction library.
+    """
+    preload(extractor)
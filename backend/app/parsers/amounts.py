@@ -0,0 +1,27 @@
+"""Shared parsing of Brazilian currency amounts into integer centavos."""
+
+
+def parse_brl_cents(value_str: str) -> int:
+    """Parse a Brazilian amount like '-1.883,12' into centavos (-188312).
+
+    "." is a thousands separator and "," the decimal separator. Amounts
+    stay integers end to end, so sums are exact. Raises ValueError for
+    anything that is not a well-formed amount.
+    """
+    value = value_str.strip().replace(".", "")
+
+    # Fast path, the shape of nearly every statement amount: "[-]d,dd"
+    if value[-3:-2] == "," and value.isascii():
+        return int(value[:-3] + value[-2:])
+
+    negative = value.startswith("-")
+    if negative:
+        value = value[1:]
+
+    whole, _, fraction = value.partition(",")
+    digits = whole + fraction
+    if not digits or not digits.isascii() or not digits.isdigit() or len(fraction) > 2:
+        raise ValueError(f"Not a currency amount: {value_str!r}")
+
+    cents = int(whole or "0") * 100 + int(fraction.ljust(2, "0"))
+    return -cents if negative else cents
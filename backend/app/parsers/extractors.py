@@ -0,0 +1,133 @@
+"""
+Text extraction backends.
+
+The bank parsers only ever see page texts, so how those texts are pulled
+out of the PDF is pluggable. An extractor opens a PDF (bytes or a file
+path) as a document that lays out one page at a time:
+
+- ``pdfplumber`` (default): pdfminer's character-level layout analysis,
+  in pure Python. Slow, but the output the parsers were written against.
+- ``pdfium``: PDFium's native text extraction through pypdfium2 (already
+  a pdfplumber dependency). Tens of times faster, and gives the same
+  lines on our line-oriented statements.
+
+Each backend's library is imported when its first document is opened
+(pdfplumber pulls in pdfminer, which alone takes ~100 ms), so the web
+process never loads it; :func:`preload` imports it ahead of time.
+"""
+
+import importlib
+import io
+import mmap
+from contextlib import ExitStack
+
+DEFAULT_EXTRACTOR = "pdfplumber"
+
+# What each backend imports on first use; fontmetrics is pdfminer's table
+# of the standard 14 fonts, loaded on the first page that uses one
+_MODULES = {
+    "pdfplumber": ("pdfplumber", "pdfminer.fontmetrics"),
+    "pdfium": ("pypdfium2",),
+}
+
+
+class PdfplumberDocument:
+    def __init__(self, source: bytes | str):
+        import pdfplumber
+
+        self._stack = ExitStack()
+        if isinstance(source, str):
+            # Memory-mapped, so workers opening the same spooled upload
+            # share it through the page cache
+            with open(source, "rb") as f:
+                stream = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            stream = io.BytesIO(source)
+        self._stack.callback(stream.close)
+        try:
+            self._pdf = self._stack.enter_context(pdfplumber.open(stream))
+        except BaseException:
+            self._stack.close()
+            raise
+        self._pages = self._pdf.pages
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def page_text(self, index: int) -> str:
+        return self._pages[index].extract_text() or ""
+
+    def header_text(self, index: int, fraction: float) -> str:
+        # Cropped pages reuse the parent page's parsed characters
+        page = self._pages[index]
+        x0, top, x1, bottom = page.bbox
+        return page.crop((x0, top, x1, top + (bottom - top) * fraction)).extract_text() or ""
+
+    def release(self, index: int) -> None:
+        self._pages[index].close()
+
+    def close(self) -> None:
+        self._stack.close()
+
+
+class PdfiumDocument:
+    def __init__(self, source: bytes | str):
+        import pypdfium2
+
+        self._pdf = pypdfium2.PdfDocument(source)
+        # index -> (page, textpage), kept until released
+        self._open: dict[int, tuple] = {}
+
+    def __len__(self) -> int:
+        return len(self._pdf)
+
+    def _textpage(self, index: int):
+        if index not in self._open:
+            page = self._pdf[index]
+            self._open[index] = (page, page.get_textpage())
+        return self._open[index]
+
+    def page_text(self, index: int) -> str:
+        _, textpage = self._textpage(index)
+        return textpage.get_text_bounded().replace("\r\n", "\n")
+
+    def header_text(self, index: int, fraction: float) -> str:
+        page, textpage = self._textpage(index)
+        left, bottom, right, top = page.get_bbox()
+        text = textpage.get_text_bounded(left, top - (top - bottom) * fraction, right, top)
+        return text.replace("\r\n", "\n")
+
+    def release(self, index: int) -> None:
+        opened = self._open.pop(index, None)
+        if opened is not None:
+            page, textpage = opened
+            textpage.close()
+            page.close()
+
+    def close(self) -> None:
+        for index in list(self._open):
+            self.release(index)
+        self._pdf.close()
+
+
+EXTRACTORS = {
+    "pdfplumber": PdfplumberDocument,
+    "pdfium": PdfiumDocument,
+}
+
+
+def open_document(source: bytes | str, extractor: str = DEFAULT_EXTRACTOR):
+    """Open a PDF with the named extractor. Close the result when done."""
+    try:
+        document_class = EXTRACTORS[extractor]
+    except KeyError:
+        raise ValueError(
+            f"Unknown extractor: {extractor}. Available: {', '.join(EXTRACTORS)}."
+        ) from None
+    return document_class(source)
+
+
+def preload(extractor: str = DEFAULT_EXTRACTOR) -> None:
+    """Import ``extractor``'s libraries now rather than on the first parse."""
+    for module in _MODULES[extractor]:
+        importlib.import_module(module)
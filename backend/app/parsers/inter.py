@@ -1,7 +1,12 @@
 """Parser for Banco Inter bank statements."""
 
 import re
+from typing import Iterator
+
 from app.models import Transaction
+from app.parsers.amounts import parse_brl_cents
+from app.parsers.keywords import KeywordRule, classify
+from app.parsers.registry import Bank, register
 
 
 # Month name mapping (Portuguese, full names)
@@ -26,90 +31,103 @@ _TRANSACTION_RE = re.compile(
 )
 
 
-def _parse_amount(value_str: str) -> float:
-    """Parse Brazilian currency string."""
-    cleaned = value_str.strip().replace(".", "").replace(",", ".")
-    return float(cleaned)
+# Checked in order; the first matching rule wins
+_TYPE_RULES = (
+    KeywordRule("PIX", contains=("pix",)),
+    KeywordRule("INVESTIMENTO", contains=("aplicacao", "aplicação")),
+    KeywordRule("RESGATE", contains=("resgate",)),
+    KeywordRule("TED", contains=("ted",)),
+    KeywordRule("BOLETO", contains=("boleto",)),
+    KeywordRule("RENDIMENTO", contains=("rendimento",)),
+    KeywordRule("TARIFA", contains=("tarifa", "taxa")),
+)
 
 
 def _infer_transaction_type(action: str) -> str:
     """Infer transaction type from the action prefix."""
-    action_lower = action.strip().lower()
-
-    if "pix" in action_lower:
-        return "PIX"
-    elif "aplicacao" in action_lower or "aplicação" in action_lower:
-        return "INVESTIMENTO"
-    elif "resgate" in action_lower:
-        return "RESGATE"
-    elif "ted" in action_lower:
-        return "TED"
-    elif "boleto" in action_lower:
-        return "BOLETO"
-    elif "rendimento" in action_lower:
-        return "RENDIMENTO"
-    elif "tarifa" in action_lower or "taxa" in action_lower:
-        return "TARIFA"
-    else:
-        return "OUTRO"
+    return classify(action.strip().lower(), _TYPE_RULES, "OUTRO")
+
+
+def _classify(line: str) -> re.Match | None:
+    """Match a line as a date header or a transaction, or None to skip it.
+
+    ``match.re`` tells which one matched. Date headers start with the day
+    number, so only lines starting with a digit pay for the date regex;
+    everything else goes straight to the transaction regex.
+    """
+    if line[0].isdigit():
+        match = _DATE_HEADER_RE.match(line)
+        if match:
+            return match
+    return _TRANSACTION_RE.match(line)
+
+
+class InterParser:
+    """Incremental Banco Inter parser.
+
+    Feed it the statement text in chunks (e.g. one page at a time); the
+    current date header carries over between chunks.
+    """
+
+    def __init__(self):
+        self.current_date: str | None = None
+
+    def feed(self, text: str) -> Iterator[Transaction]:
+        for line in text.split("\n"):
+            line = line.strip()
+            if not line:
+                continue
+
+            match = _classify(line)
+            if match is None:
+                continue
+
+            # Date header
+            if match.re is _DATE_HEADER_RE:
+                day = match.group(1).zfill(2)
+                month_name = match.group(2).lower()
+                year = match.group(3)
+
+                month_num = _MONTHS_PT_FULL.get(month_name)
+                if month_num:
+                    self.current_date = f"{day}/{month_num}/{year}"
+                continue
+
+            if self.current_date is None:
+                continue
+
+            # Transaction line
+            action = match.group(1).strip()         # e.g. "Pix enviado"
+            description = match.group(2).strip()    # e.g. "Cp :44815065-PAY2ALL..."
+            sign = match.group(3)                   # "-" or ""
+            amount_str = match.group(4)             # e.g. "44,99"
+
+            try:
+                amount = parse_brl_cents(amount_str)
+            except ValueError:
+                continue
+
+            if sign == "-":
+                amount = -amount
+
+            tx_type = _infer_transaction_type(action)
+            operation = "deposit" if amount >= 0 else "withdrawal"
+
+            # Build a cleaner description combining action and target
+            clean_desc = f"{action}: {description}"
+
+            yield Transaction(self.current_date, clean_desc, amount, tx_type, operation, "inter")
 
 
 def parse_inter(text: str) -> list[Transaction]:
     """Parse full text from a Banco Inter bank statement PDF."""
-    transactions: list[Transaction] = []
-    current_date: str | None = None
-
-    for line in text.split("\n"):
-        line = line.strip()
-        if not line:
-            continue
-
-        # Check for date header
-        date_match = _DATE_HEADER_RE.match(line)
-        if date_match:
-            day = date_match.group(1).zfill(2)
-            month_name = date_match.group(2).lower()
-            year = date_match.group(3)
-
-            month_num = _MONTHS_PT_FULL.get(month_name)
-            if month_num:
-                current_date = f"{day}/{month_num}/{year}"
-            continue
-
-        if current_date is None:
-            continue
-
-        # Try to match a transaction line
-        tx_match = _TRANSACTION_RE.match(line)
-        if not tx_match:
-            continue
-
-        action = tx_match.group(1).strip()        # e.g. "Pix enviado"
-        description = tx_match.group(2).strip()    # e.g. "Cp :44815065-PAY2ALL..."
-        sign = tx_match.group(3)                   # "-" or ""
-        amount_str = tx_match.group(4)             # e.g. "44,99"
-
-        try:
-            amount = _parse_amount(amount_str)
-        except ValueError:
-            continue
-
-        if sign == "-":
-            amount = -amount
-
-        tx_type = _infer_transaction_type(action)
-        operation = "deposit" if amount >= 0 else "withdrawal"
-
-        # Build a cleaner description combining action and target
-        clean_desc = f"{action}: {description}"
-
-        transactions.append(Transaction(
-            date=current_date,
-            description=clean_desc,
-            amount=amount,
-            transaction_type=tx_type,
-            operation_type=operation,
-            bank="inter",
-        ))
-
-    return transactions
+    return list(InterParser().feed(text))
+
+
+register(Bank(
+    "inter",
+    label="Banco Inter",
+    signatures=("banco inter",),
+    priority=20,
+    parser=InterParser,
+))
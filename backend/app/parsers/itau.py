@@ -1,40 +1,30 @@
 """Parser for Itaú bank statements (Extrato Conta / Lançamentos)."""
 
 import re
-from app.models import Transaction
-
+from typing import Iterator
 
-def _parse_amount(value_str: str) -> float:
-    """Parse Brazilian currency string like '-1.883,12' to float."""
-    cleaned = value_str.strip()
-    cleaned = cleaned.replace(".", "").replace(",", ".")
-    return float(cleaned)
+from app.models import Transaction
+from app.parsers.amounts import parse_brl_cents
+from app.parsers.keywords import KeywordRule, classify
+from app.parsers.registry import Bank, register
+
+
+# Checked in order; the first matching rule wins
+_TYPE_RULES = (
+    KeywordRule("PIX", prefixes=("PIX TRANSF", "PIX QRS")),
+    KeywordRule("PIX_DEVOLUCAO", prefixes=("DEV PIX",)),
+    KeywordRule("FATURA", contains=("FATURA PAGA",)),
+    KeywordRule("RENDIMENTO", contains=("REND PAGO APLIC", "REMUNERACAO")),
+    KeywordRule("SALARIO", contains=("REMUNERACAO/SALARIO", "SISPAG")),
+    KeywordRule("TARIFA", prefixes=("TAR ",)),
+    KeywordRule("TED", contains=("TED",)),
+    KeywordRule("DOC", contains=("DOC",)),
+)
 
 
 def _infer_transaction_type(description: str) -> str:
     """Infer transaction type from Itaú description keywords."""
-    desc_upper = description.upper()
-
-    if desc_upper.startswith("PIX TRANSF"):
-        return "PIX"
-    elif desc_upper.startswith("PIX QRS"):
-        return "PIX"
-    elif desc_upper.startswith("DEV PIX"):
-        return "PIX_DEVOLUCAO"
-    elif "FATURA PAGA" in desc_upper:
-        return "FATURA"
-    elif "REND PAGO APLIC" in desc_upper or "REMUNERACAO" in desc_upper:
-        return "RENDIMENTO"
-    elif "REMUNERACAO/SALARIO" in desc_upper or "SISPAG" in desc_upper:
-        return "SALARIO"
-    elif desc_upper.startswith("TAR "):
-        return "TARIFA"
-    elif "TED" in desc_upper:
-        return "TED"
-    elif "DOC" in desc_upper:
-        return "DOC"
-    else:
-        return "OUTRO"
+    return classify(description.upper(), _TYPE_RULES, "OUTRO")
 
 
 # Matches lines like: DD/MM/YYYY DESCRIPTION VALUE
@@ -46,49 +36,70 @@ _TRANSACTION_LINE_RE = re.compile(
 )
 
 
+def _classify(line: str) -> re.Match | None:
+    """Return the transaction match for a line, or None if it is skipped.
+
+    Every transaction line starts with its date, so lines that do not
+    start with a digit are rejected before any substring scan or regex.
+    """
+    if not line[0].isdigit():
+        return None
+    # Skip balance lines (SALDO DO DIA)
+    if "SALDO DO DIA" in line:
+        return None
+    return _TRANSACTION_LINE_RE.match(line)
+
+
+class ItauParser:
+    """Incremental Itaú parser.
+
+    Feed it the statement text in chunks (e.g. one page at a time) and it
+    yields transactions as soon as their lines are seen.
+    """
+
+    def feed(self, text: str) -> Iterator[Transaction]:
+        for line in text.split("\n"):
+            line = line.strip()
+            if not line:
+                continue
+
+            match = _classify(line)
+            if not match:
+                continue
+
+            date_str = match.group(1)
+            description = match.group(2).strip()
+            amount_str = match.group(3)
+
+            try:
+                amount = parse_brl_cents(amount_str)
+            except ValueError:
+                continue
+
+            # Determine transaction type - re-check for salary since
+            # _infer_transaction_type checks for SISPAG too
+            tx_type = _infer_transaction_type(description)
+
+            # Override: if REMUNERACAO/SALARIO is in desc, it's salary
+            if "REMUNERACAO/SALARIO" in description.upper():
+                tx_type = "SALARIO"
+
+            operation = "deposit" if amount >= 0 else "withdrawal"
+
+            yield Transaction(date_str, description, amount, tx_type, operation, "itau")
+
+
 def parse_itau(text: str) -> list[Transaction]:
     """Parse full text from an Itaú bank statement PDF."""
-    transactions: list[Transaction] = []
-
-    for line in text.split("\n"):
-        line = line.strip()
-        if not line:
-            continue
-
-        # Skip balance lines (SALDO DO DIA)
-        if "SALDO DO DIA" in line:
-            continue
-
-        match = _TRANSACTION_LINE_RE.match(line)
-        if not match:
-            continue
-
-        date_str = match.group(1)
-        description = match.group(2).strip()
-        amount_str = match.group(3)
-
-        try:
-            amount = _parse_amount(amount_str)
-        except ValueError:
-            continue
-
-        # Determine transaction type - re-check for salary since
-        # _infer_transaction_type checks for SISPAG too
-        tx_type = _infer_transaction_type(description)
-
-        # Override: if REMUNERACAO/SALARIO is in desc, it's salary
-        if "REMUNERACAO/SALARIO" in description.upper():
-            tx_type = "SALARIO"
-
-        operation = "deposit" if amount >= 0 else "withdrawal"
-
-        transactions.append(Transaction(
-            date=date_str,
-            description=description,
-            amount=amount,
-            transaction_type=tx_type,
-            operation_type=operation,
-            bank="itau",
-        ))
-
-    return transactions
+    return list(ItauParser().feed(text))
+
+
+register(Bank(
+    "itau",
+    label="Itaú",
+    signatures=("itaú", "itau"),
+    priority=10,
+    parser=ItauParser,
+    # Nubank and Inter transactions name Itaú accounts; only a full page settles it
+    header_conclusive=False,
+))
@@ -0,0 +1,29 @@
+"""Ordered keyword tables for classifying transaction descriptions."""
+
+from typing import NamedTuple
+
+
+class KeywordRule(NamedTuple):
+    """A ``label`` that applies when the text starts with one of
+    ``prefixes`` or contains one of ``contains``."""
+
+    label: str
+    contains: tuple[str, ...] = ()
+    prefixes: tuple[str, ...] = ()
+
+
+def classify(text: str, rules: tuple[KeywordRule, ...], default: str) -> str:
+    """Return the label of the first rule in ``rules`` matching ``text``.
+
+    Equivalent to an if/elif chain over the same keywords. ``text`` must
+    already be upper- or lowercased to match how the rules are written.
+    Checks are plain substring tests, which run in C and beat a combined
+    ``re`` alternation for keyword lists this short.
+    """
+    for label, contains, prefixes in rules:
+        if prefixes and text.startswith(prefixes):
+            return label
+        for keyword in contains:
+            if keyword in text:
+                return label
+    return default
@@ -1,7 +1,12 @@
 """Parser for Nubank bank statements."""
 
 import re
+from typing import Iterator
+
 from app.models import Transaction
+from app.parsers.amounts import parse_brl_cents
+from app.parsers.keywords import KeywordRule, classify
+from app.parsers.registry import Bank, register
 
 
 # Month abbreviation mapping (Portuguese)
@@ -21,127 +26,140 @@ _DATE_HEADER_RE = re.compile(
 _AMOUNT_TRAIL_RE = re.compile(r"^(.+?)\s+([\d]+(?:[.,]\d+)*)\s*$")
 
 # Footer / legal text keywords to skip
-_SKIP_KEYWORDS = [
+_SKIP_KEYWORDS = (
     "nu financeira", "nu pagamentos", "cnpj", "mande uma mensagem",
     "ouvidoria", "extrato gerado", "saldo líquido", "não nos responsabilizamos",
     "asseguramos", "4020 0185", "0800", "metropolitanas", "investimento pagamento",
     "disponíveis em", "sociedade de credito",
-]
+)
 
+# Summary lines to skip
+_SUMMARY_PREFIXES = ("Total de entradas", "Total de saídas")
+
+# Checked in order; the first matching rule wins
+_TYPE_RULES = (
+    KeywordRule("PIX", contains=("pix", "transferência")),
+    KeywordRule("FATURA", contains=("pagamento de fatura",)),
+    KeywordRule("RENDIMENTO", contains=("rendimento",)),
+    KeywordRule("DEBITO", contains=("compra no débito",)),
+    KeywordRule("ESTORNO", contains=("estorno", "devolução")),
+)
 
-def _parse_amount(value_str: str) -> float:
-    """Parse Brazilian currency string."""
-    cleaned = value_str.strip().replace(".", "").replace(",", ".")
-    return float(cleaned)
+# Incoming money; everything else is outgoing
+_DEPOSIT_RULES = (KeywordRule("deposit", contains=("recebid", "estorno", "devolução")),)
 
 
 def _infer_transaction_type(description: str) -> str:
     """Infer transaction type from Nubank description."""
-    desc_lower = description.lower()
-
-    if "pix" in desc_lower or "transferência" in desc_lower:
-        return "PIX"
-    elif "pagamento de fatura" in desc_lower:
-        return "FATURA"
-    elif "rendimento" in desc_lower:
-        return "RENDIMENTO"
-    elif "compra no débito" in desc_lower:
-        return "DEBITO"
-    elif "estorno" in desc_lower or "devolução" in desc_lower:
-        return "ESTORNO"
-    else:
-        return "OUTRO"
-
-
-def _infer_operation(description: str, amount: float) -> tuple[str, float]:
+    return classify(description.lower(), _TYPE_RULES, "OUTRO")
+
+
+def _infer_operation(description: str, amount: int) -> tuple[str, int]:
     """
     Determine if a transaction is a deposit or withdrawal.
     Nubank shows amounts as positive; we use the description to decide sign.
     """
-    desc_lower = description.lower()
+    operation = classify(description.lower(), _DEPOSIT_RULES, "withdrawal")
+    return operation, abs(amount) if operation == "deposit" else -abs(amount)
 
-    # Incoming money
-    if any(kw in desc_lower for kw in ["recebid", "estorno", "devolução"]):
-        return "deposit", abs(amount)
 
-    # Outgoing money
-    return "withdrawal", -abs(amount)
+def _classify(line: str) -> re.Match | None:
+    """Match a movements line as a date header or a transaction.
 
+    ``match.re`` tells which one matched; None means footer/summary text
+    or a continuation line. The line is lowercased once for the footer
+    keyword scan, and only lines starting with a digit can be date
+    headers, so the others skip that regex.
+    """
+    lowered = line.lower()
+    for keyword in _SKIP_KEYWORDS:
+        if keyword in lowered:
+            return None
+    if line.startswith(_SUMMARY_PREFIXES):
+        return None
 
-def parse_nubank(text: str) -> list[Transaction]:
-    """Parse full text from a Nubank bank statement PDF.
+    # Date header (may have trailing text)
+    if line[0].isdigit():
+        match = _DATE_HEADER_RE.match(line)
+        if match:
+            return match
+
+    # Line ending with an amount
+    return _AMOUNT_TRAIL_RE.match(line)
+
+
+class NubankParser:
+    """Incremental Nubank parser.
 
     Nubank statements have the following structure after "Movimentações":
       - Date headers: "DD MMM YYYY"
       - Transaction lines ending with an amount: "Description 30,00"
       - Continuation lines (bank details) that belong to the PREVIOUS
         transaction — we simply discard these since they're metadata.
+
+    Feed it the statement text in chunks (e.g. one page at a time); the
+    "Movimentações" flag and current date carry over between chunks.
     """
-    transactions: list[Transaction] = []
-    current_date: str | None = None
-    in_movements = False
-
-    lines = text.split("\n")
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-
-        # Start collecting after "Movimentações"
-        if "Movimentações" in line:
-            in_movements = True
-            continue
-
-        if not in_movements:
-            continue
-
-        # Skip footer/legal text
-        if any(kw in line.lower() for kw in _SKIP_KEYWORDS):
-            continue
-
-        # Skip summary lines
-        if line.startswith("Total de entradas") or line.startswith("Total de saídas"):
-            continue
-
-        # Check for date header (may have trailing text)
-        date_match = _DATE_HEADER_RE.match(line)
-        if date_match:
-            day = date_match.group(1).zfill(2)
-            month = _MONTHS_PT[date_match.group(2).upper()]
-            year = date_match.group(3)
-            current_date = f"{day}/{month}/{year}"
-            continue
-
-        if current_date is None:
-            continue
-
-        # Try to match a line ending with an amount
-        amount_match = _AMOUNT_TRAIL_RE.match(line)
-        if not amount_match:
-            # This is a continuation line (e.g., bank details for the
-            # previous transaction). We discard it since the main
-            # transaction description is already captured.
-            continue
-
-        description = amount_match.group(1).strip()
-        amount_str = amount_match.group(2)
-
-        try:
-            raw_amount = _parse_amount(amount_str)
-        except ValueError:
-            continue
-
-        tx_type = _infer_transaction_type(description)
-        operation, signed_amount = _infer_operation(description, raw_amount)
-
-        transactions.append(Transaction(
-            date=current_date,
-            description=description,
-            amount=signed_amount,
-            transaction_type=tx_type,
-            operation_type=operation,
-            bank="nubank",
-        ))
-
-    return transactions
+
+    def __init__(self):
+        self.current_date: str | None = None
+        self.in_movements = False
+
+    def feed(self, text: str) -> Iterator[Transaction]:
+        for line in text.split("\n"):
+            line = line.strip()
+            if not line:
+                continue
+
+            # Start collecting after "Movimentações"
+            if "Movimentações" in line:
+                self.in_movements = True
+                continue
+
+            if not self.in_movements:
+                continue
+
+            match = _classify(line)
+
+            if match is not None and match.re is _DATE_HEADER_RE:
+                day = match.group(1).zfill(2)
+                month = _MONTHS_PT[match.group(2).upper()]
+                year = match.group(3)
+                self.current_date = f"{day}/{month}/{year}"
+                continue
+
+            if self.current_date is None:
+                continue
+
+            if match is None:
+                # Footer text, or a continuation line (e.g., bank details
+                # for the previous transaction). We discard it since the
+                # main transaction description is already captured.
+                continue
+
+            description = match.group(1).strip()
+            amount_str = match.group(2)
+
+            try:
+                raw_amount = parse_brl_cents(amount_str)
+            except ValueError:
+                continue
+
+            tx_type = _infer_transaction_type(description)
+            operation, signed_amount = _infer_operation(description, raw_amount)
+
+            yield Transaction(self.current_date, description, signed_amount, tx_type, operation, "nubank")
+
+
+def parse_nubank(text: str) -> list[Transaction]:
+    """Parse full text from a Nubank bank statement PDF."""
+    return list(NubankParser().feed(text))
+
+
+register(Bank(
+    "nubank",
+    label="Nubank",
+    signatures=("nu financeira", "nu pagamentos", "nubank"),
+    priority=30,
+    parser=NubankParser,
+))
@@ -0,0 +1,55 @@
+"""
+JSON serialization for parse responses.
+
+Transactions are encoded straight to UTF-8 JSON bytes by a hand-written
+encoder, without building a dict per row. Output is byte-for-byte what
+``json.dumps(..., ensure_ascii=False, separators=(",", ":"))`` produces
+for the equivalent dicts.
+"""
+
+import json
+from json.encoder import encode_basestring
+
+from app.models import Transaction
+
+
+def _default(obj):
+    if isinstance(obj, Transaction):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(payload) -> bytes:
+    """Serialize any JSON payload (Transactions included) compactly, keeping
+    non-ASCII characters."""
+    return json.dumps(
+        payload, ensure_ascii=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+def _encode_transaction(t: Transaction) -> str:
+    return (
+        f'{{"date":{encode_basestring(t.date)},'
+        f'"description":{encode_basestring(t.description)},'
+        f'"amount":{t.amount_cents / 100!r},'
+        f'"amount_cents":{t.amount_cents!r},'
+        f'"transaction_type":{encode_basestring(t.transaction_type)},'
+        f'"operation_type":{encode_basestring(t.operation_type)},'
+        f'"bank":{encode_basestring(t.bank)}}}'
+    )
+
+
+def dumps_transactions(transactions: list[Transaction]) -> bytes:
+    """Serialize transactions as a JSON array, in bulk."""
+    return ("[" + ",".join(map(_encode_transaction, transactions)) + "]").encode("utf-8")
+
+
+def dumps_result(transactions: list[Transaction]) -> bytes:
+    """Serialize the ``/api/parse`` response body for a parsed statement."""
+    bank = transactions[0].bank if transactions else "unknown"
+    return (
+        b'{"bank":' + dumps(bank)
+        + b',"transactions":' + dumps_transactions(transactions)
+        + b',"total_transactions":' + str(len(transactions)).encode()
+        + b"}"
+    )
@@ -0,0 +1,66 @@
+"""
+Page-parallel parsing of long statements.
+
+Layout analysis dominates parse time and pages are laid out independently,
+so a long PDF's page range is cut into contiguous chunks that different
+pool workers extract at the same time. The page texts are put back in
+page order and fed to a single bank parser here, so state carried across
+pages (the current date header, Nubank's "Movimentações" flag) is exactly
+what a sequential parse would see.
+"""
+
+from itertools import chain
+from typing import Iterator
+
+from app import metrics
+from app.engine import ExtractionEngine
+from app.models import Transaction
+from app.parsers import DEFAULT_EXTRACTOR, extract_pages, iter_transactions, parse_pdf_if_short
+
+
+def page_ranges(total_pages: int, chunks: int) -> Iterator[tuple[int, int]]:
+    """Split ``range(total_pages)`` into at most ``chunks`` contiguous
+    ``(start, stop)`` ranges whose sizes differ by at most one page."""
+    chunks = max(1, min(chunks, total_pages))
+    size, extra = divmod(total_pages, chunks)
+    start = 0
+    for i in range(chunks):
+        stop = start + size + (i < extra)
+        yield start, stop
+        start = stop
+
+
+def _parse_page_texts(bank: str, page_texts: list[str]) -> list[Transaction]:
+    return list(iter_transactions(bank, page_texts))
+
+
+async def parse_split(
+    engine: ExtractionEngine,
+    source: bytes | str,
+    split_pages: int,
+    chunks: int,
+    extractor: str = DEFAULT_EXTRACTOR,
+) -> list[Transaction]:
+    """Parse a PDF, extracting it in ``chunks`` parallel page ranges when it
+    has more than ``split_pages`` pages.
+
+    Shorter PDFs are parsed by the same job that counts their pages, so
+    they cost no more than :func:`app.parsers.parse_pdf`. Every step runs
+    on the engine, and all of them together get the engine's timeout.
+    """
+    deadline = engine.deadline()
+    total_pages, transactions = await engine.run(
+        parse_pdf_if_short, source, split_pages, extractor, deadline=deadline
+    )
+    if transactions is not None:
+        return transactions
+
+    results = await engine.map(
+        extract_pages,
+        [(source, start, stop, extractor) for start, stop in page_ranges(total_pages, chunks)],
+        deadline=deadline,
+    )
+    bank = results[0][0]
+    metrics.inc("extrato_pages_total", total_pages, bank=bank)
+    page_texts = list(chain.from_iterable(texts for _, texts in results))
+    return await engine.run(_parse_page_texts, bank, page_texts, deadline=deadline)
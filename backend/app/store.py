@@ -0,0 +1,323 @@
+"""
+Server-side transaction store.
+
+``POST /api/ingest`` adds statements to an account kept in SQLite, so
+overlapping uploads (January, then mid-January to mid-February) only
+yield the rows the account did not have yet. Each transaction is keyed
+by a fingerprint: a hash of its bank, date, amount and description plus
+an ordinal telling apart identical rows on the same day (two R$ 5,00
+coffees). Re-uploading a statement already ingested for the account
+skips parsing altogether.
+
+Stored transactions are queried a page at a time (``GET
+/api/transactions``) with keyset pagination, so fetching page 500 of a
+large history costs the same as page 1, and summed up per bank, type or
+month in SQL (``GET /api/transactions/summary``).
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+from app.config import Settings
+from app.models import Transaction
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    account TEXT NOT NULL,
+    fingerprint BLOB NOT NULL,
+    bank TEXT NOT NULL,
+    date TEXT NOT NULL,
+    description TEXT NOT NULL,
+    amount_cents INTEGER NOT NULL,
+    transaction_type TEXT NOT NULL,
+    operation_type TEXT NOT NULL,
+    statement TEXT NOT NULL,
+    PRIMARY KEY (account, fingerprint)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS transactions_date ON transactions (account, date);
+CREATE INDEX IF NOT EXISTS transactions_bank ON transactions (account, bank, date);
+CREATE INDEX IF NOT EXISTS transactions_type ON transactions (account, transaction_type, date);
+CREATE INDEX IF NOT EXISTS transactions_amount ON transactions (account, amount_cents);
+CREATE TABLE IF NOT EXISTS statements (
+    account TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    bank TEXT,
+    first_date TEXT,
+    last_date TEXT,
+    total_transactions INTEGER NOT NULL,
+    new_transactions INTEGER NOT NULL,
+    ingested_at REAL NOT NULL,
+    PRIMARY KEY (account, digest)
+);
+"""
+
+_COLUMNS = "date, description, amount_cents, transaction_type, operation_type, bank"
+
+# Sort keys of GET /api/transactions -> column
+SORTS = {"date": "date", "amount": "amount_cents"}
+
+# Groupings of GET /api/transactions/summary -> SQL expression
+GROUPS = {
+    "bank": "bank",
+    "transaction_type": "transaction_type",
+    "operation_type": "operation_type",
+    "month": "substr(date, 1, 7)",
+}
+
+
+def iso_date(date: str) -> str:
+    """DD/MM/YYYY -> YYYY-MM-DD, which sorts and compares as text."""
+    return f"{date[6:]}-{date[3:5]}-{date[:2]}"
+
+
+def _from_row(row: tuple) -> Transaction:
+    date, description, amount_cents, transaction_type, operation_type, bank = row
+    return Transaction(
+        f"{date[8:]}/{date[5:7]}/{date[:4]}", description, amount_cents,
+        transaction_type, operation_type, bank,
+    )
+
+
+def fingerprint(tx: Transaction, ordinal: int) -> bytes:
+    """Stable 16-byte key of the ``ordinal``-th (from 0) row identical to
+    ``tx`` on its day."""
+    key = "\x1f".join((tx.bank, tx.date, str(tx.amount_cents), tx.description, str(ordinal)))
+    return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+
+@dataclass(frozen=True, slots=True)
+class Filters:
+    """Conditions on stored transactions; ``None`` matches anything.
+
+    Dates are YYYY-MM-DD and inclusive; ``search`` matches a substring of
+    the description, case-insensitively for ASCII.
+    """
+
+    bank: str | None = None
+    transaction_type: str | None = None
+    operation_type: str | None = None
+    date_from: str | None = None
+    date_to: str | None = None
+    min_amount_cents: int | None = None
+    max_amount_cents: int | None = None
+    search: str | None = None
+
+    def where(self, account: str) -> tuple[str, list]:
+        clauses, params = ["account = ?"], [account]
+        for column in ("bank", "transaction_type", "operation_type"):
+            value = getattr(self, column)
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        for value, clause in (
+            (self.date_from, "date >= ?"),
+            (self.date_to, "date <= ?"),
+            (self.min_amount_cents, "amount_cents >= ?"),
+            (self.max_amount_cents, "amount_cents <= ?"),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        if self.search:
+            escaped = self.search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append("description LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+        return " AND ".join(clauses), params
+
+
+def encode_cursor(value, key: bytes) -> str:
+    """Opaque position after the row with sort ``value`` and fingerprint ``key``."""
+    return base64.urlsafe_b64encode(json.dumps([value, key.hex()]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Inverse of :func:`encode_cursor`; ValueError if it was tampered with."""
+    try:
+        value, key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if isinstance(value, (str, int)) and not isinstance(value, bool):
+            return value, bytes.fromhex(key)
+    except (binascii.Error, UnicodeError, TypeError, ValueError):
+        pass
+    raise ValueError("Invalid cursor.")
+
+
+class TransactionStore:
+    """Accounts' deduplicated transactions in a SQLite file.
+
+    Every request shares one connection, guarded by a lock. It is made
+    (with the schema) by the first method that needs it and dropped again
+    by :meth:`close`. The methods block on SQLite, so async callers run
+    them with ``asyncio.to_thread``.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "TransactionStore":
+        return cls(settings.store_path or os.path.join(tempfile.gettempdir(), "extrato-store.db"))
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(_SCHEMA)
+            self._db = db
+        return self._db
+
+    def statement(self, account: str, digest: str) -> dict | None:
+        """What ingesting the upload with ``digest`` into ``account`` did, if it was."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT bank, first_date, last_date, total_transactions, new_transactions"
+                " FROM statements WHERE account = ? AND digest = ?",
+                (account, digest),
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("bank", "first_date", "last_date", "total_transactions", "new_transactions"), row))
+
+    def ingest(self, account: str, digest: str) -> "Ingestion":
+        """Start adding the statement with ``digest`` to ``account``."""
+        return Ingestion(self, account, digest)
+
+    def query(
+        self,
+        account: str,
+        filters: Filters = Filters(),
+        sort: str = "date",
+        descending: bool = False,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> tuple[list[Transaction], str | None]:
+        """One page of ``account``'s transactions matching ``filters``, and
+        the cursor of the next page (None on the last one).
+
+        Pages are found by seeking the sort index past ``cursor`` rather
+        than with OFFSET, so every page costs the same.
+        """
+        column = SORTS[sort]
+        where, params = filters.where(account)
+        if cursor is not None:
+            value, key = decode_cursor(cursor)
+            where += f" AND ({column}, fingerprint) {'<' if descending else '>'} (?, ?)"
+            params += [value, key]
+        direction = "DESC" if descending else "ASC"
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT {_COLUMNS}, fingerprint, {column} FROM transactions WHERE {where}"
+                f" ORDER BY {column} {direction}, fingerprint {direction} LIMIT ?",
+                (*params, limit + 1),
+            ).fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][-1], rows[-1][-2])
+        return [_from_row(row[:-2]) for row in rows], next_cursor
+
+    def summary(self, account: str, group_by: str, filters: Filters = Filters()) -> list[dict]:
+        """Count and sum ``account``'s transactions matching ``filters`` per
+        ``group_by`` value (see :data:`GROUPS`), in key order."""
+        expression = GROUPS[group_by]
+        where, params = filters.where(account)
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT {expression} AS key, COUNT(*), SUM(amount_cents),"
+                " SUM(MAX(amount_cents, 0)), SUM(MIN(amount_cents, 0))"
+                f" FROM transactions WHERE {where} GROUP BY key ORDER BY key",
+                params,
+            ).fetchall()
+        return [
+            {
+                "key": key,
+                "count": count,
+                "total_cents": total,
+                "deposits_cents": deposits,
+                "withdrawals_cents": withdrawals,
+            }
+            for key, count, total, deposits, withdrawals in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class Ingestion:
+    """One statement being added to a :class:`TransactionStore`, fed a page
+    at a time. Nothing is written until :meth:`finish`, so a statement
+    that fails to parse halfway leaves the account untouched."""
+
+    def __init__(self, store: TransactionStore, account: str, digest: str):
+        self.store = store
+        self.account = account
+        self.digest = digest
+        self.bank: str | None = None
+        self.total_transactions = 0
+        self._ordinals: Counter = Counter()
+        self._pending: list[tuple[bytes, str, Transaction]] = []
+        self._first: str | None = None
+        self._last: str | None = None
+
+    def add(self, transactions: list[Transaction]) -> None:
+        """Take one page's transactions, in statement order."""
+        if not transactions:
+            return
+        if self.bank is None:
+            self.bank = transactions[0].bank
+
+        rows = []
+        for tx in transactions:
+            key = (tx.date, tx.amount_cents, tx.description)
+            rows.append((fingerprint(tx, self._ordinals[key]), iso_date(tx.date), tx))
+            self._ordinals[key] += 1
+        self.total_transactions += len(rows)
+
+        dates = [date for _, date, _ in rows]
+        first, last = min(dates), max(dates)
+        self._first = first if self._first is None else min(self._first, first)
+        self._last = last if self._last is None else max(self._last, last)
+        self._pending.extend(rows)
+
+    def finish(self) -> list[Transaction]:
+        """Store the statement and return its transactions the account did
+        not have yet, in statement order."""
+        new = []
+        with self.store._lock:
+            db = self.store._connect()
+            for key, date, tx in self._pending:
+                cursor = db.execute(
+                    "INSERT OR IGNORE INTO transactions (account, fingerprint, bank, date,"
+                    " description, amount_cents, transaction_type, operation_type, statement)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        self.account, key, tx.bank, date, tx.description, tx.amount_cents,
+                        tx.transaction_type, tx.operation_type, self.digest,
+                    ),
+                )
+                if cursor.rowcount:
+                    new.append(tx)
+            db.execute(
+                "INSERT OR REPLACE INTO statements (account, digest, bank, first_date, last_date,"
+                " total_transactions, new_transactions, ingested_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.account, self.digest, self.bank, self._first, self._last,
+                    self.total_transactions, len(new), time.time(),
+                ),
+            )
+            db.commit()
+        self._pending = []
+        return new
@@ -0,0 +1,118 @@
+"""
+Aggregates of parsed transactions, computed on the server.
+
+``/api/parse?include=summary`` (or ``all``) returns these instead of (or
+next to) the rows, so the browser no longer loops over every transaction
+of a large merged upload to show totals. Every grouping has the shape of
+``GET /api/transactions/summary``: ``key``, ``count``, ``total_cents``,
+``deposits_cents`` and ``withdrawals_cents``.
+
+Each grouping is one tight pass over two parallel columns (the keys and
+``amount_cents``), with no per-row dict or object built. Months are
+rolled up from the days and counterparties from the distinct
+descriptions, so those never touch the rows again. NumPy would not beat
+this by enough to be worth the dependency: the keys are strings.
+"""
+
+import re
+
+from app.models import Transaction
+from app.store import iso_date
+
+# Counterparties listed in a summary, by money moved
+TOP_COUNTERPARTIES = 10
+
+# What is left of a description once the bank's wording is dropped:
+# "PIX QRS PADARIA BOM PAO 02/01", "Compra no débito - PADARIA BOM PAO"
+# and "Pix recebido: Cp :60701190-PADARIA BOM PAO" are the same shop
+_COUNTERPARTY = re.compile(
+    r"^(?:.*?(?::\s+|\s-\s))?"  # "Pix recebido: ", "Estorno - "
+    r"(?:Cp\s*:\s*\d+-)?"  # Inter's account number
+    r"(?:(?:PIX\s+(?:QRS|TRANSF|ENVIADO|RECEBIDO)|COMPRA\s+CARTAO|TED|DOC)\s+)?"
+    r"(?P<name>.*?)"
+    r"(?:\s+\d{2}/\d{2})?$",  # Itaú's "02/01" suffix
+    re.IGNORECASE,
+)
+
+
+def counterparty(description: str) -> str:
+    """The payee or payer named in a transaction description."""
+    return _COUNTERPARTY.match(description.strip())["name"].strip() or description.strip()
+
+
+def _group(key, count: int, deposits: int, withdrawals: int) -> dict:
+    return {
+        "key": key,
+        "count": count,
+        "total_cents": deposits + withdrawals,
+        "deposits_cents": deposits,
+        "withdrawals_cents": withdrawals,
+    }
+
+
+def _totals(keys: list, amounts: list[int]) -> dict:
+    """key -> [count, deposits, withdrawals] over two parallel columns."""
+    totals: dict = {}
+    for key, cents in zip(keys, amounts):
+        acc = totals.get(key)
+        if acc is None:
+            acc = totals[key] = [0, 0, 0]
+        acc[0] += 1
+        acc[1 if cents >= 0 else 2] += cents
+    return totals
+
+
+def _merge(totals: dict, key_of) -> dict:
+    """Re-key already grouped ``totals`` (days into months, ...)."""
+    merged: dict = {}
+    for key, (count, deposits, withdrawals) in totals.items():
+        acc = merged.setdefault(key_of(key), [0, 0, 0])
+        acc[0] += count
+        acc[1] += deposits
+        acc[2] += withdrawals
+    return merged
+
+
+def _groups(totals: dict) -> list[dict]:
+    return [_group(key, *acc) for key, acc in sorted(totals.items())]
+
+
+def summarize(transactions: list[Transaction], top: int = TOP_COUNTERPARTIES) -> dict:
+    """Totals of ``transactions`` overall and per bank, month (YYYY-MM),
+    ``transaction_type`` and ``operation_type``, the net flow and running
+    balance per day (from a zero opening balance), and the ``top``
+    counterparties by money moved."""
+    amounts = [tx.amount_cents for tx in transactions]
+
+    # Descriptions repeat a lot; match each distinct one once
+    descriptions = [tx.description for tx in transactions]
+    names = {description: counterparty(description) for description in set(descriptions)}
+
+    days = _merge(_totals([tx.date for tx in transactions], amounts), iso_date)
+    daily, balance = [], 0
+    for day in _groups(days):
+        balance += day["total_cents"]
+        daily.append({
+            "date": day["key"],
+            "count": day["count"],
+            "net_cents": day["total_cents"],
+            "balance_cents": balance,
+        })
+
+    counterparties = _groups(_merge(_totals(descriptions, amounts), names.__getitem__))
+    counterparties.sort(key=lambda g: (g["withdrawals_cents"] - g["deposits_cents"], g["key"]))
+
+    banks = _totals([tx.bank for tx in transactions], amounts)
+    overall = _merge(banks, lambda bank: None).get(None, [0, 0, 0])
+    return {
+        "count": overall[0],
+        "total_cents": overall[1] + overall[2],
+        "deposits_cents": overall[1],
+        "withdrawals_cents": overall[2],
+        "by_bank": _groups(banks),
+        "by_month": _groups(_merge(days, lambda date: date[:7])),
+        "by_transaction_type": _groups(_totals([tx.transaction_type for tx in transactions], amounts)),
+        "by_operation_type": _groups(_totals([tx.operation_type for tx in transactions], amounts)),
+        "daily": daily,
+        "top_counterparties": counterparties[:top],
+    }
@@ -0,0 +1,341 @@
+"""
+Bounded upload intake.
+
+Request bodies are capped while they stream in (:class:`BodyLimit`), so
+an oversized request is cut off before it is stored anywhere. Multipart
+bodies are then read straight off the request by :func:`receive_uploads`:
+each uploaded file is checked for the ``%PDF`` magic, size limited and
+hashed as its bytes arrive, and rejected as soon as one check fails.
+Small files stay in memory. Larger ones are written once, to a named
+temp file, and workers open that file by path instead of receiving (and
+pickling) the bytes.
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from python_multipart.exceptions import MultipartParseError
+from python_multipart import MultipartParser
+from python_multipart.multipart import parse_options_header
+
+# The PDF spec lets the header start anywhere in the first 1024 bytes
+_MAGIC = b"%PDF-"
+_MAGIC_WINDOW = 1024
+
+
+class UploadRejected(Exception):
+    """Raised for an upload we refuse, with the HTTP status to answer and,
+    when one file is to blame, its name."""
+
+    def __init__(self, status_code: int, detail: str, file_name: str = ""):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.file_name = file_name
+
+
+@dataclass(slots=True)
+class SpooledUpload:
+    """A validated upload: its bytes in memory, or a temp file path."""
+
+    file_name: str
+    size: int
+    digest: str  # SHA-256 hex of the contents
+    data: bytes | None = None
+    path: str | None = None
+
+    @property
+    def source(self) -> bytes | str:
+        """What :func:`app.parsers.parse_pdf` takes: bytes or a path."""
+        return self.data if self.data is not None else self.path
+
+    def close(self) -> None:
+        """Delete the spool file, if any. Safe to call more than once."""
+        path, self.path = self.path, None
+        if path is not None:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def __del__(self):
+        self.close()
+
+
+class _Spool:
+    """One uploaded file as its bytes arrive: validated, hashed, and kept
+    in memory up to ``spool_bytes``, then in a named temp file."""
+
+    def __init__(self, file_name: str, max_bytes: int, spool_bytes: int, spool_dir: str | None):
+        self.file_name = file_name
+        self.max_bytes = max_bytes
+        self.spool_bytes = spool_bytes
+        self.spool_dir = spool_dir
+        self.hasher = hashlib.sha256()
+        self.buffer = bytearray()
+        self.file = None
+        self.size = 0
+        self.head = b""
+
+    async def write(self, data: bytes) -> None:
+        if len(self.head) < _MAGIC_WINDOW:
+            self.head += data[: _MAGIC_WINDOW - len(self.head)]
+            if len(self.head) == _MAGIC_WINDOW:
+                self._check_magic()
+        self.size += len(data)
+        if self.max_bytes and self.size > self.max_bytes:
+            raise _too_large(self.max_bytes, self.file_name)
+        self.hasher.update(data)
+
+        if self.file is None and len(self.buffer) + len(data) > self.spool_bytes:
+            self.file = await asyncio.to_thread(
+                tempfile.NamedTemporaryFile,
+                prefix="extrato-", suffix=".pdf", dir=self.spool_dir or None, delete=False,
+            )
+            await asyncio.to_thread(self.file.write, self.buffer)
+            self.buffer = bytearray()
+        if self.file is not None:
+            await asyncio.to_thread(self.file.write, data)
+        else:
+            self.buffer += data
+
+    def _check_magic(self) -> None:
+        if _MAGIC not in self.head:
+            raise UploadRejected(400, "File is not a PDF.", self.file_name)
+
+    async def finish(self) -> SpooledUpload:
+        if self.size == 0:
+            raise UploadRejected(400, "Empty file.", self.file_name)
+        if len(self.head) < _MAGIC_WINDOW:
+            self._check_magic()
+        upload = SpooledUpload(self.file_name, self.size, self.hasher.hexdigest())
+        if self.file is not None:
+            file, self.file = self.file, None
+            await asyncio.to_thread(file.close)
+            upload.path = file.name
+        else:
+            upload.data = bytes(self.buffer)
+        return upload
+
+    def discard(self) -> None:
+        file, self.file = self.file, None
+        if file is not None:
+            file.close()
+            os.unlink(file.name)
+
+
+class _Parts:
+    """Collects what python-multipart's callbacks report for one chunk of
+    body: ``("part", headers)``, ``("data", bytes)`` and ``("end", None)``
+    events, handled once the (synchronous) parser has returned."""
+
+    def __init__(self):
+        self.events: list[tuple[str, object]] = []
+        self._headers: dict[bytes, bytes] = {}
+        self._field = b""
+        self._value = b""
+
+    def callbacks(self) -> dict:
+        return {
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        }
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._field.lower()] = self._value
+        self._field = self._value = b""
+
+    def _on_headers_finished(self) -> None:
+        self.events.append(("part", self._headers))
+        self._headers = {}
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        self.events.append(("data", data[start:end]))
+
+    def _on_part_end(self) -> None:
+        self.events.append(("end", None))
+
+
+async def receive_uploads(
+    content_type: str | None,
+    body: AsyncIterator[bytes],
+    field: str,
+    max_files: int,
+    max_bytes: int,
+    spool_bytes: int,
+    spool_dir: str | None = None,
+    fail_fast: bool = False,
+) -> list[SpooledUpload | UploadRejected]:
+    """Read the files uploaded as ``field`` from a multipart request body.
+
+    Returns one item per file, in upload order: a :class:`SpooledUpload`,
+    or the :class:`UploadRejected` that refused it, (400) for a name not
+    ending in ``.pdf``, an empty file or one without the PDF magic, (413)
+    past ``max_bytes``. A file is refused as soon as its bytes fail a
+    check, and the rest of it is never stored. With ``fail_fast`` the first
+    refusal is raised instead, and the rest of the body is not read.
+
+    Raises :class:`UploadRejected` for a body that is not multipart, holds
+    no ``field`` file or more than ``max_files`` of them. Files returned
+    must be ``close()``d; on any error none are left behind.
+    """
+    kind, params = parse_options_header(content_type or "")
+    if kind != b"multipart/form-data" or not params.get(b"boundary"):
+        raise UploadRejected(400, "Expected a multipart/form-data upload.")
+
+    parts = _Parts()
+    parser = MultipartParser(params[b"boundary"], parts.callbacks())
+    results: list[SpooledUpload | UploadRejected] = []
+    spool = None
+    skipping = False
+    try:
+        async for chunk in body:
+            _write(parser, chunk)
+            events, parts.events = parts.events, []
+            for event, value in events:
+                if event == "part":
+                    _, options = parse_options_header(value.get(b"content-disposition", b""))
+                    if options.get(b"name") != field.encode() or b"filename" not in options:
+                        skipping = True
+                        continue
+                    if len(results) == max_files:
+                        raise UploadRejected(400, f"At most {max_files} files per batch.")
+                    file_name = options[b"filename"].decode("utf-8", "replace")
+                    if not file_name.lower().endswith(".pdf"):
+                        rejected = UploadRejected(400, "Only PDF files are accepted.", file_name)
+                        if fail_fast:
+                            raise rejected
+                        results.append(rejected)
+                        skipping = True
+                        continue
+                    spool = _Spool(file_name, max_bytes, spool_bytes, spool_dir)
+                    skipping = False
+                elif skipping:
+                    skipping = event != "end"
+                elif event == "data":
+                    try:
+                        await spool.write(value)
+                    except UploadRejected as e:
+                        if fail_fast:
+                            raise
+                        spool.discard()
+                        spool = None
+                        results.append(e)
+                        skipping = True
+                else:
+                    try:
+                        results.append(await spool.finish())
+                    except UploadRejected as e:
+                        if fail_fast:
+                            raise
+                        results.append(e)
+                    finally:
+                        spool.discard()
+                        spool = None
+        _write(parser, None)
+    except BaseException:
+        if spool is not None:
+            spool.discard()
+        for result in results:
+            if isinstance(result, SpooledUpload):
+                result.close()
+        raise
+
+    if not results:
+        raise UploadRejected(400, f"No file uploaded as '{field}'.")
+    return results
+
+
+def _write(parser: MultipartParser, chunk: bytes | None) -> None:
+    """Feed ``chunk`` to ``parser``, or finalize it for None."""
+    try:
+        if chunk is None:
+            parser.finalize()
+        else:
+            parser.write(chunk)
+    except MultipartParseError:
+        raise UploadRejected(400, "Invalid multipart data.") from None
+
+
+def _too_large(max_bytes: int, file_name: str = "") -> UploadRejected:
+    return UploadRejected(413, f"File is larger than {max_bytes // (1024 * 1024)} MiB.", file_name)
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+class BodyLimit:
+    """ASGI middleware answering ``413`` once a request body passes
+    ``max_bytes``, whether declared up front or counted while streaming."""
+
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def _reject(self, send) -> None:
+        body = b'{"detail":"Request body is too large."}'
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.max_bytes:
+            return await self.app(scope, receive, send)
+
+        declared = dict(scope["headers"]).get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > self.max_bytes:
+            return await self._reject(send)
+
+        received = 0
+        tripped = False
+        started = False
+        replaced = False
+
+        async def limited_receive():
+            nonlocal received, tripped
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    tripped = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def guarded_send(message):
+            nonlocal started, replaced
+            # The app may turn the aborted read into its own error response;
+            # answer 413 in its place
+            if tripped and not started:
+                started = replaced = True
+                await self._reject(send)
+            if replaced:
+                return
+            started = started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except _BodyTooLarge:
+            if not started:
+                await self._reject(send)
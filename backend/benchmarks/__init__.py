@@ -0,0 +1 @@
+"""Performance benchmarks for the parsing backend (run from ``backend/``)."""
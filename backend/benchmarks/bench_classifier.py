@@ -0,0 +1,283 @@
+"""
+Line-classifier microbenchmark for the bank parsers.
+
+Feeds synthetic statements (see :mod:`benchmarks.synthetic`) of about a
+million lines through each bank parser and reports throughput, against
+the original parsers (every pattern tried on every line, if/elif type
+inference) kept below as the baseline.
+
+    python -m benchmarks.bench_classifier [--lines 1000000]
+"""
+
+import argparse
+import re
+import time
+
+from app.models import Transaction
+from app.parsers import parse_inter, parse_itau, parse_nubank
+from benchmarks.synthetic import LINES_PER_PAGE, generate
+
+# The parsers and amount parsing before the one-dispatch classifier, kept
+# here as the baseline
+
+
+def _parse_brl_cents(value_str: str) -> int:
+    value = value_str.strip()
+    negative = value.startswith("-")
+    if negative:
+        value = value[1:]
+
+    whole, _, fraction = value.partition(",")
+    whole = whole.replace(".", "")
+    digits = whole + fraction
+    if not digits or not digits.isascii() or not digits.isdigit() or len(fraction) > 2:
+        raise ValueError(f"Not a currency amount: {value_str!r}")
+
+    cents = int(whole or "0") * 100 + int(fraction.ljust(2, "0"))
+    return -cents if negative else cents
+
+
+_ITAU_LINE_RE = re.compile(r"^(\d{2}/\d{2}/\d{4})\s+(.+?)\s+(-?[\d.,]+)$")
+
+
+def _itau_type(description: str) -> str:
+    desc_upper = description.upper()
+    if desc_upper.startswith("PIX TRANSF"):
+        return "PIX"
+    elif desc_upper.startswith("PIX QRS"):
+        return "PIX"
+    elif desc_upper.startswith("DEV PIX"):
+        return "PIX_DEVOLUCAO"
+    elif "FATURA PAGA" in desc_upper:
+        return "FATURA"
+    elif "REND PAGO APLIC" in desc_upper or "REMUNERACAO" in desc_upper:
+        return "RENDIMENTO"
+    elif "REMUNERACAO/SALARIO" in desc_upper or "SISPAG" in desc_upper:
+        return "SALARIO"
+    elif desc_upper.startswith("TAR "):
+        return "TARIFA"
+    elif "TED" in desc_upper:
+        return "TED"
+    elif "DOC" in desc_upper:
+        return "DOC"
+    else:
+        return "OUTRO"
+
+
+def _baseline_itau(text: str) -> list[Transaction]:
+    transactions = []
+    for line in text.split("\n"):
+        line = line.strip()
+        if not line or "SALDO DO DIA" in line:
+            continue
+        match = _ITAU_LINE_RE.match(line)
+        if not match:
+            continue
+        description = match.group(2).strip()
+        try:
+            amount = _parse_brl_cents(match.group(3))
+        except ValueError:
+            continue
+        tx_type = _itau_type(description)
+        if "REMUNERACAO/SALARIO" in description.upper():
+            tx_type = "SALARIO"
+        operation = "deposit" if amount >= 0 else "withdrawal"
+        transactions.append(Transaction(
+            date=match.group(1), description=description, amount_cents=amount,
+            transaction_type=tx_type, operation_type=operation, bank="itau",
+        ))
+    return transactions
+
+
+_NUBANK_MONTHS = {
+    "JAN": "01", "FEV": "02", "MAR": "03", "ABR": "04",
+    "MAI": "05", "JUN": "06", "JUL": "07", "AGO": "08",
+    "SET": "09", "OUT": "10", "NOV": "11", "DEZ": "12",
+}
+_NUBANK_DATE_RE = re.compile(
+    r"^(\d{1,2})\s+(JAN|FEV|MAR|ABR|MAI|JUN|JUL|AGO|SET|OUT|NOV|DEZ)\s+(\d{4})", re.IGNORECASE
+)
+_NUBANK_AMOUNT_RE = re.compile(r"^(.+?)\s+([\d]+(?:[.,]\d+)*)\s*$")
+_NUBANK_SKIP = [
+    "nu financeira", "nu pagamentos", "cnpj", "mande uma mensagem",
+    "ouvidoria", "extrato gerado", "saldo líquido", "não nos responsabilizamos",
+    "asseguramos", "4020 0185", "0800", "metropolitanas", "investimento pagamento",
+    "disponíveis em", "sociedade de credito",
+]
+
+
+def _nubank_type(description: str) -> str:
+    desc_lower = description.lower()
+    if "pix" in desc_lower or "transferência" in desc_lower:
+        return "PIX"
+    elif "pagamento de fatura" in desc_lower:
+        return "FATURA"
+    elif "rendimento" in desc_lower:
+        return "RENDIMENTO"
+    elif "compra no débito" in desc_lower:
+        return "DEBITO"
+    elif "estorno" in desc_lower or "devolução" in desc_lower:
+        return "ESTORNO"
+    else:
+        return "OUTRO"
+
+
+def _baseline_nubank(text: str) -> list[Transaction]:
+    transactions = []
+    current_date = None
+    in_movements = False
+    for line in text.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        if "Movimentações" in line:
+            in_movements = True
+            continue
+        if not in_movements:
+            continue
+        if any(kw in line.lower() for kw in _NUBANK_SKIP):
+            continue
+        if line.startswith("Total de entradas") or line.startswith("Total de saídas"):
+            continue
+        date_match = _NUBANK_DATE_RE.match(line)
+        if date_match:
+            day = date_match.group(1).zfill(2)
+            month = _NUBANK_MONTHS[date_match.group(2).upper()]
+            current_date = f"{day}/{month}/{date_match.group(3)}"
+            continue
+        if current_date is None:
+            continue
+        amount_match = _NUBANK_AMOUNT_RE.match(line)
+        if not amount_match:
+            continue
+        description = amount_match.group(1).strip()
+        try:
+            raw_amount = _parse_brl_cents(amount_match.group(2))
+        except ValueError:
+            continue
+        desc_lower = description.lower()
+        if any(kw in desc_lower for kw in ["recebid", "estorno", "devolução"]):
+            operation, amount = "deposit", abs(raw_amount)
+        else:
+            operation, amount = "withdrawal", -abs(raw_amount)
+        transactions.append(Transaction(
+            date=current_date, description=description, amount_cents=amount,
+            transaction_type=_nubank_type(description), operation_type=operation, bank="nubank",
+        ))
+    return transactions
+
+
+_INTER_MONTHS = {
+    "janeiro": "01", "fevereiro": "02", "março": "03", "abril": "04",
+    "maio": "05", "junho": "06", "julho": "07", "agosto": "08",
+    "setembro": "09", "outubro": "10", "novembro": "11", "dezembro": "12",
+}
+_INTER_DATE_RE = re.compile(r"^(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})", re.IGNORECASE)
+_INTER_LINE_RE = re.compile(r'^(.+?):\s+"(.+?)"\s+(-?)R\$\s*([\d.,]+)\s+(-?)R\$\s*([\d.,]+)$')
+
+
+def _inter_type(action: str) -> str:
+    action_lower = action.strip().lower()
+    if "pix" in action_lower:
+        return "PIX"
+    elif "aplicacao" in action_lower or "aplicação" in action_lower:
+        return "INVESTIMENTO"
+    elif "resgate" in action_lower:
+        return "RESGATE"
+    elif "ted" in action_lower:
+        return "TED"
+    elif "boleto" in action_lower:
+        return "BOLETO"
+    elif "rendimento" in action_lower:
+        return "RENDIMENTO"
+    elif "tarifa" in action_lower or "taxa" in action_lower:
+        return "TARIFA"
+    else:
+        return "OUTRO"
+
+
+def _baseline_inter(text: str) -> list[Transaction]:
+    transactions = []
+    current_date = None
+    for line in text.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        date_match = _INTER_DATE_RE.match(line)
+        if date_match:
+            month = _INTER_MONTHS.get(date_match.group(2).lower())
+            if month:
+                current_date = f"{date_match.group(1).zfill(2)}/{month}/{date_match.group(3)}"
+            continue
+        if current_date is None:
+            continue
+        tx_match = _INTER_LINE_RE.match(line)
+        if not tx_match:
+            continue
+        action = tx_match.group(1).strip()
+        try:
+            amount = _parse_brl_cents(tx_match.group(4))
+        except ValueError:
+            continue
+        if tx_match.group(3) == "-":
+            amount = -amount
+        operation = "deposit" if amount >= 0 else "withdrawal"
+        transactions.append(Transaction(
+            date=current_date, description=f"{action}: {tx_match.group(2).strip()}",
+            amount_cents=amount, transaction_type=_inter_type(action),
+            operation_type=operation, bank="inter",
+        ))
+    return transactions
+
+
+def _time(fn, text: str, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        count = len(fn(text))
+        best = min(best, time.perf_counter() - started)
+    return best, count
+
+
+def run(n_lines: int, repeat: int = 3) -> dict:
+    pages = max(n_lines // LINES_PER_PAGE, 1)
+    parsers = {
+        "itau": (_baseline_itau, parse_itau),
+        "nubank": (_baseline_nubank, parse_nubank),
+        "inter": (_baseline_inter, parse_inter),
+    }
+    results = {}
+    for bank, (baseline, fn) in parsers.items():
+        text = generate(bank, pages).text
+        baseline_seconds, baseline_count = _time(baseline, text, repeat)
+        seconds, count = _time(fn, text, repeat)
+        results[bank] = {
+            "lines": text.count("\n") + 1,
+            "baseline_seconds": baseline_seconds,
+            "baseline_transactions": baseline_count,
+            "seconds": seconds,
+            "transactions": count,
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for bank, r in run(args.lines, args.repeat).items():
+        for label, seconds, count in (
+            ("baseline", r["baseline_seconds"], r["baseline_transactions"]),
+            ("current", r["seconds"], r["transactions"]),
+        ):
+            rate = r["lines"] / seconds / 1e6
+            print(f"{bank:7s} {label:8s} {seconds * 1000:8.1f} ms  {rate:5.2f} M lines/s  "
+                  f"({count:,} transactions)")
+        print(f"{bank:7s} speedup  {r['baseline_seconds'] / r['seconds']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Serialization and memory benchmark for parse responses.
+
+Compares the original response path (plain dataclass, ``asdict`` per row,
+``json.dumps``) against the slotted model with the bulk serializer.
+
+    python -m benchmarks.bench_serialize [--rows 100000]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+
+from app import serialize
+from app.models import Transaction
+
+
+@dataclass
+class _PlainTransaction:
+    """The pre-slots model, kept here as the baseline."""
+
+    date: str
+    description: str
+    amount_cents: int
+    transaction_type: str
+    operation_type: str
+    bank: str
+
+
+def _rows(cls, n: int) -> list:
+    return [
+        cls(
+            f"{i % 28 + 1:02d}/02/2026",
+            f"PIX TRANSF FULANO DE TAL {i}",
+            -(i % 500_000) - 99,
+            "PIX",
+            "withdrawal",
+            "itau",
+        )
+        for i in range(n)
+    ]
+
+
+def _best(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _allocated(cls, n: int) -> int:
+    tracemalloc.start()
+    rows = _rows(cls, n)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return size
+
+
+def run(n: int) -> dict:
+    plain = _rows(_PlainTransaction, n)
+    slotted = _rows(Transaction, n)
+
+    def baseline():
+        return json.dumps(
+            {"transactions": [asdict(t) for t in plain]},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    results = {
+        "rows": n,
+        "asdict_json_s": _best(baseline),
+        "bulk_s": _best(lambda: serialize.dumps_transactions(slotted)),
+        "plain_bytes": _allocated(_PlainTransaction, n),
+        "slotted_bytes": _allocated(Transaction, n),
+    }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    results = run(parser.parse_args().rows)
+
+    print(f"rows: {results['rows']:,}")
+    print(f"asdict + json.dumps: {results['asdict_json_s'] * 1000:8.1f} ms")
+    print(f"bulk serializer:     {results['bulk_s'] * 1000:8.1f} ms"
+          f"  ({results['asdict_json_s'] / results['bulk_s']:.1f}x)")
+    print(f"plain dataclass:     {results['plain_bytes'] / 2**20:8.1f} MiB")
+    print(f"slotted dataclass:   {results['slotted_bytes'] / 2**20:8.1f} MiB"
+          f"  ({1 - results['slotted_bytes'] / results['plain_bytes']:.0%} less)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""
+Concurrent load test of the HTTP service.
+
+For every ``--workers`` count, starts ``uvicorn app.main:app`` with that
+many worker processes on a free local port. For every ``--concurrency``
+level it then keeps that many ``POST /api/parse`` uploads of synthetic
+statements in flight for ``--duration`` seconds. Each run reports
+throughput, p50/p95/p99 latency, the error rate (any non-200 response or
+failed connection, by status) and the peak resident memory of the server:
+uvicorn, its workers and their extraction pools. The result cache is
+disabled, so every request is a real parse. Throughput that stops growing
+with concurrency while latency climbs marks the saturation point.
+
+    python -m benchmarks.load --workers 1 2 --concurrency 1 4 16 --duration 10
+    python -m benchmarks.load --save benchmarks/results/load.json
+    python -m benchmarks.load --compare benchmarks/results/load.json
+
+``--env KEY=VALUE`` passes settings to the server (``EXTRATO_WORKERS=1``,
+``EXTRATO_EXTRACTOR=pdfium``, ...). With ``--compare`` the run exits
+non-zero when throughput drops or p95 latency grows by more than
+``--threshold`` (a fraction, 0.25 = 25%).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+import httpx
+
+from benchmarks.synthetic import BANKS, generate
+
+BACKEND = os.path.join(os.path.dirname(__file__), "..")
+
+DEFAULT_WORKERS = (1,)
+DEFAULT_CONCURRENCY = (1, 4, 16)
+
+# Compared against a baseline: (metric, True if higher is better)
+METRICS = (("rps", True), ("p95_ms", False))
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank ``q``-th percentile (0-100) of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))  # ceil without floats
+    return sorted_values[min(int(rank), len(sorted_values)) - 1]
+
+
+def summarize(latencies: list[float], statuses: Counter, seconds: float) -> dict:
+    """Aggregate one run's per-request latencies (seconds) and statuses."""
+    ok = sorted(latencies)
+    requests = sum(statuses.values())
+    errors = requests - statuses.get("200", 0)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "error_rate": errors / requests if requests else 0.0,
+        "statuses": dict(sorted(statuses.items())),
+        "rps": statuses.get("200", 0) / seconds if seconds else 0.0,
+        "p50_ms": percentile(ok, 50) * 1000,
+        "p95_ms": percentile(ok, 95) * 1000,
+        "p99_ms": percentile(ok, 99) * 1000,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _process_tree(pid: int) -> list[int]:
+    """``pid`` and all its descendants (Linux /proc; just ``pid`` elsewhere)."""
+    pids, i = [pid], 0
+    while i < len(pids):
+        try:
+            with open(f"/proc/{pids[i]}/task/{pids[i]}/children") as f:
+                pids.extend(int(child) for child in f.read().split())
+        except OSError:
+            pass
+        i += 1
+    return pids
+
+
+def _rss_bytes(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+class Server:
+    """``uvicorn app.main:app`` in a subprocess, for the duration of a ``with``."""
+
+    def __init__(self, workers: int, env: dict[str, str]):
+        self.workers = workers
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.env = {**os.environ, "EXTRATO_CACHE_ENTRIES": "0", **env}
+        self.process: subprocess.Popen | None = None
+
+    def __enter__(self) -> "Server":
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "app.main:app",
+                "--port", str(self.port), "--workers", str(self.workers),
+                "--log-level", "warning", "--no-access-log",
+            ],
+            cwd=BACKEND,
+            env=self.env,
+        )
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with status {self.process.returncode}")
+            try:
+                if httpx.get(f"{self.url}/api/health", timeout=1).status_code == 200:
+                    return self
+            except httpx.TransportError:
+                pass
+            time.sleep(0.1)
+        self.__exit__()
+        raise RuntimeError("uvicorn did not come up within 60s")
+
+    def __exit__(self, *exc) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+    def rss(self) -> tuple[int, int]:
+        """Resident bytes of the whole process tree, and of its largest process."""
+        sizes = [_rss_bytes(pid) for pid in _process_tree(self.process.pid)]
+        return sum(sizes), max(sizes, default=0)
+
+
+async def _load(
+    url: str,
+    uploads: list[tuple[str, bytes]],
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    sample_rss,
+) -> dict:
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    peak = [0, 0]
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, timeout=120, limits=limits) as client:
+        loop = asyncio.get_running_loop()
+        measure_from = loop.time() + warmup
+        stop_at = measure_from + duration
+
+        async def user(index: int) -> None:
+            n = index
+            while loop.time() < stop_at:
+                name, pdf = uploads[n % len(uploads)]
+                n += concurrency
+                started = loop.time()
+                try:
+                    response = await client.post(
+                        "/api/parse", files={"file": (name, pdf, "application/pdf")}
+                    )
+                    status = str(response.status_code)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                finished = loop.time()
+                if started >= measure_from:
+                    statuses[status] += 1
+                    if status == "200":
+                        latencies.append(finished - started)
+
+        async def sampler() -> None:
+            while True:
+                total, largest = sample_rss()
+                peak[0], peak[1] = max(peak[0], total), max(peak[1], largest)
+                await asyncio.sleep(0.25)
+
+        sampling = asyncio.create_task(sampler())
+        await asyncio.gather(*(user(i) for i in range(concurrency)))
+        sampling.cancel()
+        # Requests still running at the deadline are counted, so the
+        # measured window runs until the last of them finished
+        seconds = loop.time() - measure_from
+
+    row = summarize(latencies, statuses, seconds)
+    row["rss_mib"] = peak[0] / 2**20
+    row["max_process_rss_mib"] = peak[1] / 2**20
+    return row
+
+
+def run(
+    workers=DEFAULT_WORKERS,
+    concurrency=DEFAULT_CONCURRENCY,
+    duration: float = 10.0,
+    warmup: float = 2.0,
+    banks=BANKS,
+    pages: int = 2,
+    env: dict[str, str] | None = None,
+) -> list[dict]:
+    # One statement per bank and seed, so uploads are not byte-identical
+    uploads = [
+        (f"{bank}-{seed}.pdf", generate(bank, pages, seed=seed).to_pdf())
+        for seed in range(4)
+        for bank in banks
+    ]
+    results = []
+    for n_workers in workers:
+        with Server(n_workers, env or {}) as server:
+            for level in concurrency:
+                row = asyncio.run(_load(server.url, uploads, level, duration, warmup, server.rss))
+                row = {"workers": n_workers, "concurrency": level, "pages": pages, **row}
+                results.append(row)
+                print(_format_row(row), flush=True)
+    return results
+
+
+def _format_row(row: dict) -> str:
+    return (
+        f"workers {row['workers']:2d}  concurrency {row['concurrency']:3d}  "
+        f"{row['rps']:7.2f} req/s  p50 {row['p50_ms']:8.1f} ms  p95 {row['p95_ms']:8.1f} ms  "
+        f"p99 {row['p99_ms']:8.1f} ms  errors {row['error_rate']:6.1%}  "
+        f"rss {row['rss_mib']:7.1f} MiB (largest {row['max_process_rss_mib']:6.1f})"
+    )
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float) -> list[str]:
+    """Return a description of every run that got worse than allowed."""
+    before = {(row["workers"], row["concurrency"]): row for row in baseline}
+    regressions = []
+    for row in results:
+        old = before.get((row["workers"], row["concurrency"]))
+        if old is None:
+            continue
+        for metric, higher_is_better in METRICS:
+            if not old.get(metric):
+                continue
+            ratio = row[metric] / old[metric]
+            worse = ratio < 1 - threshold if higher_is_better else ratio > 1 + threshold
+            if worse:
+                regressions.append(
+                    f"{row['workers']} workers x{row['concurrency']} {metric}: "
+                    f"{old[metric]:.1f} -> {row[metric]:.1f} ({ratio:.2f}x)"
+                )
+        if row["error_rate"] > old.get("error_rate", 0) + threshold:
+            regressions.append(
+                f"{row['workers']} workers x{row['concurrency']} error_rate: "
+                f"{old.get('error_rate', 0):.1%} -> {row['error_rate']:.1%}"
+            )
+    return regressions
+
+
+def _env_pair(value: str) -> tuple[str, str]:
+    key, sep, setting = value.partition("=")
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got {value!r}")
+    return key, setting
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", nargs="+", type=int, default=list(DEFAULT_WORKERS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=list(DEFAULT_CONCURRENCY))
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per run")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before each run")
+    parser.add_argument("--banks", nargs="+", choices=BANKS, default=list(BANKS))
+    parser.add_argument("--pages", type=int, default=2, help="Pages per uploaded statement")
+    parser.add_argument("--env", nargs="*", type=_env_pair, default=[], metavar="KEY=VALUE")
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    env = dict(args.env)
+    results = run(
+        args.workers, args.concurrency, args.duration, args.warmup, args.banks, args.pages, env
+    )
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({
+                "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "cpus": os.cpu_count(),
+                "env": env,
+                "results": results,
+            }, f, indent=2)
+        print(f"saved {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions over {args.threshold:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
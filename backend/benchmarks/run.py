@@ -0,0 +1,199 @@
+"""
+End-to-end benchmark suite over synthetic statements.
+
+For each bank and statement size, measures PDF text extraction, parsing
+of the extracted text, the full ``parse_pdf`` call, retained memory per
+transaction and ``POST /api/parse`` latency (cache disabled, real worker
+pool). Timings are the best of ``--repeat`` runs. ``--extractor`` picks
+the text extraction backend for all of them.
+
+    python -m benchmarks.run --save benchmarks/results/baseline.json
+    python -m benchmarks.run --compare benchmarks/results/baseline.json
+
+With ``--compare`` the run exits non-zero when any timing regresses by
+more than ``--threshold`` (a fraction, 0.25 = 25% slower).
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from app.parsers import DEFAULT_EXTRACTOR, EXTRACTORS, iter_transactions, parse_pdf
+from app.parsers.extractors import open_document
+from benchmarks.synthetic import BANKS, generate
+
+DEFAULT_PAGES = (1, 10, 50)
+
+# Metrics compared against a baseline; lower is better for all of them
+TIMINGS = ("extract_s", "parse_s", "total_s", "api_s")
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _extract(pdf_bytes: bytes, extractor: str) -> list[str]:
+    doc = open_document(pdf_bytes, extractor)
+    try:
+        return [doc.page_text(i) for i in range(len(doc))]
+    finally:
+        doc.close()
+
+
+def _retained_bytes(pdf_bytes: bytes, extractor: str) -> tuple[int, int]:
+    """Memory held by the parse result, and the peak while producing it."""
+    gc.collect()
+    tracemalloc.start()
+    result = parse_pdf(pdf_bytes, extractor)
+    gc.collect()
+    held, peak = tracemalloc.get_traced_memory()
+    del result
+    # Whatever pdfminer keeps cached after the call is not the result's
+    retained = held - tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return retained, peak
+
+
+def _api_timer(repeat: int, extractor: str):
+    """Return ``time(name, pdf_bytes)`` measuring /api/parse, or None."""
+    from fastapi.testclient import TestClient
+
+    from app import main
+    from app.cache import ResultCache
+
+    main.cache = ResultCache(max_entries=0)
+    client = TestClient(main.app)
+
+    def measure(name: str, pdf_bytes: bytes) -> float:
+        upload = {"file": (name, pdf_bytes, "application/pdf")}
+
+        def post():
+            response = client.post("/api/parse", files=upload, params={"extractor": extractor})
+            response.raise_for_status()
+
+        post()  # spawn and warm the worker pool
+        return _best(post, repeat)
+
+    return client, measure
+
+
+def run(
+    banks=BANKS,
+    pages=DEFAULT_PAGES,
+    repeat: int = 3,
+    api: bool = True,
+    extractor: str = DEFAULT_EXTRACTOR,
+) -> list[dict]:
+    results = []
+    client, measure_api = _api_timer(repeat, extractor) if api else (None, None)
+    try:
+        for bank in banks:
+            for n_pages in pages:
+                statement = generate(bank, n_pages)
+                pdf_bytes = statement.to_pdf()
+                texts = _extract(pdf_bytes, extractor)
+                count = len(statement.expected)
+                retained, peak = _retained_bytes(pdf_bytes, extractor)
+                row = {
+                    "bank": bank,
+                    "pages": n_pages,
+                    "transactions": count,
+                    "pdf_bytes": len(pdf_bytes),
+                    "extract_s": _best(lambda: _extract(pdf_bytes, extractor), repeat),
+                    "parse_s": _best(lambda: list(iter_transactions(bank, texts)), repeat),
+                    "total_s": _best(lambda: parse_pdf(pdf_bytes, extractor), repeat),
+                    "bytes_per_tx": retained / max(count, 1),
+                    "peak_bytes": peak,
+                }
+                if measure_api is not None:
+                    row["api_s"] = measure_api(f"{bank}-{n_pages}.pdf", pdf_bytes)
+                results.append(row)
+                print(_format_row(row), flush=True)
+    finally:
+        if client is not None:
+            client.close()
+            from app import main
+            main.engine.shutdown()
+    return results
+
+
+def _format_row(row: dict) -> str:
+    api = f"{row['api_s'] * 1000:9.1f}" if "api_s" in row else f"{'-':>9s}"
+    return (
+        f"{row['bank']:7s} {row['pages']:4d}p {row['transactions']:6d} tx  "
+        f"extract {row['extract_s'] * 1000:9.1f} ms  parse {row['parse_s'] * 1000:7.2f} ms  "
+        f"total {row['total_s'] * 1000:9.1f} ms  api {api} ms  "
+        f"{row['bytes_per_tx']:6.0f} B/tx  peak {row['peak_bytes'] / 2**20:6.1f} MiB"
+    )
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float) -> list[str]:
+    """Return a description of every timing that got slower than allowed."""
+    before = {(row["bank"], row["pages"]): row for row in baseline}
+    regressions = []
+    for row in results:
+        old = before.get((row["bank"], row["pages"]))
+        if old is None:
+            continue
+        for metric in TIMINGS:
+            if metric not in row or metric not in old or old[metric] <= 0:
+                continue
+            ratio = row[metric] / old[metric]
+            if ratio > 1 + threshold:
+                regressions.append(
+                    f"{row['bank']} {row['pages']}p {metric}: "
+                    f"{old[metric] * 1000:.1f} ms -> {row[metric] * 1000:.1f} ms ({ratio:.2f}x)"
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--banks", nargs="+", choices=BANKS, default=list(BANKS))
+    parser.add_argument("--pages", nargs="+", type=int, default=list(DEFAULT_PAGES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--extractor", choices=sorted(EXTRACTORS), default=DEFAULT_EXTRACTOR)
+    parser.add_argument("--no-api", action="store_true", help="Skip the /api/parse timing")
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = run(args.banks, args.pages, args.repeat, api=not args.no_api, extractor=args.extractor)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({
+                "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "cpus": os.cpu_count(),
+                "results": results,
+            }, f, indent=2)
+        print(f"saved {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions over {args.threshold:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""
+Synthetic bank statements for benchmarks and tests.
+
+Generates Itaú, Nubank and Banco Inter statements shaped like the real
+ones the parsers were written against (headers, date lines, balance and
+summary lines, continuation lines, legal footers on every page), together
+with the transactions a correct parser must return. Statements can be
+rendered as raw page texts or as minimal text-only PDFs that pdfplumber
+lays out back into the same lines.
+
+    python -m benchmarks.synthetic itau 50 /tmp/itau-50.pdf
+"""
+
+import argparse
+import random
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from app.models import Transaction
+
+BANKS = ("itau", "nubank", "inter")
+
+# Lines per page, chosen to fit an A4 page at the PDF font size below
+LINES_PER_PAGE = 60
+
+_FONT_SIZE = 9
+_LEADING = 12
+
+_NAMES = ("FULANO DE TAL", "BELTRANO SILVA", "MARIA SOUZA", "JOAO PEREIRA", "ANA LIMA")
+_SHOPS = ("PADARIA BOM PAO", "MERCADO CENTRAL", "FARMACIA SAUDE", "POSTO SHELL", "LIVRARIA")
+
+_MONTHS_ABBR = ("JAN", "FEV", "MAR", "ABR", "MAI", "JUN", "JUL", "AGO", "SET", "OUT", "NOV", "DEZ")
+_MONTHS_FULL = (
+    "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
+    "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro",
+)
+
+
+@dataclass
+class SyntheticStatement:
+    bank: str
+    pages: list[list[str]] = field(default_factory=list)
+    expected: list[Transaction] = field(default_factory=list)
+
+    @property
+    def page_texts(self) -> list[str]:
+        return ["\n".join(lines) for lines in self.pages]
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.page_texts)
+
+    def to_pdf(self) -> bytes:
+        return render_pdf(self.pages)
+
+
+def format_brl(cents: int) -> str:
+    """Format centavos the way statements print them: 1883,12 -> '1.883,12'."""
+    sign = "-" if cents < 0 else ""
+    reais, centavos = divmod(abs(cents), 100)
+    return f"{sign}{reais:,}".replace(",", ".") + f",{centavos:02d}"
+
+
+class _Pager:
+    """Lays body lines out on pages between a header and a footer."""
+
+    def __init__(self, header_first: list[str], header: list[str], footer: list[str]):
+        self.header = header
+        self.footer = footer
+        self.pages: list[list[str]] = [list(header_first)]
+        self.expected: list[list[Transaction]] = [[]]
+
+    def add(self, lines: list[str], transactions: list[Transaction]) -> None:
+        """Add lines that must stay together on one page."""
+        if LINES_PER_PAGE - len(self.footer) - len(self.pages[-1]) < len(lines):
+            self.pages[-1].extend(self.footer)
+            self.pages.append(list(self.header))
+            self.expected.append([])
+        self.pages[-1].extend(lines)
+        self.expected[-1].extend(transactions)
+
+    def finish(self, bank: str, n_pages: int) -> SyntheticStatement:
+        """Close the last page and keep the first ``n_pages``."""
+        self.pages[-1].extend(self.footer)
+        expected = [tx for page in self.expected[:n_pages] for tx in page]
+        return SyntheticStatement(bank, self.pages[:n_pages], expected)
+
+
+def _itau(n_pages: int, rng: random.Random) -> SyntheticStatement:
+    pager = _Pager(
+        ["Itaú Unibanco S.A.", "Extrato Conta / Lançamentos", "agência 1234 conta 56789-0"],
+        ["Lançamentos", "data lançamentos valor (R$) saldo (R$)"],
+        ["Aviso: os saldos acima são baseados nas informações disponíveis nesse momento"],
+    )
+    kinds = (
+        ("PIX TRANSF {name} {dm}", "PIX", -1),
+        ("PIX QRS {shop} {dm}", "PIX", -1),
+        ("REMUNERACAO/SALARIO", "SALARIO", 1),
+        ("REND PAGO APLIC AUT MAIS", "RENDIMENTO", 1),
+        ("TAR PACOTE ITAU", "TARIFA", -1),
+        ("FATURA PAGA ITAUCARD", "FATURA", -1),
+        ("COMPRA CARTAO {shop}", "OUTRO", -1),
+    )
+    day = date(2026, 1, 1)
+    balance = 1_000_000
+    while len(pager.pages) <= n_pages:
+        ddmmyyyy = day.strftime("%d/%m/%Y")
+        lines, transactions = [], []
+        for _ in range(rng.randint(1, 4)):
+            template, tx_type, sign = rng.choice(kinds)
+            description = template.format(
+                name=rng.choice(_NAMES), shop=rng.choice(_SHOPS), dm=day.strftime("%d/%m")
+            )
+            cents = sign * rng.randint(100, 500_000)
+            balance += cents
+            lines.append(f"{ddmmyyyy} {description} {format_brl(cents)}")
+            transactions.append(Transaction(
+                ddmmyyyy, description, cents, tx_type,
+                "deposit" if cents >= 0 else "withdrawal", "itau",
+            ))
+        lines.append(f"{ddmmyyyy} SALDO DO DIA {format_brl(balance)}")
+        pager.add(lines, transactions)
+        day += timedelta(days=1)
+    return pager.finish("itau", n_pages)
+
+
+def _nubank(n_pages: int, rng: random.Random) -> SyntheticStatement:
+    pager = _Pager(
+        [
+            "FULANO DE TAL", "CPF •••.123.456-•• Agência 0001 Conta 1234567-8",
+            "01 DE JANEIRO DE 2026 a 31 DE DEZEMBRO DE 2026 VALORES EM R$",
+            "Saldo final do período R$ 1.234,56", "Movimentações",
+        ],
+        [],
+        [
+            "Nu Financeira S.A. - Sociedade de Crédito, Financiamento e Investimento",
+            "CNPJ: 30.680.829/0001-43",
+            "Tem alguma dúvida? Mande uma mensagem para nosso time de atendimento",
+            "Ouvidoria: 0800 887 0463",
+        ],
+    )
+    continuation = "{name} - •••.123.456-•• - BCO DO BRASIL S.A. (0001) Agência: 1234 Conta: 56789-0"
+    kinds = (
+        ("Transferência recebida pelo Pix", "PIX", "deposit", True),
+        ("Transferência enviada pelo Pix", "PIX", "withdrawal", True),
+        ("Pagamento de fatura", "FATURA", "withdrawal", False),
+        ("Compra no débito - {shop}", "DEBITO", "withdrawal", False),
+        ("Estorno - {shop}", "ESTORNO", "deposit", False),
+    )
+    day = date(2026, 1, 1)
+    while len(pager.pages) <= n_pages:
+        dd_mmm_yyyy = f"{day.day:02d} {_MONTHS_ABBR[day.month - 1]} {day.year}"
+        ddmmyyyy = day.strftime("%d/%m/%Y")
+        transactions = []
+        lines = [f"{dd_mmm_yyyy} Total de entradas + {format_brl(rng.randint(100, 99_999))}"]
+        for _ in range(rng.randint(1, 3)):
+            template, tx_type, operation, has_details = rng.choice(kinds)
+            description = template.format(shop=rng.choice(_SHOPS))
+            cents = rng.randint(100, 500_000)
+            lines.append(f"{description} {format_brl(cents)}")
+            if has_details:
+                lines.append(continuation.format(name=rng.choice(_NAMES)))
+            transactions.append(Transaction(
+                ddmmyyyy, description, cents if operation == "deposit" else -cents,
+                tx_type, operation, "nubank",
+            ))
+        lines.append(f"Total de saídas - {format_brl(rng.randint(100, 99_999))}")
+        pager.add(lines, transactions)
+        day += timedelta(days=1)
+    return pager.finish("nubank", n_pages)
+
+
+def _inter(n_pages: int, rng: random.Random) -> SyntheticStatement:
+    pager = _Pager(
+        ["Banco Inter S.A.", "Extrato", "Período: 01/01/2026 a 31/12/2026", "Saldo total R$ 1.234,56"],
+        [],
+        ["Fale com a gente", "SAC: 0800 940 9999", "Ouvidoria: 0800 940 7772"],
+    )
+    kinds = (
+        ("Pix enviado", "Cp :44815065-{name}", "PIX", -1),
+        ("Pix recebido", "Cp :60701190-{name}", "PIX", 1),
+        ("Aplicacao", "LCI PRE 180 BANCO INTER SA", "INVESTIMENTO", -1),
+        ("Resgate", "CDB LIQUIDEZ DIARIA", "RESGATE", 1),
+        ("Boleto pago", "{shop}", "BOLETO", -1),
+    )
+    day = date(2026, 1, 1)
+    balance = 1_000_000
+    while len(pager.pages) <= n_pages:
+        ddmmyyyy = day.strftime("%d/%m/%Y")
+        header = f"{day.day} de {_MONTHS_FULL[day.month - 1]} de {day.year}"
+        transactions = []
+        lines = [f"{header} Saldo do dia: R$ {format_brl(balance)}"]
+        for _ in range(rng.randint(1, 4)):
+            action, target, tx_type, sign = rng.choice(kinds)
+            target = target.format(name=rng.choice(_NAMES), shop=rng.choice(_SHOPS))
+            cents = sign * rng.randint(100, 500_000)
+            balance += cents
+            amount = f"-R$ {format_brl(-cents)}" if cents < 0 else f"R$ {format_brl(cents)}"
+            after = f"-R$ {format_brl(-balance)}" if balance < 0 else f"R$ {format_brl(balance)}"
+            lines.append(f'{action}: "{target}" {amount} {after}')
+            transactions.append(Transaction(
+                ddmmyyyy, f"{action}: {target}", cents, tx_type,
+                "deposit" if cents >= 0 else "withdrawal", "inter",
+            ))
+        pager.add(lines, transactions)
+        day += timedelta(days=1)
+    return pager.finish("inter", n_pages)
+
+
+def generate(bank: str, pages: int, seed: int = 0) -> SyntheticStatement:
+    """Generate a ``pages``-page statement for ``bank``, deterministically."""
+    generators = {"itau": _itau, "nubank": _nubank, "inter": _inter}
+    if bank not in generators:
+        raise ValueError(f"Unknown bank: {bank}. Choose from {', '.join(BANKS)}.")
+    if pages < 1:
+        raise ValueError("A statement needs at least one page.")
+    return generators[bank](pages, random.Random(seed))
+
+
+def _pdf_string(line: str) -> bytes:
+    data = line.encode("cp1252")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def render_pdf(pages: list[list[str]]) -> bytes:
+    """Render pages of text lines into a minimal PDF (Helvetica, A4)."""
+    objects: list[bytes] = []
+    font_id = 1
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    pages_id = 2 + 2 * len(pages)
+
+    page_ids = []
+    for lines in pages:
+        ops = [b"BT", b"/F1 %d Tf" % _FONT_SIZE, b"%d TL" % _LEADING, b"40 800 Td"]
+        ops.extend(_pdf_string(line) + b" Tj T*" for line in lines)
+        ops.append(b"ET")
+        stream = b"\n".join(ops)
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (pages_id, font_id, content_id)
+        )
+        page_ids.append(len(objects))
+
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects.append(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids)))
+    objects.append(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+    catalog_id = len(objects)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog_id, xref,
+    )
+    return bytes(out)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a synthetic bank statement.")
+    parser.add_argument("bank", choices=BANKS)
+    parser.add_argument("pages", type=int)
+    parser.add_argument("output", help="Path ending in .pdf or .txt")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    statement = generate(args.bank, args.pages, args.seed)
+    if args.output.endswith(".txt"):
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(statement.text)
+    else:
+        with open(args.output, "wb") as f:
+            f.write(statement.to_pdf())
+    print(f"{args.output}: {args.pages} pages, {len(statement.expected)} transactions")
+
+
+if __name__ == "__main__":
+    main()
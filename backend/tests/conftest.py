@@ -0,0 +1,21 @@
+"""Fixtures shared by the test modules."""
+
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app import main
+from app.cache import ResultCache
+from app.engine import ExtractionEngine
+
+
+@pytest.fixture
+def inline_parsing(monkeypatch):
+    """Make the app parse in a thread (no worker processes) with an empty
+    result cache."""
+    monkeypatch.setattr(main, "engine", ExtractionEngine(max_workers=0, timeout=30))
+    monkeypatch.setattr(main, "cache", ResultCache())
@@ -0,0 +1,87 @@
+"""Tests for the multi-file /api/parse/batch endpoint."""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.cache import ResultCache
+from app.config import Settings
+from app.models import Transaction
+
+
+def _upload(name: str, data: bytes):
+    return ("files", (name, data, "application/pdf"))
+
+
+class TestBatchEndpoint:
+    def setup_method(self):
+        self.client = TestClient(main.app)
+
+    def test_per_file_results_in_upload_order(self, monkeypatch):
+        async def fake_run(fn, contents):
+            if contents == b"%PDF-bad":
+                raise ValueError("Could not detect bank from PDF content.")
+            return [Transaction("01/02/2026", contents[5:].decode(), -100, "PIX", "withdrawal", "nubank")]
+
+        monkeypatch.setattr(main.engine, "run", fake_run)
+        monkeypatch.setattr(main, "cache", ResultCache())
+        response = self.client.post(
+            "/api/parse/batch",
+            files=[
+                _upload("a.pdf", b"%PDF-first"),
+                _upload("b.pdf", b"%PDF-bad"),
+                _upload("c.txt", b"text"),
+                _upload("d.pdf", b"%PDF-second"),
+            ],
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["file_name"] for r in results] == ["a.pdf", "b.pdf", "c.txt", "d.pdf"]
+        assert [r["success"] for r in results] == [True, False, False, True]
+        assert results[0]["bank"] == "nubank"
+        assert results[0]["total_transactions"] == 1
+        assert results[3]["transactions"][0]["description"] == "second"
+        assert "Could not detect bank" in results[1]["error"]
+        assert results[2]["error"] == "Only PDF files are accepted."
+
+    def test_concurrency_is_capped(self, monkeypatch):
+        running = 0
+        peak = 0
+
+        async def fake_run(fn, contents):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return []
+
+        monkeypatch.setattr(main.engine, "run", fake_run)
+        monkeypatch.setattr(main, "cache", ResultCache())
+        monkeypatch.setattr(main, "settings", Settings(batch_concurrency=2))
+        response = self.client.post(
+            "/api/parse/batch",
+            files=[_upload(f"{i}.pdf", b"%PDF-" + str(i).encode()) for i in range(6)],
+        )
+
+        assert response.status_code == 200
+        assert len(response.json()["results"]) == 6
+        assert peak == 2
+
+    @pytest.mark.parametrize("path", [
+        "/api/parse/batch", "/api/parse/stream", "/api/export", "/api/jobs", "/api/ingest",
+    ])
+    def test_too_many_files_rejected(self, monkeypatch, path):
+        monkeypatch.setattr(main, "settings", Settings(batch_max_files=1))
+        response = self.client.post(path, files=[_upload("a.pdf", b"%PDF-a"), _upload("b.pdf", b"%PDF-b")])
+        assert response.status_code == 400
+        assert response.json()["detail"] == "At most 1 files per batch."
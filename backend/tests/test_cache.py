@@ -0,0 +1,128 @@
+"""Tests for the content-addressed parse result cache."""
+
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.cache import ResultCache, cache_key
+from app.models import Transaction
+
+
+# ──────────────────────────────────────────────
+# ResultCache Tests
+# ──────────────────────────────────────────────
+
+class TestResultCache:
+    def test_key_depends_on_content_and_version(self):
+        assert cache_key(b"a", "1") == cache_key(b"a", "1")
+        assert cache_key(b"a", "1") != cache_key(b"b", "1")
+        assert cache_key(b"a", "1") != cache_key(b"a", "2")
+
+    def test_hit_and_miss_counters(self):
+        cache = ResultCache()
+        assert cache.get("k") is None
+        cache.put("k", b"{}")
+        assert cache.get("k") == b"{}"
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = ResultCache(max_entries=2)
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+        cache.get("a")
+        cache.put("c", b"3")
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1"
+
+    def test_size_limit_evicts(self):
+        cache = ResultCache(max_bytes=10)
+        cache.put("a", b"123456")
+        cache.put("b", b"123456")
+        assert cache.get("a") is None
+        assert cache.stats()["bytes"] == 6
+
+    def test_ttl_expires_entries(self):
+        cache = ResultCache(ttl=-1)
+        cache.put("a", b"1")
+        assert cache.get("a") is None
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        first = ResultCache(path=path)
+        first.put("a", b"persisted")
+        first.close()
+
+        second = ResultCache(path=path)
+        assert second.get("a") == b"persisted"
+        assert second.stats()["disk_hits"] == 1
+        second.close()
+
+    def test_expired_disk_entry_is_a_miss(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        ResultCache(path=path, ttl=-1).put("a", b"stale")
+
+        cache = ResultCache(path=path)
+        assert cache.get("a") is None
+        cache.put("a", b"fresh")
+        cache.close()
+        assert ResultCache(path=path).get("a") == b"fresh"
+
+    def test_expired_disk_entries_are_purged_on_write(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        stale = ResultCache(path=path, ttl=-1)
+        stale.put("a", b"stale")
+        stale.put("b", b"stale!")
+        assert stale.stats()["disk_bytes"] == 6
+        stale.close()
+
+        cache = ResultCache(path=path)
+        assert cache.stats()["disk_bytes"] == 6
+        cache.put("c", b"fresh")
+        assert cache.stats()["disk_bytes"] == 5
+        cache.close()
+
+    def test_disk_size_cap_drops_oldest(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        cache = ResultCache(path=path, disk_max_bytes=12)
+        for key in "abc":
+            cache.put(key, b"12345")
+        cache.put("big", b"x" * 13)
+        assert cache.stats()["disk_bytes"] == 10
+        cache.close()
+
+        reopened = ResultCache(path=path, max_entries=0)
+        assert [reopened.get(key) for key in ("a", "b", "c", "big")] == [None, b"12345", b"12345", None]
+        reopened.close()
+
+
+# ──────────────────────────────────────────────
+# API Tests
+# ──────────────────────────────────────────────
+
+class TestParseEndpointCache:
+    def test_repeat_upload_skips_parsing(self, monkeypatch):
+        calls = []
+
+        async def fake_run(fn, contents):
+            calls.append(contents)
+            return [Transaction("01/02/2026", "PIX", -1000, "PIX", "withdrawal", "itau")]
+
+        monkeypatch.setattr(main.engine, "run", fake_run)
+        monkeypatch.setattr(main, "cache", ResultCache())
+        client = TestClient(main.app)
+        upload = {"file": ("extrato.pdf", b"%PDF-1.4 same bytes", "application/pdf")}
+
+        first = client.post("/api/parse", files=upload)
+        second = client.post("/api/parse", files=upload)
+
+        assert first.status_code == second.status_code == 200
+        assert first.content == second.content
+        assert first.json()["total_transactions"] == 1
+        assert len(calls) == 1
+        assert client.get("/api/cache/stats").json()["hits"] == 1
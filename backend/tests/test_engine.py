@@ -0,0 +1,188 @@
+"""Tests for the process-pool extraction engine and its API wiring."""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.engine import EngineBusy, ExtractionEngine, JobTimeout
+
+
+# ──────────────────────────────────────────────
+# Engine Tests
+# ──────────────────────────────────────────────
+
+class TestExtractionEngine:
+    def test_runs_in_worker_process(self):
+        engine = ExtractionEngine(max_workers=1, timeout=30)
+        try:
+            pid = asyncio.run(engine.run(os.getpid))
+        finally:
+            engine.shutdown()
+        assert pid != os.getpid()
+
+    def test_inline_mode_runs_in_thread(self):
+        engine = ExtractionEngine(max_workers=0, timeout=5)
+        assert asyncio.run(engine.run(os.getpid)) == os.getpid()
+
+    def test_rejects_when_queue_full(self):
+        engine = ExtractionEngine(max_workers=0, max_queue=0, retry_after=7)
+
+        async def scenario():
+            first = asyncio.create_task(engine.run(time.sleep, 0.2))
+            await asyncio.sleep(0.05)
+            with pytest.raises(EngineBusy) as exc:
+                await engine.run(time.sleep, 0)
+            await first
+            return exc.value
+
+        busy = asyncio.run(scenario())
+        assert busy.retry_after == 7
+        assert engine.in_flight == 0
+
+    def test_timeout_kills_worker_and_recovers(self):
+        engine = ExtractionEngine(max_workers=1, timeout=1)
+
+        async def scenario():
+            with pytest.raises(JobTimeout):
+                await engine.run(time.sleep, 30)
+            # The runaway worker is gone and a fresh pool serves the next job
+            return await engine.run(os.getpid)
+
+        try:
+            started = time.monotonic()
+            assert asyncio.run(scenario()) != os.getpid()
+            assert time.monotonic() - started < 20
+        finally:
+            engine.shutdown()
+
+    def test_map_timeout_kills_workers_and_recovers(self):
+        engine = ExtractionEngine(max_workers=2, timeout=1)
+
+        async def scenario():
+            with pytest.raises(JobTimeout):
+                await engine.map(time.sleep, [(30,), (30,)])
+            assert engine.in_flight == 0
+            return await engine.run(os.getpid)
+
+        try:
+            started = time.monotonic()
+            assert asyncio.run(scenario()) != os.getpid()
+            assert time.monotonic() - started < 20
+        finally:
+            engine.shutdown()
+
+    def test_steps_share_one_deadline(self):
+        engine = ExtractionEngine(max_workers=0, timeout=0.5)
+
+        async def scenario():
+            deadline = engine.deadline()
+            await engine.run(time.sleep, 0.3, deadline=deadline)
+            with pytest.raises(JobTimeout):
+                await engine.map(time.sleep, [(0.3,)], deadline=deadline)
+
+        asyncio.run(scenario())
+
+
+def _tick(path: str, n: int):
+    """Yield ``n`` numbers slowly, logging each one to ``path``."""
+    for i in range(n):
+        with open(path, "a") as f:
+            f.write(f"{i}\n")
+        time.sleep(0.02)
+        yield i
+
+
+class TestEngineStream:
+    @staticmethod
+    async def _collect(engine, fn, *args):
+        return [item async for item in engine.stream(fn, *args)]
+
+    @pytest.mark.parametrize("max_workers", [0, 1])
+    def test_consumer_leaving_stops_the_worker(self, max_workers, tmp_path):
+        engine = ExtractionEngine(max_workers=max_workers, timeout=30)
+        path = tmp_path / "ticks"
+
+        async def scenario():
+            stream = engine.stream(_tick, str(path), 500)
+            assert await anext(stream) == 0
+            await stream.aclose()
+            assert engine.in_flight == 0
+            await asyncio.sleep(0.5)
+            ticks = path.read_text().count("\n")
+            await asyncio.sleep(0.3)
+            assert path.read_text().count("\n") == ticks
+            return ticks
+
+        try:
+            assert asyncio.run(scenario()) < 50
+        finally:
+            engine.shutdown()
+
+    def test_streams_items_from_worker(self):
+        engine = ExtractionEngine(max_workers=1, timeout=30)
+        try:
+            assert asyncio.run(self._collect(engine, range, 4)) == [0, 1, 2, 3]
+        finally:
+            engine.shutdown()
+
+    def test_worker_errors_are_reraised(self):
+        engine = ExtractionEngine(max_workers=0, timeout=5)
+        with pytest.raises(ValueError):
+            asyncio.run(self._collect(engine, int, "not a number"))
+        assert engine.in_flight == 0
+
+    def test_rejects_when_queue_full(self):
+        engine = ExtractionEngine(max_workers=0, max_queue=0)
+
+        async def scenario():
+            first = asyncio.create_task(engine.run(time.sleep, 0.2))
+            await asyncio.sleep(0.05)
+            with pytest.raises(EngineBusy):
+                await self._collect(engine, range, 1)
+            await first
+
+        asyncio.run(scenario())
+
+
+# ──────────────────────────────────────────────
+# API Tests
+# ──────────────────────────────────────────────
+
+class TestParseEndpointBackpressure:
+    def test_busy_engine_returns_503(self, monkeypatch):
+        async def busy(*args):
+            raise EngineBusy(retry_after=3)
+
+        monkeypatch.setattr(main.engine, "run", busy)
+        client = TestClient(main.app)
+        response = client.post(
+            "/api/parse",
+            files={"file": ("extrato.pdf", b"%PDF-1.4 fake", "application/pdf")},
+        )
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "3"
+
+    def test_timeout_returns_504(self, monkeypatch):
+        async def slow(*args):
+            raise JobTimeout("Parsing took longer than 1s.")
+
+        monkeypatch.setattr(main.engine, "run", slow)
+        client = TestClient(main.app)
+        response = client.post(
+            "/api/parse",
+            files={"file": ("extrato.pdf", b"%PDF-1.4 fake", "application/pdf")},
+        )
+        assert response.status_code == 504
+
+    def test_health_is_served(self):
+        client = TestClient(main.app)
+        assert client.get("/api/health").json() == {"status": "ok"}
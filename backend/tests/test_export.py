@@ -0,0 +1,124 @@
+"""Tests for the streaming CSV / XLSX / Parquet / Arrow exports."""
+
+import csv
+import io
+import os
+import sys
+import zipfile
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.export import FormatUnavailable, new_writer
+from app.export.formats import HEADER
+from app.models import Transaction
+from benchmarks.synthetic import generate
+
+
+def _export(fmt: str, transactions: list[Transaction], batch: int = 7, chunk_rows: int = 10) -> list[bytes]:
+    writer = new_writer(fmt, chunk_rows=chunk_rows)
+    parts = [writer.write(transactions[i:i + batch]) for i in range(0, len(transactions), batch)]
+    parts.append(writer.close())
+    return parts
+
+
+# ──────────────────────────────────────────────
+# Writer Tests
+# ──────────────────────────────────────────────
+
+class TestWriters:
+    TRANSACTIONS = generate("itau", pages=2).expected
+
+    def test_csv_streams_in_chunks(self):
+        parts = _export("csv", self.TRANSACTIONS)
+        assert sum(1 for part in parts if part) > 2
+
+        rows = list(csv.reader(io.StringIO(b"".join(parts).decode("utf-8-sig"))))
+        assert rows[0] == HEADER
+        assert len(rows) == len(self.TRANSACTIONS) + 1
+        first = self.TRANSACTIONS[0]
+        assert rows[1] == [
+            first.date, first.description, f"{first.amount_cents / 100:.2f}",
+            first.transaction_type, first.operation_type, first.bank,
+        ]
+
+    def test_csv_amounts_are_exact(self):
+        tx = Transaction("01/02/2026", 'Quote "x", comma', -5, "PIX", "withdrawal", "itau")
+        rows = list(csv.reader(io.StringIO(b"".join(_export("csv", [tx])).decode("utf-8-sig"))))
+        assert rows[1][1:3] == ['Quote "x", comma', "-0.05"]
+
+    def test_xlsx_is_a_valid_workbook(self):
+        tx = Transaction("01/02/2026", "A < B & \x01C", -188312, "PIX", "withdrawal", "itau")
+        data = b"".join(_export("xlsx", [tx] + self.TRANSACTIONS))
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            assert archive.testzip() is None
+            sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+        assert sheet.count("<row>") == len(self.TRANSACTIONS) + 2
+        # 01/02/2026 as an Excel serial date, the amount as a number
+        assert '<c s="1"><v>46054</v></c><c t="inlineStr"><is><t>A &lt; B &amp; C</t></is></c>' in sheet
+        assert '<c s="2"><v>-1883.12</v></c>' in sheet
+
+    def test_xlsx_opens_in_openpyxl(self):
+        openpyxl = pytest.importorskip("openpyxl")
+        data = b"".join(_export("xlsx", self.TRANSACTIONS))
+        sheet = openpyxl.load_workbook(io.BytesIO(data)).active
+        assert [cell.value for cell in sheet[1]] == HEADER
+        assert sheet.max_row == len(self.TRANSACTIONS) + 1
+        assert sheet["C2"].value == self.TRANSACTIONS[0].amount_cents / 100
+
+    @pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+    def test_columnar_round_trip(self, fmt):
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.parquet as pq
+
+        data = b"".join(_export(fmt, self.TRANSACTIONS))
+        if fmt == "parquet":
+            table = pq.read_table(io.BytesIO(data))
+        else:
+            table = pa.ipc.open_stream(data).read_all()
+        assert table.num_rows == len(self.TRANSACTIONS)
+        assert table.column("amount_cents").to_pylist() == [t.amount_cents for t in self.TRANSACTIONS]
+        assert table.schema.field("date").type == pa.date32()
+
+    def test_missing_pyarrow_is_reported(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+        with pytest.raises(FormatUnavailable):
+            new_writer("parquet")
+
+
+# ──────────────────────────────────────────────
+# API Tests
+# ──────────────────────────────────────────────
+
+@pytest.mark.usefixtures("inline_parsing")
+class TestExportEndpoint:
+    def test_streams_csv_for_several_files(self):
+        client = TestClient(main.app)
+        statements = [generate("itau", pages=2), generate("inter", pages=1)]
+        files = [
+            ("files", (f"{i}.pdf", s.to_pdf(), "application/pdf"))
+            for i, s in enumerate(statements)
+        ]
+
+        for _ in range(2):  # second round is served from the cache
+            response = client.post("/api/export?format=csv", files=files)
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/csv")
+            assert 'filename="extrato.csv"' in response.headers["content-disposition"]
+            rows = list(csv.reader(io.StringIO(response.content.decode("utf-8-sig"))))
+            assert len(rows) == 1 + sum(len(s.expected) for s in statements)
+            assert rows[-1][5] == "inter"
+
+    def test_unavailable_format_returns_501(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+        client = TestClient(main.app)
+        response = client.post(
+            "/api/export?format=parquet",
+            files=[("files", ("a.pdf", b"%PDF-1.4", "application/pdf"))],
+        )
+        assert response.status_code == 501
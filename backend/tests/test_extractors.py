@@ -0,0 +1,78 @@
+"""Parity tests for the pluggable text extraction backends."""
+
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.parsers import EXTRACTORS, iter_parse_pdf, parse_pdf, result_version
+from app.parsers.extractors import open_document
+from benchmarks.synthetic import BANKS, generate
+
+
+# ──────────────────────────────────────────────
+# Parity Tests
+# ──────────────────────────────────────────────
+
+class TestExtractorParity:
+    @pytest.mark.parametrize("extractor", sorted(EXTRACTORS))
+    @pytest.mark.parametrize("bank", BANKS)
+    def test_same_transactions_under_every_extractor(self, bank, extractor):
+        statement = generate(bank, pages=3)
+        assert parse_pdf(statement.to_pdf(), extractor) == statement.expected
+
+    @pytest.mark.parametrize("extractor", sorted(EXTRACTORS))
+    def test_same_page_texts(self, extractor):
+        statement = generate("inter", pages=2)
+        doc = open_document(statement.to_pdf(), extractor)
+        try:
+            assert [doc.page_text(i) for i in range(len(doc))] == statement.page_texts
+        finally:
+            doc.close()
+
+    @pytest.mark.parametrize("extractor", sorted(EXTRACTORS))
+    def test_opens_spooled_files(self, extractor, tmp_path):
+        statement = generate("nubank", pages=2)
+        path = tmp_path / "extrato.pdf"
+        path.write_bytes(statement.to_pdf())
+        events = list(iter_parse_pdf(str(path), extractor))
+        assert events[0] == {"event": "start", "bank": "nubank", "total_pages": 2}
+
+    def test_unknown_extractor_raises(self):
+        with pytest.raises(ValueError, match="Unknown extractor"):
+            parse_pdf(generate("itau", pages=1).to_pdf(), "tesseract")
+
+
+# ──────────────────────────────────────────────
+# API Tests
+# ──────────────────────────────────────────────
+
+@pytest.mark.usefixtures("inline_parsing")
+class TestExtractorParam:
+    def test_extractor_is_selectable_per_request(self):
+        client = TestClient(main.app)
+        statement = generate("itau", pages=2)
+        upload = {"file": ("a.pdf", statement.to_pdf(), "application/pdf")}
+
+        default = client.post("/api/parse", files=upload)
+        fast = client.post("/api/parse?extractor=pdfium", files=upload)
+
+        assert default.status_code == fast.status_code == 200
+        assert default.content == fast.content
+        # Results are cached per extractor
+        assert main.cache.stats()["hits"] == 0
+        assert result_version("pdfium") != result_version()
+
+    def test_unknown_extractor_is_rejected(self):
+        client = TestClient(main.app)
+        response = client.post(
+            "/api/parse?extractor=tesseract",
+            files={"file": ("a.pdf", b"%PDF-1.4", "application/pdf")},
+        )
+        assert response.status_code == 422
@@ -0,0 +1,256 @@
+"""Tests for the persistent background job queue and /api/jobs."""
+
+import asyncio
+import csv
+import io
+import os
+import sys
+import time
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.engine import EngineBusy
+from app.jobs import DONE, FAILED, QUEUED, RUNNING, JobRunner, JobStore
+from app.uploads import SpooledUpload
+from benchmarks.synthetic import generate
+
+
+def _upload(data: bytes = b"%PDF-1.4 job", name: str = "a.pdf") -> SpooledUpload:
+    return SpooledUpload(name, len(data), "digest-" + name, data=data)
+
+
+@pytest.fixture
+def store(tmp_path):
+    jobs = JobStore(str(tmp_path), max_attempts=2, retry_backoff=0)
+    yield jobs
+    jobs.close()
+
+
+# ──────────────────────────────────────────────
+# JobStore Tests
+# ──────────────────────────────────────────────
+
+class TestJobStore:
+    def test_jobs_are_claimed_in_order(self, store):
+        first = store.submit(_upload(name="a.pdf"), "pdfplumber")
+        second = store.submit(_upload(name="b.pdf"), "pdfium")
+        assert first["status"] == QUEUED
+
+        job = store.claim()
+        assert (job.id, job.attempts) == (first["id"], 1)
+        with open(job.path, "rb") as f:
+            assert f.read() == b"%PDF-1.4 job"
+        assert store.get(job.id)["status"] == RUNNING
+        assert store.claim().extractor == "pdfium"
+        assert store.claim() is None
+        assert store.get(second["id"])["status"] == RUNNING
+
+    def test_spool_file_is_taken_over(self, store, tmp_path):
+        spooled = tmp_path / "spool.pdf"
+        spooled.write_bytes(b"%PDF-1.4 big")
+        upload = SpooledUpload("big.pdf", 12, "digest", path=str(spooled))
+        store.submit(upload, "pdfplumber")
+        upload.close()
+        assert not spooled.exists()
+        with open(store.claim().path, "rb") as f:
+            assert f.read() == b"%PDF-1.4 big"
+
+    def test_finish_keeps_result_and_drops_file(self, store):
+        store.submit(_upload(), "pdfplumber")
+        job = store.claim()
+        store.progress(job.id, 3, 4)
+        assert store.get(job.id)["pages_done"] == 3
+        store.finish(job.id, b'{"transactions":[]}')
+        assert store.get(job.id)["status"] == DONE
+        assert store.result(job.id) == b'{"transactions":[]}'
+        assert not os.path.exists(job.path)
+
+    def test_failures_are_retried_up_to_the_limit(self, store):
+        store.submit(_upload(), "pdfplumber")
+        job = store.claim()
+        store.fail(job.id, "worker crashed")
+        assert store.get(job.id)["status"] == QUEUED
+
+        job = store.claim()
+        assert job.attempts == 2
+        store.fail(job.id, "worker crashed again")
+        assert store.get(job.id)["status"] == FAILED
+        assert store.get(job.id)["error"] == "worker crashed again"
+        assert store.claim() is None
+
+    def test_release_does_not_use_an_attempt(self, store):
+        store.submit(_upload(), "pdfplumber")
+        store.release(store.claim().id, 0)
+        assert store.claim().attempts == 1
+
+    def test_queue_survives_a_restart(self, tmp_path):
+        before = JobStore(str(tmp_path))
+        running = before.submit(_upload(name="a.pdf"), "pdfplumber")
+        queued = before.submit(_upload(name="b.pdf"), "pdfplumber")
+        assert before.claim().id == running["id"]
+        before.close()  # the process dies with one job running
+
+        after = JobStore(str(tmp_path), lease=0.05)
+        try:
+            assert after.recover() == 0  # the lease has not run out yet
+            time.sleep(0.1)
+            assert after.recover() == 1
+            assert after.get(running["id"])["status"] == QUEUED
+            assert {after.claim().id, after.claim().id} == {running["id"], queued["id"]}
+            assert after.counts()[RUNNING] == 2
+        finally:
+            after.close()
+
+
+    def test_a_live_lease_is_not_taken_over(self, tmp_path):
+        first = JobStore(str(tmp_path), lease=0.2)
+        second = JobStore(str(tmp_path), lease=0.2)
+        try:
+            job = first.submit(_upload(), "pdfplumber")
+            assert first.claim().id == job["id"]
+            assert second.claim() is None
+            assert second.recover() == 0
+
+            time.sleep(0.1)
+            assert first.heartbeat(job["id"])
+            time.sleep(0.15)  # past the claim, not past the heartbeat
+            assert second.recover() == 0
+
+            time.sleep(0.1)
+            assert second.recover() == 1
+            assert second.claim().id == job["id"]
+            # The first store lost the job: its late writes are dropped
+            assert not first.heartbeat(job["id"])
+            first.finish(job["id"], b"stale")
+            assert second.get(job["id"])["status"] == RUNNING
+            second.finish(job["id"], b"{}")
+            assert second.result(job["id"]) == b"{}"
+        finally:
+            first.close()
+            second.close()
+
+
+# ──────────────────────────────────────────────
+# JobRunner Tests
+# ──────────────────────────────────────────────
+
+class TestJobRunner:
+    def _drain(self, store, handler):
+        async def scenario():
+            runner = JobRunner(store, handler, concurrency=2, retry_on=(OSError,), poll=0.01)
+            runner.start()
+            for _ in range(200):
+                counts = store.counts()
+                if counts[QUEUED] == counts[RUNNING] == 0:
+                    break
+                await asyncio.sleep(0.01)
+            await runner.stop()
+
+        asyncio.run(scenario())
+
+    def test_transient_errors_are_retried(self, store):
+        calls = []
+
+        async def flaky(job, progress):
+            calls.append(job.attempts)
+            if job.attempts == 1:
+                raise OSError("worker crashed")
+            await progress(1, 1)
+            return b'{"ok":true}'
+
+        job_id = store.submit(_upload(), "pdfplumber")["id"]
+        self._drain(store, flaky)
+        assert calls == [1, 2]
+        assert store.result(job_id) == b'{"ok":true}'
+
+    def test_unreadable_pdf_fails_at_once(self, store):
+        async def bad(job, progress):
+            raise ValueError("Could not detect bank from PDF content.")
+
+        job_id = store.submit(_upload(), "pdfplumber")["id"]
+        self._drain(store, bad)
+        status = store.get(job_id)
+        assert (status["status"], status["attempts"]) == (FAILED, 1)
+
+    def test_busy_engine_puts_job_back(self, store):
+        calls = []
+
+        async def busy_once(job, progress):
+            calls.append(job.attempts)
+            if len(calls) == 1:
+                raise EngineBusy(retry_after=0)
+            return b"{}"
+
+        job_id = store.submit(_upload(), "pdfplumber")["id"]
+        self._drain(store, busy_once)
+        assert calls == [1, 1]
+        assert store.get(job_id)["status"] == DONE
+
+
+# ──────────────────────────────────────────────
+# API Tests
+# ──────────────────────────────────────────────
+
+class TestJobsEndpoint:
+    @pytest.fixture(autouse=True)
+    def setup(self, inline_parsing, monkeypatch, tmp_path):
+        monkeypatch.setattr(main, "jobs", JobStore(str(tmp_path)))
+
+    def _wait(self, client, job_id: str) -> dict:
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            status = client.get(f"/api/jobs/{job_id}").json()
+            if status["status"] in (DONE, FAILED):
+                return status
+            time.sleep(0.02)
+        raise AssertionError("job did not finish")
+
+    def test_job_runs_in_the_background(self):
+        statement = generate("itau", pages=3)
+        files = [
+            ("files", ("a.pdf", statement.to_pdf(), "application/pdf")),
+            ("files", ("notes.txt", b"x", "text/plain")),
+        ]
+        with TestClient(main.app) as client:
+            response = client.post("/api/jobs", files=files)
+            assert response.status_code == 202
+            submitted, rejected = response.json()["jobs"]
+            assert rejected == {"file_name": "notes.txt", "success": False, "error": "Only PDF files are accepted."}
+
+            status = self._wait(client, submitted["id"])
+            assert (status["pages_done"], status["total_pages"]) == (3, 3)
+
+            result = client.get(f"/api/jobs/{submitted['id']}/result").json()
+            assert result["total_transactions"] == len(statement.expected)
+
+            exported = client.get(f"/api/jobs/{submitted['id']}/result?format=csv")
+            rows = list(csv.reader(io.StringIO(exported.content.decode("utf-8-sig"))))
+            assert len(rows) == 1 + len(statement.expected)
+
+            # The result was cached: resubmitting is done at once
+            again = client.post("/api/jobs", files=files[:1]).json()["jobs"][0]
+            assert again["status"] == DONE
+
+    def test_pending_and_unknown_jobs(self):
+        client = TestClient(main.app)  # no lifespan: nothing drains the queue
+        job = client.post(
+            "/api/jobs", files=[("files", ("a.pdf", b"%PDF-1.4", "application/pdf"))]
+        ).json()["jobs"][0]
+        assert client.get(f"/api/jobs/{job['id']}").json()["status"] == QUEUED
+        assert client.get(f"/api/jobs/{job['id']}/result").status_code == 409
+        assert client.get("/api/jobs/nope").status_code == 404
+
+    def test_failed_job_reports_its_error(self):
+        with TestClient(main.app) as client:
+            job = client.post(
+                "/api/jobs", files=[("files", ("a.pdf", b"%PDF-1.4 broken", "application/pdf"))]
+            ).json()["jobs"][0]
+            status = self._wait(client, job["id"])
+            assert status["status"] == FAILED
+            assert client.get(f"/api/jobs/{job['id']}/result").status_code == 422
@@ -0,0 +1,131 @@
+"""Tests for stage metrics, the /metrics endpoint and request profiling."""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.testclient import TestClient
+
+from app import main, metrics
+from app.engine import ExtractionEngine
+from app.parsers import parse_pdf
+from benchmarks.synthetic import generate
+
+
+def _sample(text: str, series: str) -> float:
+    """Value of one exposition line, e.g. ``'extrato_pages_total{bank="itau"}'``."""
+    for line in text.splitlines():
+        if line.startswith(series + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+# ──────────────────────────────────────────────
+# Registry Tests
+# ──────────────────────────────────────────────
+
+class TestRegistry:
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = metrics.Histogram("h", "help", ("stage",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value, ("x",))
+        lines = list(histogram.samples())
+        assert lines[:3] == [
+            'h_bucket{stage="x",le="0.1"} 1.0',
+            'h_bucket{stage="x",le="1.0"} 2.0',
+            'h_bucket{stage="x",le="+Inf"} 3.0',
+        ]
+        assert lines[3] == 'h_sum{stage="x"} 5.55'
+        assert lines[4] == 'h_count{stage="x"} 3.0'
+
+    def test_capture_buffers_until_replayed(self):
+        before = _sample(metrics.render(), "extrato_bytes_in_total")
+        with metrics.capture() as events:
+            metrics.inc("extrato_bytes_in_total", 10)
+        assert _sample(metrics.render(), "extrato_bytes_in_total") == before
+        metrics.replay(events)
+        assert _sample(metrics.render(), "extrato_bytes_in_total") == before + 10
+
+    def test_worker_metrics_reach_the_parent(self):
+        before = _sample(metrics.render(), "extrato_bytes_in_total")
+        engine = ExtractionEngine(max_workers=1, timeout=30)
+        try:
+            asyncio.run(engine.run(metrics.inc, "extrato_bytes_in_total", 7))
+        finally:
+            engine.shutdown()
+        assert _sample(metrics.render(), "extrato_bytes_in_total") == before + 7
+
+    def test_parse_pdf_records_stages_and_counts(self):
+        statement = generate("inter", pages=2)
+        text = metrics.render()
+        pages = _sample(text, 'extrato_pages_total{bank="inter"}')
+        parsed = _sample(text, 'extrato_lines_total{bank="inter",outcome="parsed"}')
+
+        parse_pdf(statement.to_pdf())
+
+        text = metrics.render()
+        assert _sample(text, 'extrato_pages_total{bank="inter"}') == pages + 2
+        assert _sample(
+            text, 'extrato_lines_total{bank="inter",outcome="parsed"}'
+        ) == parsed + len(statement.expected)
+        for stage in ("open", "detect", "extract", "parse"):
+            assert _sample(text, f'extrato_stage_seconds_count{{stage="{stage}"}}') > 0
+
+
+# ──────────────────────────────────────────────
+# API Tests
+# ──────────────────────────────────────────────
+
+@pytest.mark.usefixtures("inline_parsing")
+class TestMetricsEndpoint:
+    def test_exposes_request_and_stage_metrics(self):
+        client = TestClient(main.app)
+        pdf = generate("itau", pages=1).to_pdf()
+        assert client.post("/api/parse", files={"file": ("a.pdf", pdf, "application/pdf")}).is_success
+
+        response = client.get("/metrics")
+        assert response.headers["content-type"].startswith("text/plain")
+        text = response.text
+        assert "# TYPE extrato_stage_seconds histogram" in text
+        assert _sample(text, 'extrato_stage_seconds_count{stage="serialize"}') > 0
+        assert _sample(
+            text,
+            'extrato_http_request_seconds_count{method="POST",route="/api/parse",status="200"}',
+        ) > 0
+        assert "extrato_engine_in_flight 0.0" in text
+
+    def test_cache_lookups_are_counters(self):
+        client = TestClient(main.app)
+        pdf = generate("itau", pages=1).to_pdf()
+        before = client.get("/metrics").text
+        for _ in range(2):
+            assert client.post("/api/parse", files={"file": ("a.pdf", pdf, "application/pdf")}).is_success
+
+        text = client.get("/metrics").text
+        assert "# TYPE extrato_cache_hits_total counter" in text
+        assert _sample(text, "extrato_cache_hits_total") - _sample(before, "extrato_cache_hits_total") == 1
+        assert _sample(text, "extrato_cache_misses_total") - _sample(before, "extrato_cache_misses_total") == 1
+
+    def test_profile_header_attaches_report(self):
+        client = TestClient(main.app)
+        statement = generate("nubank", pages=1)
+        upload = {"file": ("a.pdf", statement.to_pdf(), "application/pdf")}
+
+        plain = client.post("/api/parse", files=upload).json()
+        profiled = client.post("/api/parse", files=upload, headers={"X-Profile": "1"}).json()
+
+        assert "profile" not in plain
+        assert "cumulative" in profiled["profile"]
+        assert profiled["transactions"] == plain["transactions"]
+
+        summary = client.post(
+            "/api/parse?include=summary", files=upload, headers={"X-Profile": "1"}
+        ).json()
+        assert "transactions" not in summary
+        assert summary["summary"]["count"] == len(statement.expected)
+        assert "cumulative" in summary["profile"]
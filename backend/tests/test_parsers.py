@@ -53,6 +53,221 @@ class TestBankDetection:
             detect_bank("This is just some random text with no bank info.")
 
 
+# ──────────────────────────────────────────────
+# Extraction Pass Tests
+# ──────────────────────────────────────────────
+
+class _FakePage:
+    def __init__(self, text: str, header: str = ""):
+        self.text = text
+        self.header = header
+        self.extract_calls = 0
+        self.closed = False
+
+
+class _FakeDocument:
+    """An extractor document (see app.parsers.extractors) over fake pages."""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def __len__(self):
+        return len(self.pages)
+
+    def page_text(self, index):
+        self.pages[index].extract_calls += 1
+        return self.pages[index].text
+
+    def header_text(self, index, fraction):
+        return self.pages[index].header
+
+    def release(self, index):
+        self.pages[index].closed = True
+
+    def close(self):
+        pass
+
+
+def _open_fake(monkeypatch, pages):
+    """Make the default extractor open ``pages`` whatever the PDF."""
+    from app.parsers import extractors
+    monkeypatch.setitem(extractors.EXTRACTORS, "pdfplumber", lambda source: _FakeDocument(pages))
+
+
+class TestSinglePassExtraction:
+    ITAU_PAGE = "Itaú Unibanco\n18/02/2026 PIX TRANSF JOAO 18/02 -30,00"
+
+    def _parse(self, monkeypatch, pages):
+        _open_fake(monkeypatch, pages)
+        return parse_pdf(b"%PDF")
+
+    def test_each_page_extracted_once(self, monkeypatch):
+        pages = [_FakePage(self.ITAU_PAGE), _FakePage("19/02/2026 TAR PACOTE -5,00")]
+        transactions = self._parse(monkeypatch, pages)
+        assert [p.extract_calls for p in pages] == [1, 1]
+        assert [tx.amount for tx in transactions] == [-30.0, -5.0]
+
+    def test_pages_are_released_after_extraction(self, monkeypatch):
+        pages = [_FakePage(self.ITAU_PAGE), _FakePage("19/02/2026 TAR PACOTE -5,00")]
+        self._parse(monkeypatch, pages)
+        assert all(p.closed for p in pages)
+
+    def test_header_detection_is_used(self, monkeypatch):
+        # Body mentions Itaú, header identifies Inter: the header wins
+        page = _FakePage(
+            '5 de Fevereiro de 2026\nPix enviado: "Cp :1-ITAU" -R$ 10,00 R$ 90,00',
+            header="Banco Inter S.A. - Extrato",
+        )
+        transactions = self._parse(monkeypatch, [page])
+        assert page.extract_calls == 1
+        assert transactions[0].bank == "inter"
+
+    def test_itau_header_is_confirmed_on_full_page(self, monkeypatch):
+        page = _FakePage("Nu Pagamentos S.A.\nMovimentações", header="Transferência Itaú")
+        assert self._parse(monkeypatch, [page]) == []
+        assert page.extract_calls == 1
+
+
+class TestIterTransactions:
+    INTER_PAGES = [
+        "Banco Inter\n1 de Fevereiro de 2026",
+        'Pix recebido: "Cp :1-FULANO" R$ 250,00 R$ 300,00',
+        '2 de Fevereiro de 2026\nPix enviado: "Cp :2-LOJA" -R$ 44,99 R$ 255,01',
+    ]
+
+    def test_matches_parsing_joined_text(self):
+        from app.parsers import iter_transactions, parse_inter
+        incremental = list(iter_transactions("inter", self.INTER_PAGES))
+        assert incremental == parse_inter("\n".join(self.INTER_PAGES))
+        assert [tx.date for tx in incremental] == ["01/02/2026", "02/02/2026"]
+
+    def test_accepts_lines(self):
+        from app.parsers import iter_transactions
+        lines = "\n".join(self.INTER_PAGES).split("\n")
+        assert len(list(iter_transactions("inter", lines))) == 2
+
+    def test_consumes_pages_lazily(self):
+        from app.parsers import iter_transactions
+        pulled = []
+
+        def pages():
+            for number, text in enumerate(self.INTER_PAGES):
+                pulled.append(number)
+                yield text
+
+        transactions = iter_transactions("inter", pages())
+        first = next(transactions)
+        assert first.amount == 250.0
+        assert pulled == [0, 1]
+
+    def test_nubank_state_crosses_pages(self):
+        from app.parsers import iter_transactions
+        pages = ["Movimentações", "14 FEV 2026", "Transferência recebida pelo Pix 30,00"]
+        [tx] = iter_transactions("nubank", pages)
+        assert (tx.date, tx.amount) == ("14/02/2026", 30.0)
+
+    def test_unknown_bank_raises(self):
+        from app.parsers import iter_transactions
+        with pytest.raises(ValueError, match="No parser"):
+            list(iter_transactions("bradesco", []))
+
+
+class TestIterParsePdf:
+    def test_yields_start_then_one_event_per_page(self, monkeypatch):
+        import app.parsers as parsers
+        pages = [
+            _FakePage("Nu Pagamentos S.A.\nMovimentações\n14 FEV 2026 Total de entradas + 30,00"),
+            _FakePage("Transferência recebida pelo Pix 30,00\nPagamento de fatura 83,25"),
+        ]
+        _open_fake(monkeypatch, pages)
+
+        events = list(parsers.iter_parse_pdf(b"%PDF"))
+
+        assert events[0] == {"event": "start", "bank": "nubank", "total_pages": 2}
+        assert [e["page"] for e in events[1:]] == [1, 2]
+        assert events[1]["transactions"] == []
+        # Date header and "Movimentações" from page 1 carry over to page 2
+        assert [tx.amount for tx in events[2]["transactions"]] == [30.0, -83.25]
+        assert [p.extract_calls for p in pages] == [1, 1]
+
+
+class _SteeringParser:
+    """ItauParser that stops at "FIM"."""
+
+    def __init__(self):
+        from app.parsers import ItauParser
+        self.inner = ItauParser()
+        self.done = False
+
+    def feed(self, text):
+        self.done = "FIM" in text
+        return self.inner.feed(text)
+
+
+class TestParserSteering:
+    ITAU_PAGE = TestSinglePassExtraction.ITAU_PAGE
+
+    def _pages(self, monkeypatch):
+        import app.parsers as parsers
+        pages = [
+            _FakePage(self.ITAU_PAGE),
+            _FakePage("19/02/2026 TAR PACOTE -5,00"),
+            _FakePage("20/02/2026 TAR PACOTE -6,00\nFIM"),
+            _FakePage("Aviso legal"),
+            _FakePage("Aviso legal"),
+        ]
+        parser = _SteeringParser()
+        _open_fake(monkeypatch, pages)
+        monkeypatch.setattr(parsers, "_new_parser", lambda bank: parser)
+        return pages
+
+    def test_no_page_is_laid_out_once_done(self, monkeypatch):
+        pages = self._pages(monkeypatch)
+        transactions = parse_pdf(b"%PDF")
+        assert [tx.amount for tx in transactions] == [-30.0, -5.0, -6.0]
+        assert [p.extract_calls for p in pages] == [1, 1, 1, 0, 0]
+
+    def test_stream_keeps_one_event_per_page(self, monkeypatch):
+        import app.parsers as parsers
+        self._pages(monkeypatch)
+        events = list(parsers.iter_parse_pdf(b"%PDF"))
+        assert [e["page"] for e in events[1:]] == [1, 2, 3, 4, 5]
+        assert [len(e["transactions"]) for e in events[1:]] == [1, 1, 1, 0, 0]
+
+
+class TestTallPageHeaders:
+    # A letterhead and account block taller than the top fifth of the page
+    LETTERHEAD = [
+        "Banco S.A. - CNPJ 00.000.000/0001-00",
+        "Av. Paulista, 1000 - Bela Vista - São Paulo - SP",
+        "CEP 01310-100",
+        "Central de Atendimento 4004 0000 (capitais e regiões metropolitanas)",
+        "0800 000 0000 (demais localidades)",
+        "SAC 0800 000 0001 - Ouvidoria 0800 000 0002",
+        "Deficientes auditivos ou de fala 0800 000 0003",
+        "Cliente: FULANO DE TAL",
+        "CPF: ***.456.789-**",
+        "Agência: 1234 Conta corrente: 56789-0",
+        "Extrato de conta corrente",
+        "Período: mês atual",
+        "Valores em reais",
+        "Página seguinte",
+    ]
+    NOTICE = ["Informações importantes", "Este extrato não substitui o documento oficial."]
+
+    @pytest.mark.parametrize("extractor", ["pdfplumber", "pdfium"])
+    @pytest.mark.parametrize("bank", ["itau", "nubank", "inter"])
+    def test_no_transactions_are_lost(self, monkeypatch, bank, extractor):
+        from benchmarks import synthetic
+
+        # Leave room for the letterhead on every continuation page
+        monkeypatch.setattr(synthetic, "LINES_PER_PAGE", synthetic.LINES_PER_PAGE - len(self.LETTERHEAD))
+        statement = synthetic.generate(bank, pages=4)
+        pages = statement.pages[:1] + [self.LETTERHEAD + page for page in statement.pages[1:]]
+        pdf = synthetic.render_pdf(pages + [self.NOTICE])
+        assert parse_pdf(pdf, extractor) == statement.expected
+
+
 # ──────────────────────────────────────────────
 # Itaú Parser Tests
 # ──────────────────────────────────────────────
@@ -172,7 +387,7 @@ class TestTransactionModel:
         tx = Transaction(
             date="01/01/2026",
             description="Test",
-            amount=-10.0,
+            amount_cents=-1000,
             transaction_type="PIX",
             operation_type="withdrawal",
             bank="itau",
@@ -180,4 +395,105 @@ class TestTransactionModel:
         d = tx.to_dict()
         assert d["date"] == "01/01/2026"
         assert d["amount"] == -10.0
+        assert d["amount_cents"] == -1000
         assert d["bank"] == "itau"
+
+
+# ──────────────────────────────────────────────
+# Line Classifier / Keyword Table Tests
+# ──────────────────────────────────────────────
+
+class TestKeywordTables:
+    def test_first_matching_rule_wins(self):
+        from app.parsers.keywords import KeywordRule, classify
+        rules = (
+            KeywordRule("A", prefixes=("pix",)),
+            KeywordRule("B", contains=("pix", "ted")),
+        )
+        assert classify("pix ted", rules, "X") == "A"
+        assert classify("dev pix", rules, "X") == "B"
+        assert classify("boleto", rules, "X") == "X"
+
+    @pytest.mark.parametrize("description, tx_type", [
+        ("PIX TRANSF FULANO 18/02", "PIX"),
+        ("PIX QRS PADARIA", "PIX"),
+        ("DEV PIX FULANO", "PIX_DEVOLUCAO"),
+        ("FATURA PAGA ITAUCARD", "FATURA"),
+        ("REND PAGO APLIC AUT MAIS", "RENDIMENTO"),
+        ("SISPAG EMPRESA", "SALARIO"),
+        ("TAR PACOTE ITAU", "TARIFA"),
+        ("TED 001.0001 FULANO", "TED"),
+        ("DOC FULANO", "DOC"),
+        ("COMPRA CARTAO", "OUTRO"),
+    ])
+    def test_itau_types(self, description, tx_type):
+        from app.parsers.itau import _infer_transaction_type
+        assert _infer_transaction_type(description) == tx_type
+
+    @pytest.mark.parametrize("description, tx_type, operation", [
+        ("Transferência recebida pelo Pix", "PIX", "deposit"),
+        ("Pagamento de fatura", "FATURA", "withdrawal"),
+        ("Rendimento líquido", "RENDIMENTO", "withdrawal"),
+        ("Compra no débito - PADARIA", "DEBITO", "withdrawal"),
+        ("Estorno - Compra", "ESTORNO", "deposit"),
+        ("Outro lançamento", "OUTRO", "withdrawal"),
+    ])
+    def test_nubank_types(self, description, tx_type, operation):
+        from app.parsers.nubank import _infer_operation, _infer_transaction_type
+        assert _infer_transaction_type(description) == tx_type
+        assert _infer_operation(description, 100) == (operation, 100 if operation == "deposit" else -100)
+
+
+class TestLineClassifiers:
+    def test_itau_skips_balance_and_non_dated_lines(self):
+        from app.parsers.itau import _classify
+        assert _classify("18/02/2026 PIX TRANSF FULANO 18/02 -30,00")
+        assert _classify("18/02/2026 SALDO DO DIA 1.234,56") is None
+        assert _classify("Lançamentos 1,00") is None
+
+    def test_nubank_line_kinds(self):
+        from app.parsers.nubank import _AMOUNT_TRAIL_RE, _DATE_HEADER_RE, _classify
+        assert _classify("14 FEV 2026 Total de entradas + 30,00").re is _DATE_HEADER_RE
+        assert _classify("Pagamento de fatura 83,25").re is _AMOUNT_TRAIL_RE
+        assert _classify("99 Food pedido 12,50").re is _AMOUNT_TRAIL_RE
+        assert _classify("Total de saídas - 83,25") is None
+        assert _classify("Ouvidoria: 0800 887 0463") is None
+        assert _classify("Agência: 1 Conta: 123-4") is None
+
+    def test_inter_line_kinds(self):
+        from app.parsers.inter import _DATE_HEADER_RE, _TRANSACTION_RE, _classify
+        assert _classify("1 de Fevereiro de 2026 Saldo do dia: R$ 73,85").re is _DATE_HEADER_RE
+        line = 'Pix enviado: "Cp :1-LOJA" -R$ 44,99 -R$ 29,86'
+        assert _classify(line).re is _TRANSACTION_RE
+        assert _classify("Fale com a gente") is None
+
+
+# ──────────────────────────────────────────────
+# Amount Parsing Tests
+# ──────────────────────────────────────────────
+
+class TestParseBrlCents:
+    @pytest.mark.parametrize("text, cents", [
+        ("-1.883,12", -188312),
+        ("2.546,68", 254668),
+        ("30,00", 3000),
+        ("83,25", 8325),
+        ("30,5", 3050),
+        (",50", 50),
+        ("2026", 202600),
+        (" 0,01 ", 1),
+    ])
+    def test_parses(self, text, cents):
+        from app.parsers.amounts import parse_brl_cents
+        assert parse_brl_cents(text) == cents
+
+    @pytest.mark.parametrize("text", ["", "-", "1,2,3", "1,234", "R$ 10", "١٢"])
+    def test_rejects_malformed(self, text):
+        from app.parsers.amounts import parse_brl_cents
+        with pytest.raises(ValueError):
+            parse_brl_cents(text)
+
+    def test_sums_are_exact(self):
+        from app.parsers.amounts import parse_brl_cents
+        total = sum(parse_brl_cents("0,10") for _ in range(1000))
+        assert total == 10000
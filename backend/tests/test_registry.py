@@ -0,0 +1,72 @@
+"""Tests for the bank registry and signature-based detection."""
+
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.parsers import BANKS, Bank, detect, detect_bank, iter_transactions, register
+from app.parsers.registry import new_parser
+from benchmarks.synthetic import generate
+
+
+@pytest.fixture
+def registry():
+    saved = dict(BANKS)
+    yield
+    BANKS.clear()
+    for bank in saved.values():
+        register(bank)
+
+
+class _NullParser:
+    def feed(self, text):
+        return iter(())
+
+
+# ──────────────────────────────────────────────
+# Detection Tests
+# ──────────────────────────────────────────────
+
+class TestDetect:
+    @pytest.mark.parametrize("bank", ["itau", "nubank", "inter"])
+    def test_synthetic_pages_are_unambiguous(self, bank):
+        detection = detect(generate(bank, pages=1).page_texts[0])
+        assert (detection.bank, detection.confidence) == (bank, 1.0)
+
+    def test_priority_breaks_ties_at_lower_confidence(self):
+        detection = detect("BANCO INTER S.A.\nPix enviado: Cp :1-ITAU\nTED Itaú")
+        assert detection.bank == "inter"
+        assert detection.confidence == pytest.approx(1 / 3)
+
+    def test_no_signature_is_none(self):
+        assert detect("Extrato de conta corrente") is None
+
+    def test_unsupported_error_lists_registered_banks(self):
+        with pytest.raises(ValueError, match="Supported banks: Itaú, Nubank, Banco Inter."):
+            detect_bank("nothing to see here")
+
+
+# ──────────────────────────────────────────────
+# Registration Tests
+# ──────────────────────────────────────────────
+
+class TestRegister:
+    def test_new_bank_is_detected_and_parsed(self, registry):
+        register(Bank("c6", "C6 Bank", ("C6 Bank",), priority=25, parser=_NullParser))
+        assert detect("Extrato C6 BANK - Pix para Itaú").bank == "c6"
+        assert detect("Banco Inter, conta no C6 Bank").bank == "c6"
+        assert isinstance(new_parser("c6"), _NullParser)
+        assert list(iter_transactions("c6", ["01/02/2026 PIX -1,00"])) == []
+        with pytest.raises(ValueError, match="C6 Bank"):
+            detect_bank("nothing to see here")
+
+    def test_unknown_parser_raises(self):
+        with pytest.raises(ValueError, match="No parser for bank"):
+            new_parser("bradesco")
+
+    def test_only_itau_needs_the_full_page(self):
+        assert {name for name, bank in BANKS.items() if not bank.header_conclusive} == {"itau"}
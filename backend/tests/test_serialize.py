@@ -0,0 +1,52 @@
+"""Tests for the compact Transaction model and bulk JSON serializer."""
+
+import json
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app import serialize
+from app.models import Transaction
+
+TRANSACTIONS = [
+    Transaction("18/02/2026", 'PIX TRANSF JOÃO "ZÉ"\\01', -3000, "PIX", "withdrawal", "itau"),
+    Transaction("19/02/2026", "Transferência recebida", 188312, "PIX", "deposit", "nubank"),
+]
+
+
+class TestTransactionModel:
+    def test_is_slotted(self):
+        assert not hasattr(TRANSACTIONS[0], "__dict__")
+
+    def test_to_dict_field_order(self):
+        assert list(TRANSACTIONS[0].to_dict()) == [
+            "date", "description", "amount", "amount_cents",
+            "transaction_type", "operation_type", "bank",
+        ]
+
+
+class TestSerializer:
+    def test_transactions_match_dict_encoding(self):
+        encoded = serialize.dumps_transactions(TRANSACTIONS)
+        assert json.loads(encoded) == [t.to_dict() for t in TRANSACTIONS]
+        assert "JOÃO".encode("utf-8") in encoded
+
+    def test_matches_stdlib_bytes(self):
+        expected = json.dumps(
+            [t.to_dict() for t in TRANSACTIONS], ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+        assert serialize.dumps_transactions(TRANSACTIONS) == expected
+
+    def test_result_shape(self):
+        assert json.loads(serialize.dumps_result(TRANSACTIONS)) == {
+            "bank": "itau",
+            "transactions": [t.to_dict() for t in TRANSACTIONS],
+            "total_transactions": 2,
+        }
+        assert json.loads(serialize.dumps_result([]))["bank"] == "unknown"
+
+    def test_dumps_accepts_transactions(self):
+        event = {"event": "transaction", "transaction": TRANSACTIONS[1]}
+        assert json.loads(serialize.dumps(event))["transaction"]["amount"] == 1883.12
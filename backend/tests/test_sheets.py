@@ -0,0 +1,247 @@
+"""Tests for the Google Sheets exporter, against a local fake Sheets API."""
+
+import json
+import os
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.export import SheetsClient, SheetsError
+from app.export.formats import HEADER
+from app.export.sheets import ExportStats
+from app.models import Transaction
+
+
+class _FakeSheetsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is visible
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, payload: dict, headers: dict | None = None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        fake = self.server.fake
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        fake.connections.add(self.client_address)
+        fake.calls.append(self.path)
+
+        if self.headers.get("Authorization") != "Bearer good-token":
+            return self._reply(401, {"error": {"message": "Invalid credentials"}})
+        if fake.failures:
+            status = fake.failures.pop(0)
+            return self._reply(status, {"error": {"message": "Quota exceeded"}}, {"Retry-After": "0"})
+
+        path = urlparse(self.path).path
+        if path.endswith(":batchUpdate"):
+            title = body["requests"][0]["addSheet"]["properties"]["title"]
+            if title in fake.sheets:
+                return self._reply(400, {"error": {"message": f'A sheet with the name "{title}" already exists.'}})
+            fake.sheets[title] = []
+            return self._reply(200, {"replies": [{}]})
+
+        match = re.fullmatch(r"/v4/spreadsheets/[^/]+/values/(.+):append", path)
+        name = unquote(match.group(1)).rsplit("!", 1)[0]
+        quoted = re.fullmatch(r"'((?:[^']|'')+)'", name)
+        if quoted is not None:
+            sheet = quoted.group(1).replace("''", "'")
+        elif re.fullmatch(r"\w+", name):
+            sheet = name
+        else:
+            return self._reply(400, {"error": {"message": f"Unable to parse range: {name}!A1"}})
+        fake.sheets[sheet].extend(body["values"])
+        return self._reply(200, {"updates": {"updatedRows": len(body["values"])}})
+
+
+class FakeSheets:
+    """A Sheets API stand-in on localhost recording every call."""
+
+    def __init__(self):
+        self.sheets: dict[str, list[list]] = {}
+        self.calls: list[str] = []
+        self.connections: set = set()
+        self.failures: list[int] = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeSheetsHandler)
+        self.server.fake = self
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fake():
+    server = FakeSheets()
+    yield server
+    server.close()
+
+
+def _transactions(n: int) -> list[Transaction]:
+    return [
+        Transaction("18/02/2026", f"PIX TRANSF {i}", -1000 - i, "PIX", "withdrawal", "itau")
+        for i in range(n)
+    ]
+
+
+# ──────────────────────────────────────────────
+# SheetsClient Tests
+# ──────────────────────────────────────────────
+
+class TestSheetsClient:
+    def test_thousand_rows_take_a_handful_of_calls(self, fake):
+        client = SheetsClient(base_url=fake.url, chunk_rows=500, backoff=0)
+        try:
+            stats = client.export_transactions("good-token", "sheet-id", _transactions(1000))
+        finally:
+            client.close()
+
+        rows = fake.sheets["Transações"]
+        assert rows[0] == HEADER
+        assert rows[1] == ["18/02/2026", "PIX TRANSF 0", -10.0, "PIX", "withdrawal", "itau"]
+        assert len(rows) == 1001
+        # addSheet + ceil(1001 / 500) appends, all over one kept-alive connection
+        assert stats.requests == len(fake.calls) == 4
+        assert len(fake.connections) == 1
+        assert stats.rows == 1000 and stats.rows_per_second > 0
+
+    def test_existing_sheet_gets_no_second_header(self, fake):
+        client = SheetsClient(base_url=fake.url, backoff=0)
+        try:
+            client.export_transactions("good-token", "sheet-id", _transactions(2))
+            client.export_transactions("good-token", "sheet-id", _transactions(3))
+        finally:
+            client.close()
+        assert len(fake.sheets["Transações"]) == 1 + 2 + 3
+
+    @pytest.mark.parametrize("sheet", ["Extrato Jan", "Itaú's 2026"])
+    def test_sheet_names_are_quoted_in_ranges(self, fake, sheet):
+        client = SheetsClient(base_url=fake.url, backoff=0)
+        try:
+            client.export_transactions("good-token", "sheet-id", _transactions(2), sheet=sheet)
+        finally:
+            client.close()
+        rows = fake.sheets[sheet]
+        assert rows[0] == HEADER and len(rows) == 3
+
+    def test_rate_limits_are_retried(self, fake):
+        fake.failures = [429, 429]
+        client = SheetsClient(base_url=fake.url, backoff=0)
+        try:
+            stats = client.export_transactions("good-token", "sheet-id", _transactions(5))
+        finally:
+            client.close()
+        assert stats.retries == 2
+        assert len(fake.sheets["Transações"]) == 6
+
+    def test_server_errors_are_not_retried_on_writes(self, fake):
+        # A 5xx on an append may come after the rows were written
+        client = SheetsClient(base_url=fake.url, backoff=0)
+        try:
+            client.ensure_sheet("good-token", "sheet-id", "Transações", ExportStats())
+            fake.failures = [503]
+            with pytest.raises(SheetsError) as exc:
+                client.append_rows("good-token", "sheet-id", "Transações", [["row"]])
+        finally:
+            client.close()
+        assert exc.value.status_code == 503
+        assert len(fake.calls) == 2
+
+    def test_writes_are_resent_only_if_never_sent(self):
+        import httpx
+
+        failures = [httpx.ConnectError("refused"), httpx.ReadTimeout("no reply")]
+
+        def handler(request):
+            if failures:
+                raise failures.pop(0)
+            return httpx.Response(200, json={"replies": [{}]})
+
+        client = SheetsClient(backoff=0, transport=httpx.MockTransport(handler))
+        try:
+            with pytest.raises(SheetsError, match="no reply"):
+                client.export_transactions("good-token", "sheet-id", _transactions(1))
+        finally:
+            client.close()
+        assert failures == []
+
+    def test_gives_up_after_max_retries(self, fake):
+        fake.failures = [429] * 10
+        client = SheetsClient(base_url=fake.url, max_retries=2, backoff=0)
+        try:
+            with pytest.raises(SheetsError) as exc:
+                client.export_transactions("good-token", "sheet-id", _transactions(1))
+        finally:
+            client.close()
+        assert exc.value.status_code == 429
+        assert len(fake.calls) == 3
+
+    def test_auth_errors_are_not_retried(self, fake):
+        client = SheetsClient(base_url=fake.url, backoff=0)
+        try:
+            with pytest.raises(SheetsError) as exc:
+                client.export_transactions("bad-token", "sheet-id", _transactions(1))
+        finally:
+            client.close()
+        assert exc.value.status_code == 401
+        assert len(fake.calls) == 1
+
+
+# ──────────────────────────────────────────────
+# API Tests
+# ──────────────────────────────────────────────
+
+class TestExportEndpoint:
+    PAYLOAD = {
+        "spreadsheet_id": "sheet-id",
+        "transactions": [{
+            "date": "18/02/2026", "description": "PIX TRANSF FULANO", "amount": -30.0,
+            "amount_cents": -3000, "transaction_type": "PIX",
+            "operation_type": "withdrawal", "bank": "itau",
+        }],
+    }
+
+    def test_exports_parse_output(self, fake, monkeypatch):
+        monkeypatch.setattr(main, "sheets", SheetsClient(base_url=fake.url, backoff=0))
+        client = TestClient(main.app)
+        response = client.post(
+            "/api/export/sheets", json=self.PAYLOAD,
+            headers={"Authorization": "Bearer good-token"},
+        )
+        main.sheets.close()
+        assert response.status_code == 200
+        assert response.json()["rows"] == 1
+        assert fake.sheets["Transações"][1][2] == -30.0
+
+    def test_requires_token(self):
+        client = TestClient(main.app)
+        assert client.post("/api/export/sheets", json=self.PAYLOAD).status_code == 401
+
+    def test_rejected_token_is_passed_through(self, fake, monkeypatch):
+        monkeypatch.setattr(main, "sheets", SheetsClient(base_url=fake.url, backoff=0))
+        client = TestClient(main.app)
+        response = client.post(
+            "/api/export/sheets", json=self.PAYLOAD,
+            headers={"Authorization": "Bearer bad-token"},
+        )
+        main.sheets.close()
+        assert response.status_code == 401
@@ -0,0 +1,89 @@
+"""Tests for page-parallel extraction of long statements."""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.config import Settings
+from app.engine import ExtractionEngine
+from app.parsers import extract_pages, parse_pdf
+from app.split import page_ranges, parse_split
+from benchmarks.synthetic import generate
+
+
+class TestPageRanges:
+    def test_ranges_are_contiguous_and_balanced(self):
+        assert list(page_ranges(10, 3)) == [(0, 4), (4, 7), (7, 10)]
+
+    def test_never_more_chunks_than_pages(self):
+        assert list(page_ranges(2, 8)) == [(0, 1), (1, 2)]
+
+
+class TestExtractPages:
+    def test_chunks_join_to_the_whole_document(self):
+        pdf = generate("inter", pages=5).to_pdf()
+        bank, head = extract_pages(pdf, 0, 2)
+        rest_bank, tail = extract_pages(pdf, 2, 5)
+        assert (bank, rest_bank) == ("inter", None)
+        assert len(head) == 2 and len(tail) == 3
+
+
+class TestParseSplit:
+    @pytest.mark.parametrize("bank", ["itau", "nubank", "inter"])
+    def test_matches_sequential_parse(self, bank):
+        # Date headers and section flags carry across chunk boundaries
+        statement = generate(bank, pages=7)
+        pdf = statement.to_pdf()
+        engine = ExtractionEngine(max_workers=0, timeout=30)
+        transactions = asyncio.run(parse_split(engine, pdf, split_pages=2, chunks=3))
+        assert transactions == statement.expected == parse_pdf(pdf)
+
+    def test_short_statement_is_parsed_in_one_job(self, monkeypatch):
+        statement = generate("nubank", pages=2)
+        engine = ExtractionEngine(max_workers=0, timeout=30)
+
+        async def no_map(fn, arg_tuples, deadline=None):
+            raise AssertionError("short statements must not be split")
+
+        monkeypatch.setattr(engine, "map", no_map)
+        transactions = asyncio.run(parse_split(engine, statement.to_pdf(), split_pages=2, chunks=4))
+        assert transactions == statement.expected
+
+    def test_chunks_run_in_worker_processes(self, tmp_path):
+        statement = generate("itau", pages=6)
+        path = tmp_path / "extrato.pdf"
+        path.write_bytes(statement.to_pdf())
+        engine = ExtractionEngine(max_workers=2, timeout=60)
+        try:
+            transactions = asyncio.run(parse_split(engine, str(path), split_pages=2, chunks=2))
+        finally:
+            engine.shutdown()
+        assert transactions == statement.expected
+
+
+class TestSplitEndpoint:
+    def test_parse_endpoint_splits_long_statements(self, inline_parsing, monkeypatch):
+        monkeypatch.setattr(main, "settings", Settings(split_pages=2))
+        calls = []
+        map_chunks = main.engine.map
+
+        async def counting_map(fn, arg_tuples, deadline=None):
+            calls.append(len(arg_tuples))
+            return await map_chunks(fn, arg_tuples, deadline)
+
+        monkeypatch.setattr(main.engine, "map", counting_map)
+        statement = generate("inter", pages=4)
+        client = TestClient(main.app)
+        response = client.post("/api/parse", files={"file": ("a.pdf", statement.to_pdf(), "application/pdf")})
+
+        assert response.status_code == 200
+        assert response.json()["total_transactions"] == len(statement.expected)
+        assert calls == [1]  # max_workers=0 still goes through the split path
@@ -0,0 +1,94 @@
+"""Cold-start budget: what importing the app loads, and how long the first
+request takes in a fresh interpreter."""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.engine import ExtractionEngine
+from app.parsers import warm_up
+
+BACKEND = os.path.join(os.path.dirname(__file__), "..")
+
+# Loaded on first use only; the web process may never need them
+HEAVY_MODULES = ("pdfplumber", "pdfminer", "pypdfium2", "httpx", "openpyxl", "pyarrow")
+
+# Seconds, with headroom for slow CI machines: importing FastAPI itself
+# takes ~0.4 s of the ~0.7 s the app measures on one vCPU
+IMPORT_BUDGET = 2.0
+FIRST_REQUEST_BUDGET = 4.0
+
+
+def _run(code: str) -> dict:
+    """Run ``code`` in a fresh interpreter and return the JSON it prints."""
+    completed = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        cwd=BACKEND, capture_output=True, text=True, timeout=60, check=True,
+    )
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+# ──────────────────────────────────────────────
+# Cold Start Tests
+# ──────────────────────────────────────────────
+
+class TestColdStart:
+    def test_import_is_light_and_within_budget(self):
+        result = _run(f"""
+            import json, sys, time
+            started = time.perf_counter()
+            import app.main
+            seconds = time.perf_counter() - started
+            heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+            print(json.dumps({{"seconds": seconds, "heavy": heavy}}))
+        """)
+        assert result["heavy"] == []
+        assert result["seconds"] < IMPORT_BUDGET
+
+    def test_first_request_within_budget(self):
+        result = _run("""
+            import json, time
+            started = time.perf_counter()
+            from app import main
+            from app.engine import ExtractionEngine
+            from benchmarks.synthetic import generate
+            from fastapi.testclient import TestClient
+            pdf = generate("itau", pages=1).to_pdf()
+            main.engine = ExtractionEngine(max_workers=0, timeout=30)
+            response = TestClient(main.app).post(
+                "/api/parse", files={"file": ("a.pdf", pdf, "application/pdf")}
+            )
+            seconds = time.perf_counter() - started
+            print(json.dumps({"seconds": seconds, "status": response.status_code}))
+        """)
+        assert result["status"] == 200
+        assert result["seconds"] < FIRST_REQUEST_BUDGET
+
+
+# ──────────────────────────────────────────────
+# Warm-up Tests
+# ──────────────────────────────────────────────
+
+class TestWarmUp:
+    def test_workers_are_warm_before_the_first_job(self):
+        engine = ExtractionEngine(max_workers=1, timeout=30)
+
+        async def scenario():
+            await engine.start(warm_up, "pdfplumber")
+            return await engine.run(eval, "'pdfminer.fontmetrics' in __import__('sys').modules")
+
+        try:
+            assert asyncio.run(scenario()) is True
+        finally:
+            engine.shutdown()
+
+    def test_inline_engine_warms_up_in_process(self):
+        engine = ExtractionEngine(max_workers=0, timeout=30)
+        asyncio.run(engine.start(warm_up, "pdfium"))
+        assert "pypdfium2" in sys.modules
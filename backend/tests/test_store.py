@@ -0,0 +1,232 @@
+"""Tests for the deduplicating transaction store and /api/ingest."""
+
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.cache import ResultCache
+from app.models import Transaction
+from app.store import Filters, TransactionStore, fingerprint, iso_date
+from benchmarks.synthetic import generate
+
+
+def _tx(date: str, cents: int = -500, description: str = "CAFE") -> Transaction:
+    return Transaction(date, description, cents, "OUTRO", "withdrawal", "itau")
+
+
+def _ingest(store, account, digest, pages) -> list[Transaction]:
+    ingestion = store.ingest(account, digest)
+    for page in pages:
+        ingestion.add(page)
+    return ingestion.finish()
+
+
+@pytest.fixture
+def store(tmp_path):
+    transactions = TransactionStore(str(tmp_path / "store.db"))
+    yield transactions
+    transactions.close()
+
+
+# ──────────────────────────────────────────────
+# Fingerprint Tests
+# ──────────────────────────────────────────────
+
+class TestFingerprint:
+    def test_is_stable_and_ordinal_sensitive(self):
+        assert fingerprint(_tx("05/01/2026"), 0) == fingerprint(_tx("05/01/2026"), 0)
+        assert fingerprint(_tx("05/01/2026"), 0) != fingerprint(_tx("05/01/2026"), 1)
+        assert fingerprint(_tx("05/01/2026"), 0) != fingerprint(_tx("06/01/2026"), 0)
+        assert len(fingerprint(_tx("05/01/2026"), 0)) == 16
+
+    def test_iso_date(self):
+        assert iso_date("31/01/2026") == "2026-01-31"
+
+
+# ──────────────────────────────────────────────
+# TransactionStore Tests
+# ──────────────────────────────────────────────
+
+class TestTransactionStore:
+    def test_overlapping_statements_only_add_new_rows(self, store):
+        january = [[_tx("01/01/2026"), _tx("15/01/2026")], [_tx("31/01/2026")]]
+        assert len(_ingest(store, "me", "jan", january)) == 3
+
+        overlap = [[_tx("15/01/2026"), _tx("31/01/2026")], [_tx("01/02/2026")]]
+        assert _ingest(store, "me", "mid", overlap) == [_tx("01/02/2026")]
+
+    def test_identical_rows_on_one_day_are_kept_apart(self, store):
+        assert len(_ingest(store, "me", "a", [[_tx("05/01/2026"), _tx("05/01/2026")]])) == 2
+        # The second statement has a third coffee that day
+        again = [[_tx("05/01/2026"), _tx("05/01/2026"), _tx("05/01/2026")]]
+        assert len(_ingest(store, "me", "b", again)) == 1
+
+    def test_accounts_are_separate(self, store):
+        _ingest(store, "me", "a", [[_tx("05/01/2026")]])
+        assert len(_ingest(store, "you", "a", [[_tx("05/01/2026")]])) == 1
+
+    def test_rows_inside_an_earlier_statement_dates_are_kept(self, store):
+        # A statement need not list every row between its first and last days
+        _ingest(store, "me", "jan", [[_tx("01/01/2026")], [_tx("31/01/2026")]])
+
+        ingestion = store.ingest("me", "mid")
+        ingestion.add([_tx("10/01/2026"), _tx("20/01/2026")])
+        ingestion.add([_tx("31/01/2026"), _tx("02/02/2026")])
+        assert ingestion.finish() == [_tx("10/01/2026"), _tx("20/01/2026"), _tx("02/02/2026")]
+        assert ingestion.total_transactions == 4
+
+    def test_other_banks_do_not_cover_pages(self, store):
+        _ingest(store, "me", "jan", [[_tx("01/01/2026"), _tx("31/01/2026")]])
+        nubank = Transaction("10/01/2026", "CAFE", -500, "OUTRO", "withdrawal", "nubank")
+        assert _ingest(store, "me", "nu", [[nubank]]) == [nubank]
+
+    def test_nothing_is_written_until_finish(self, store):
+        store.ingest("me", "a").add([_tx("05/01/2026")])
+        assert store.statement("me", "a") is None
+        assert len(_ingest(store, "me", "b", [[_tx("05/01/2026")]])) == 1
+
+    def test_statement_is_recorded(self, store):
+        _ingest(store, "me", "jan", [[_tx("01/01/2026"), _tx("31/01/2026")]])
+        assert store.statement("me", "jan") == {
+            "bank": "itau", "first_date": "2026-01-01", "last_date": "2026-01-31",
+            "total_transactions": 2, "new_transactions": 2,
+        }
+
+
+# ──────────────────────────────────────────────
+# Query Tests
+# ──────────────────────────────────────────────
+
+class TestQuery:
+    @pytest.fixture
+    def history(self, store):
+        statement = generate("itau", pages=3)
+        _ingest(store, "me", "a", [statement.expected])
+        return statement.expected
+
+    def _all_pages(self, store, **kwargs) -> list[Transaction]:
+        rows, cursor = store.query("me", limit=7, **kwargs)
+        while cursor is not None:
+            page, cursor = store.query("me", limit=7, cursor=cursor, **kwargs)
+            rows.extend(page)
+        return rows
+
+    @pytest.mark.parametrize("sort", ["date", "amount"])
+    @pytest.mark.parametrize("descending", [False, True])
+    def test_pages_cover_every_row_once_in_order(self, store, history, sort, descending):
+        rows = self._all_pages(store, sort=sort, descending=descending)
+        assert sorted(map(repr, rows)) == sorted(map(repr, history))
+        keys = [iso_date(tx.date) if sort == "date" else tx.amount_cents for tx in rows]
+        assert keys == sorted(keys, reverse=descending)
+
+    def test_filters(self, store, history):
+        filters = Filters(
+            transaction_type="PIX", date_from="2026-01-03", date_to="2026-01-10",
+            max_amount_cents=-1000, search="pix",
+        )
+        expected = [
+            tx for tx in history
+            if tx.transaction_type == "PIX" and "2026-01-03" <= iso_date(tx.date) <= "2026-01-10"
+            and tx.amount_cents <= -1000
+        ]
+        assert expected
+        assert self._all_pages(store, filters=filters) == expected
+
+    def test_search_treats_wildcards_literally(self, store, history):
+        assert store.query("me", Filters(search="%"))[0] == []
+
+    def test_tampered_cursor_is_rejected(self, store, history):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            store.query("me", cursor="not-a-cursor")
+
+    def test_summary(self, store, history):
+        groups = {g["key"]: g for g in store.summary("me", "operation_type")}
+        deposits = [tx.amount_cents for tx in history if tx.amount_cents >= 0]
+        assert groups["deposit"]["count"] == len(deposits)
+        assert groups["deposit"]["total_cents"] == sum(deposits)
+        assert groups["withdrawal"]["deposits_cents"] == 0
+        months = sorted({iso_date(tx.date)[:7] for tx in history})
+        assert [g["key"] for g in store.summary("me", "month")] == months
+
+
+# ──────────────────────────────────────────────
+# API Tests
+# ──────────────────────────────────────────────
+
+class TestIngestEndpoint:
+    @pytest.fixture(autouse=True)
+    def setup(self, inline_parsing, monkeypatch, tmp_path):
+        monkeypatch.setattr(main, "store", TransactionStore(str(tmp_path / "store.db")))
+
+    def _ingest(self, client, *statements, account="me"):
+        files = [
+            ("files", (f"{i}.pdf", statement.to_pdf(), "application/pdf"))
+            for i, statement in enumerate(statements)
+        ]
+        response = client.post(f"/api/ingest?account={account}", files=files)
+        assert response.status_code == 200
+        return response.json()["results"]
+
+    def test_overlapping_uploads_return_only_new_rows(self):
+        client = TestClient(main.app)
+        short, long = generate("itau", pages=3), generate("itau", pages=5)
+
+        first, = self._ingest(client, short)
+        assert first["new_transactions"] == len(short.expected)
+
+        second, = self._ingest(client, long)
+        new = long.expected[len(short.expected):]
+        assert second["new_transactions"] == len(new)
+        assert second["duplicates"] == len(short.expected)
+        assert [row["description"] for row in second["transactions"]] == [tx.description for tx in new]
+
+    def test_reupload_is_not_parsed_again(self, monkeypatch):
+        client = TestClient(main.app)
+        statement = generate("nubank", pages=1)
+        self._ingest(client, statement)
+
+        monkeypatch.setattr(main, "cache", ResultCache())  # a re-parse would miss it
+        again, = self._ingest(client, statement)
+        assert again["already_ingested"] is True
+        assert again["transactions"] == []
+        assert main.cache.stats()["misses"] == 0
+
+    def test_files_in_one_request_are_deduplicated(self):
+        client = TestClient(main.app)
+        results = self._ingest(client, generate("inter", pages=1), generate("inter", pages=2))
+        assert results[1]["duplicates"] == results[0]["new_transactions"]
+
+    def test_bad_files_are_reported_per_file(self):
+        client = TestClient(main.app)
+        files = [
+            ("files", ("notes.txt", b"x", "text/plain")),
+            ("files", ("broken.pdf", b"%PDF-1.4 broken", "application/pdf")),
+        ]
+        results = client.post("/api/ingest", files=files).json()["results"]
+        assert [r["success"] for r in results] == [False, False]
+
+    def test_stored_transactions_are_paged_and_summarized(self):
+        client = TestClient(main.app)
+        statement = generate("inter", pages=2)
+        self._ingest(client, statement)
+
+        first = client.get("/api/transactions?account=me&limit=5&sort=amount&order=desc").json()
+        assert len(first["transactions"]) == 5
+        second = client.get(
+            f"/api/transactions?account=me&limit=5&sort=amount&order=desc&cursor={first['next_cursor']}"
+        ).json()
+        amounts = [row["amount_cents"] for row in first["transactions"] + second["transactions"]]
+        assert amounts == sorted((tx.amount_cents for tx in statement.expected), reverse=True)[:10]
+
+        summary = client.get("/api/transactions/summary?account=me&group_by=bank").json()
+        assert summary["groups"][0]["count"] == len(statement.expected)
+
+        assert client.get("/api/transactions?account=me&cursor=x").status_code == 400
+        assert client.get("/api/transactions?date_from=tomorrow").status_code == 422
@@ -0,0 +1,88 @@
+"""Tests for the streaming /api/parse/stream endpoint."""
+
+import json
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.cache import ResultCache
+from app.models import Transaction
+
+
+def _tx(description: str) -> Transaction:
+    return Transaction("01/02/2026", description, -100, "PIX", "withdrawal", "inter")
+
+
+async def _fake_stream(fn, contents):
+    if contents == b"%PDF-bad":
+        raise ValueError("Could not detect bank from PDF content.")
+    yield {"event": "start", "bank": "inter", "total_pages": 2}
+    yield {"event": "page", "page": 1, "total_pages": 2, "transactions": [_tx("a"), _tx("b")]}
+    yield {"event": "page", "page": 2, "total_pages": 2, "transactions": [_tx("c")]}
+
+
+class TestStreamEndpoint:
+    def setup_method(self):
+        self.client = TestClient(main.app)
+
+    def _post(self, monkeypatch, files, **params):
+        monkeypatch.setattr(main.engine, "stream", _fake_stream)
+        monkeypatch.setattr(main, "cache", ResultCache())
+        return self.client.post("/api/parse/stream", files=files, params=params)
+
+    def test_ndjson_events_in_page_order(self, monkeypatch):
+        response = self._post(monkeypatch, [("files", ("a.pdf", b"%PDF-data", "application/pdf"))])
+
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert [e["event"] for e in events] == [
+            "start", "transaction", "transaction", "progress", "transaction", "progress", "end",
+        ]
+        assert events[3] == {"event": "progress", "file_name": "a.pdf", "pages_done": 1, "total_pages": 2}
+        assert events[-1]["total_transactions"] == 3
+
+    def test_completed_stream_fills_cache(self, monkeypatch):
+        files = [("files", ("a.pdf", b"%PDF-data", "application/pdf"))]
+        self._post(monkeypatch, files)
+        replay = self.client.post("/api/parse/stream", files=files)
+
+        events = [json.loads(line) for line in replay.text.splitlines()]
+        assert [e["transaction"]["description"] for e in events if e["event"] == "transaction"] == ["a", "b", "c"]
+        assert main.cache.stats()["hits"] == 1
+
+    def test_sse_format_and_per_file_errors(self, monkeypatch):
+        response = self._post(
+            monkeypatch,
+            [
+                ("files", ("bad.pdf", b"%PDF-bad", "application/pdf")),
+                ("files", ("notes.txt", b"x", "text/plain")),
+            ],
+            format="sse",
+        )
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        blocks = [b for b in response.text.split("\n\n") if b]
+        assert all(b.startswith("event: error\ndata: ") for b in blocks)
+        errors = {json.loads(b.split("data: ", 1)[1])["file_name"] for b in blocks}
+        assert errors == {"bad.pdf", "notes.txt"}
+
+    def test_summary_event_closes_the_stream(self, monkeypatch):
+        files = [("files", ("a.pdf", b"%PDF-data", "application/pdf"))]
+        self._post(monkeypatch, files)
+        # The second file's rows come from the cache, as dicts
+        response = self.client.post(
+            "/api/parse/stream", params={"include": "summary"},
+            files=files + [("files", ("b.pdf", b"%PDF-data", "application/pdf"))],
+        )
+
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert "transaction" not in {e["event"] for e in events}
+        assert events[-1]["event"] == "summary"
+        summary = events[-1]["summary"]
+        assert summary["count"] == 6
+        assert summary["by_bank"][0]["key"] == "inter"
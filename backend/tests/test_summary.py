@@ -0,0 +1,137 @@
+"""Tests for server-side summaries of parsed transactions."""
+
+import os
+import sys
+from collections import defaultdict
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.store import iso_date
+from app.summary import counterparty, summarize
+from benchmarks.synthetic import generate
+
+
+def _naive(transactions, key_of) -> dict:
+    """key -> [count, total] the slow, obvious way."""
+    totals = defaultdict(lambda: [0, 0])
+    for tx in transactions:
+        totals[key_of(tx)][0] += 1
+        totals[key_of(tx)][1] += tx.amount_cents
+    return dict(totals)
+
+
+@pytest.fixture(scope="module")
+def transactions():
+    return [tx for bank in ("itau", "nubank", "inter") for tx in generate(bank, pages=3).expected]
+
+
+# ──────────────────────────────────────────────
+# Counterparty Tests
+# ──────────────────────────────────────────────
+
+class TestCounterparty:
+    @pytest.mark.parametrize("description", [
+        "PIX QRS PADARIA BOM PAO 02/01",
+        "COMPRA CARTAO PADARIA BOM PAO",
+        "Compra no débito - PADARIA BOM PAO",
+        "Pix recebido: Cp :60701190-PADARIA BOM PAO",
+    ])
+    def test_bank_wording_is_dropped(self, description):
+        assert counterparty(description) == "PADARIA BOM PAO"
+
+    def test_plain_descriptions_are_kept(self):
+        assert counterparty("TAR PACOTE ITAU") == "TAR PACOTE ITAU"
+        assert counterparty("Pagamento de fatura") == "Pagamento de fatura"
+
+
+# ──────────────────────────────────────────────
+# Summarize Tests
+# ──────────────────────────────────────────────
+
+class TestSummarize:
+    @pytest.mark.parametrize("group, key_of", [
+        ("by_bank", lambda tx: tx.bank),
+        ("by_month", lambda tx: iso_date(tx.date)[:7]),
+        ("by_transaction_type", lambda tx: tx.transaction_type),
+        ("by_operation_type", lambda tx: tx.operation_type),
+    ])
+    def test_groups_match_a_naive_loop(self, transactions, group, key_of):
+        summary = summarize(transactions)
+        expected = _naive(transactions, key_of)
+        assert {g["key"]: [g["count"], g["total_cents"]] for g in summary[group]} == expected
+        assert [g["key"] for g in summary[group]] == sorted(expected)
+
+    def test_totals(self, transactions):
+        summary = summarize(transactions)
+        assert summary["count"] == len(transactions)
+        assert summary["deposits_cents"] == sum(tx.amount_cents for tx in transactions if tx.amount_cents > 0)
+        assert summary["total_cents"] == sum(tx.amount_cents for tx in transactions)
+
+    def test_daily_running_balance(self, transactions):
+        daily = summarize(transactions)["daily"]
+        assert [day["date"] for day in daily] == sorted({iso_date(tx.date) for tx in transactions})
+        assert daily[-1]["balance_cents"] == sum(tx.amount_cents for tx in transactions)
+        assert daily[1]["balance_cents"] == daily[0]["net_cents"] + daily[1]["net_cents"]
+
+    def test_top_counterparties_by_money_moved(self, transactions):
+        top = summarize(transactions, top=3)["top_counterparties"]
+        moved = [g["deposits_cents"] - g["withdrawals_cents"] for g in top]
+        assert len(top) == 3
+        assert moved == sorted(moved, reverse=True)
+
+    def test_empty(self):
+        summary = summarize([])
+        assert summary["count"] == summary["total_cents"] == 0
+        assert summary["by_bank"] == summary["daily"] == summary["top_counterparties"] == []
+
+
+# ──────────────────────────────────────────────
+# API Tests
+# ──────────────────────────────────────────────
+
+class TestIncludeSummary:
+    @pytest.fixture(autouse=True)
+    def setup(self, inline_parsing):
+        self.client = TestClient(main.app)
+
+    def _parse(self, statement, include):
+        files = {"file": ("a.pdf", statement.to_pdf(), "application/pdf")}
+        response = self.client.post(f"/api/parse?include={include}", files=files)
+        assert response.status_code == 200
+        return response.json()
+
+    def test_summary_replaces_or_joins_the_rows(self):
+        statement = generate("itau", pages=2)
+        assert "summary" not in self._parse(statement, "transactions")
+
+        # The second and third requests are cache hits
+        full = self._parse(statement, "all")
+        assert len(full["transactions"]) == len(statement.expected)
+        assert full["summary"]["count"] == len(statement.expected)
+
+        only = self._parse(statement, "summary")
+        assert "transactions" not in only
+        assert only["summary"] == full["summary"]
+        assert only["bank"] == "itau"
+        assert only["total_transactions"] == len(statement.expected)
+
+    def test_batch_summarizes_all_files_together(self):
+        statements = [generate("nubank", pages=1), generate("inter", pages=1)]
+        files = [
+            ("files", (f"{i}.pdf", statement.to_pdf(), "application/pdf"))
+            for i, statement in enumerate(statements)
+        ]
+        files.append(("files", ("notes.txt", b"x", "text/plain")))
+        data = self.client.post("/api/parse/batch?include=summary", files=files).json()
+
+        assert [r["success"] for r in data["results"]] == [True, True, False]
+        assert "transactions" not in data["results"][0]
+        assert data["results"][1]["summary"]["by_bank"][0]["key"] == "inter"
+        assert [g["key"] for g in data["summary"]["by_bank"]] == ["inter", "nubank"]
+        assert data["summary"]["count"] == sum(len(s.expected) for s in statements)
@@ -0,0 +1,87 @@
+"""Tests for the synthetic statement generators and benchmark comparison."""
+
+import os
+import sys
+from collections import Counter
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.parsers import detect_bank, iter_transactions, parse_pdf
+from benchmarks import load
+from benchmarks.run import compare
+from benchmarks.synthetic import BANKS, LINES_PER_PAGE, format_brl, generate
+
+
+# ──────────────────────────────────────────────
+# Generator Tests
+# ──────────────────────────────────────────────
+
+class TestSyntheticStatements:
+    @pytest.mark.parametrize("bank", BANKS)
+    def test_text_parses_to_expected(self, bank):
+        statement = generate(bank, pages=4)
+        assert len(statement.pages) == 4
+        assert all(len(lines) <= LINES_PER_PAGE for lines in statement.pages)
+        assert detect_bank(statement.text) == bank
+        assert list(iter_transactions(bank, statement.page_texts)) == statement.expected
+
+    @pytest.mark.parametrize("bank", BANKS)
+    def test_pdf_parses_to_expected(self, bank):
+        statement = generate(bank, pages=2)
+        assert parse_pdf(statement.to_pdf()) == statement.expected
+
+    def test_generation_is_deterministic(self):
+        assert generate("itau", 2).pages == generate("itau", 2).pages
+        assert generate("itau", 2, seed=1).pages != generate("itau", 2).pages
+
+    def test_format_brl(self):
+        assert format_brl(188312) == "1.883,12"
+        assert format_brl(-5) == "-0,05"
+
+    def test_rejects_unknown_bank(self):
+        with pytest.raises(ValueError):
+            generate("bradesco", 1)
+
+
+# ──────────────────────────────────────────────
+# Comparison Tests
+# ──────────────────────────────────────────────
+
+class TestCompare:
+    def test_flags_only_regressions_over_threshold(self):
+        baseline = [{"bank": "itau", "pages": 1, "parse_s": 1.0, "total_s": 1.0}]
+        results = [{"bank": "itau", "pages": 1, "parse_s": 1.2, "total_s": 1.5}]
+        regressions = compare(results, baseline, threshold=0.25)
+        assert len(regressions) == 1
+        assert "total_s" in regressions[0]
+
+
+# ──────────────────────────────────────────────
+# Load Test Tests
+# ──────────────────────────────────────────────
+
+class TestLoadReport:
+    def test_percentile_is_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+        assert load.percentile(values, 50) == 50
+        assert load.percentile(values, 99) == 99
+        assert load.percentile([7.0], 95) == 7
+        assert load.percentile([], 50) == 0
+
+    def test_summarize_counts_non_200_as_errors(self):
+        statuses = Counter({"200": 8, "503": 1, "ReadTimeout": 1})
+        row = load.summarize([0.1] * 8, statuses, seconds=2.0)
+        assert row["requests"] == 10
+        assert row["error_rate"] == 0.2
+        assert row["rps"] == 4
+        assert row["p95_ms"] == 100
+
+    def test_compare_flags_throughput_and_latency(self):
+        baseline = [{"workers": 1, "concurrency": 4, "rps": 10.0, "p95_ms": 100.0, "error_rate": 0.0}]
+        same = [{"workers": 1, "concurrency": 4, "rps": 9.0, "p95_ms": 110.0, "error_rate": 0.0}]
+        worse = [{"workers": 1, "concurrency": 4, "rps": 5.0, "p95_ms": 200.0, "error_rate": 0.5}]
+        assert load.compare(same, baseline, threshold=0.25) == []
+        assert len(load.compare(worse, baseline, threshold=0.25)) == 3
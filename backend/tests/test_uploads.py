@@ -0,0 +1,220 @@
+"""Tests for upload validation, size limits and spooling."""
+
+import asyncio
+import io
+import os
+import sys
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi import FastAPI, Request, UploadFile
+from fastapi.testclient import TestClient
+
+from app import main
+from app.cache import ResultCache, cache_key, digest_cache_key
+from app.config import Settings
+from app.uploads import BodyLimit, SpooledUpload, UploadRejected, receive_uploads
+from benchmarks.synthetic import generate
+
+_BOUNDARY = "test-boundary"
+_CONTENT_TYPE = f"multipart/form-data; boundary={_BOUNDARY}"
+
+
+def _form(*files: tuple[str, bytes], field: str = "files") -> bytes:
+    body = io.BytesIO()
+    for name, data in files:
+        body.write(
+            f'--{_BOUNDARY}\r\nContent-Disposition: form-data; name="{field}"; filename="{name}"\r\n'
+            "Content-Type: application/pdf\r\n\r\n".encode()
+        )
+        body.write(data + b"\r\n")
+    body.write(f"--{_BOUNDARY}--\r\n".encode())
+    return body.getvalue()
+
+
+async def _chunks(body: bytes, size: int = 64 * 1024, read: list | None = None):
+    for start in range(0, len(body), size):
+        if read is not None:
+            read.append(start)
+        yield body[start:start + size]
+
+
+def _receive(body: bytes, max_files: int = 10, max_bytes: int = 1024 * 1024, spool_bytes: int = 1024,
+             spool_dir=None, fail_fast: bool = False, read: list | None = None):
+    return asyncio.run(receive_uploads(
+        _CONTENT_TYPE, _chunks(body, read=read), "files", max_files, max_bytes, spool_bytes, spool_dir, fail_fast,
+    ))
+
+
+def _spool(data: bytes, max_bytes: int = 1024 * 1024, spool_bytes: int = 1024, spool_dir=None):
+    upload, = _receive(_form(("a.pdf", data)), 1, max_bytes, spool_bytes, spool_dir, fail_fast=True)
+    return upload
+
+
+# ──────────────────────────────────────────────
+# receive_uploads() Tests
+# ──────────────────────────────────────────────
+
+class TestSpool:
+    def test_small_upload_stays_in_memory(self):
+        upload = _spool(b"%PDF-1.4 small")
+        assert upload.source == b"%PDF-1.4 small"
+        assert upload.path is None
+        assert upload.size == 14
+        assert digest_cache_key(upload.digest, "2") == cache_key(b"%PDF-1.4 small", "2")
+
+    def test_large_upload_goes_to_disk(self, tmp_path):
+        data = b"%PDF-1.4\n" + os.urandom(3 * 1024 * 1024)
+        upload = _spool(data, max_bytes=10 * 1024 * 1024, spool_bytes=1024, spool_dir=str(tmp_path))
+        assert upload.data is None
+        assert os.path.dirname(upload.source) == str(tmp_path)
+        with open(upload.source, "rb") as f:
+            assert f.read() == data
+        assert digest_cache_key(upload.digest, "2") == cache_key(data, "2")
+
+        upload.close()
+        upload.close()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_rejects_non_pdf(self):
+        with pytest.raises(UploadRejected) as exc:
+            _spool(b"PK\x03\x04 a zip file")
+        assert exc.value.status_code == 400
+
+    def test_rejects_empty_file(self):
+        with pytest.raises(UploadRejected) as exc:
+            _spool(b"")
+        assert exc.value.detail == "Empty file."
+
+    def test_oversized_upload_leaves_no_spool_file(self, tmp_path):
+        data = b"%PDF-1.4\n" + b"x" * (3 * 1024 * 1024)
+        with pytest.raises(UploadRejected) as exc:
+            _spool(data, max_bytes=2 * 1024 * 1024, spool_dir=str(tmp_path))
+        assert exc.value.status_code == 413
+        assert list(tmp_path.iterdir()) == []
+
+    def test_refused_file_stops_the_read(self, tmp_path):
+        body = _form(("a.pdf", b"<html>" + b"x" * (3 * 1024 * 1024)))
+        read = []
+        with pytest.raises(UploadRejected) as exc:
+            _receive(body, spool_dir=str(tmp_path), fail_fast=True, read=read)
+        assert exc.value.detail == "File is not a PDF."
+        assert len(read) == 1
+        assert list(tmp_path.iterdir()) == []
+
+    def test_oversized_file_is_refused_while_streaming(self, tmp_path):
+        body = _form(("a.pdf", b"%PDF-1.4\n" + b"x" * (8 * 1024 * 1024)))
+        read = []
+        with pytest.raises(UploadRejected) as exc:
+            _receive(body, max_bytes=1024 * 1024, spool_dir=str(tmp_path), fail_fast=True, read=read)
+        assert exc.value.status_code == 413
+        assert len(read) < len(body) // (64 * 1024) // 4
+        assert list(tmp_path.iterdir()) == []
+
+    def test_each_file_is_read_or_refused_on_its_own(self, tmp_path):
+        big = b"%PDF-1.4\n" + os.urandom(2 * 1024 * 1024)
+        results = _receive(
+            _form(("a.pdf", b"%PDF-1.4 a"), ("b.txt", b"%PDF-1.4 b"), ("c.pdf", b"PK\x03\x04" * 1024),
+                  ("d.pdf", b""), ("e.pdf", big)),
+            max_bytes=4 * 1024 * 1024, spool_dir=str(tmp_path),
+        )
+        assert [r.file_name for r in results] == ["a.pdf", "b.txt", "c.pdf", "d.pdf", "e.pdf"]
+        assert results[0].data == b"%PDF-1.4 a"
+        assert [r.detail for r in results[1:4]] == [
+            "Only PDF files are accepted.", "File is not a PDF.", "Empty file.",
+        ]
+        assert isinstance(results[4], SpooledUpload)
+        assert digest_cache_key(results[4].digest, "2") == cache_key(big, "2")
+        assert list(tmp_path.iterdir()) == [tmp_path / os.path.basename(results[4].path)]
+        results[4].close()
+
+    def test_too_many_files_are_refused(self, tmp_path):
+        body = _form(("a.pdf", b"%PDF-1.4\n" + b"x" * 4096), ("b.pdf", b"%PDF-1.4 b"))
+        with pytest.raises(UploadRejected) as exc:
+            _receive(body, max_files=1, spool_bytes=1024, spool_dir=str(tmp_path))
+        assert exc.value.detail == "At most 1 files per batch."
+        assert list(tmp_path.iterdir()) == []
+
+    def test_other_fields_and_bodies_are_refused(self):
+        with pytest.raises(UploadRejected):
+            _receive(_form(("a.pdf", b"%PDF-1.4"), field="other"))
+        with pytest.raises(UploadRejected):
+            asyncio.run(receive_uploads("application/json", _chunks(b"{}"), "files", 1, 0, 1024))
+
+
+# ──────────────────────────────────────────────
+# BodyLimit Tests
+# ──────────────────────────────────────────────
+
+class TestBodyLimit:
+    def _client(self, max_bytes: int) -> TestClient:
+        app = FastAPI()
+
+        @app.post("/echo")
+        async def echo(file: UploadFile):
+            return {"size": len(await file.read())}
+
+        @app.post("/raw")
+        async def raw(request: Request):
+            return {"size": len(await request.body())}
+
+        app.add_middleware(BodyLimit, max_bytes=max_bytes)
+        return TestClient(app)
+
+    def test_small_body_passes(self):
+        response = self._client(4096).post("/echo", files={"file": ("a.pdf", b"%PDF-1.4", "application/pdf")})
+        assert response.json() == {"size": 8}
+
+    def test_declared_length_is_rejected(self):
+        response = self._client(1024).post("/echo", files={"file": ("a.pdf", b"x" * 4096, "application/pdf")})
+        assert response.status_code == 413
+
+    def test_streamed_body_is_counted(self):
+        def chunks():
+            yield b"x" * 1024
+            yield b"x" * 1024
+
+        response = self._client(1500).post(
+            "/raw", content=chunks(), headers={"content-type": "application/octet-stream"},
+        )
+        assert response.status_code == 413
+
+
+# ──────────────────────────────────────────────
+# API Tests
+# ──────────────────────────────────────────────
+
+class TestUploadLimits:
+    def test_oversized_file_gets_413(self, monkeypatch):
+        monkeypatch.setattr(main, "settings", Settings(max_upload_bytes=1024 * 1024))
+        client = TestClient(main.app)
+        data = b"%PDF-1.4\n" + b"x" * (2 * 1024 * 1024)
+        response = client.post("/api/parse", files={"file": ("a.pdf", data, "application/pdf")})
+        assert response.status_code == 413
+
+    def test_non_pdf_gets_400(self):
+        client = TestClient(main.app)
+        response = client.post("/api/parse", files={"file": ("a.pdf", b"<html>", "application/pdf")})
+        assert response.status_code == 400
+        assert response.json()["detail"] == "File is not a PDF."
+
+    def test_spooled_upload_is_parsed_from_disk(self, inline_parsing, monkeypatch, tmp_path):
+        monkeypatch.setattr(main, "settings", Settings(spool_bytes=1024, spool_dir=str(tmp_path)))
+        statement = generate("nubank", pages=1)
+        client = TestClient(main.app)
+
+        response = client.post("/api/parse", files={"file": ("a.pdf", statement.to_pdf(), "application/pdf")})
+        assert response.status_code == 200
+        assert response.json()["total_transactions"] == len(statement.expected)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_rejected_upload_leaves_no_spool_file(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(main, "settings", Settings(spool_bytes=1024, spool_dir=str(tmp_path)))
+        response = TestClient(main.app).post(
+            "/api/parse", files={"file": ("a.pdf", b"<html>" * 1024, "application/pdf")}
+        )
+        assert response.status_code == 400
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,42 @@
+// Rows of a parse result, and the messages exchanged with the table worker
+// (transactions.worker.ts), which keeps the sorted and filtered view of
+// every row off the main thread.
+
+export interface Transaction {
+	date: string; // DD/MM/YYYY
+	description: string;
+	amount: number;
+	amount_cents: number;
+	transaction_type: string;
+	operation_type: string;
+	bank: string;
+}
+
+export type SortKey = "date" | "amount" | "transaction_type" | "description";
+
+export interface Query {
+	sort: SortKey;
+	descending: boolean;
+	search: string; // description substring, ignoring case and accents
+	operation: string; // "" = any
+	type: string; // "" = any
+}
+
+export type WorkerRequest =
+	| { kind: "reset" }
+	| { kind: "append"; rows: Transaction[] }
+	| { kind: "query"; query: Query };
+
+// ``view`` holds the indexes (in arrival order) of the rows matching the
+// query, in display order. ``resets`` counts the resets seen so far, so
+// a view computed before the latest one can be told apart and dropped.
+export interface WorkerResponse {
+	kind: "view";
+	view: Uint32Array;
+	resets: number;
+}
+
+// Lowercase, without accents: "Débito" and "debito" match each other
+export function searchKey(text: string): string {
+	return text.normalize("NFD").replace(/[\u0300-\u036f]/g, "").toLowerCase();
+}
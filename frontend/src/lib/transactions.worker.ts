@@ -0,0 +1,122 @@
+/// <reference lib="webworker" />
+
+// Sorts and filters the transaction table off the main thread.
+//
+// Rows arrive in chunks as files are parsed and are kept as columns of
+// precomputed keys. Each sort order is an index (row numbers sorted by
+// that key) built once, then kept up to date by sorting only the new
+// chunk and merging it in, so appending never re-sorts everything. A
+// query walks one index and posts back the matching row numbers, which
+// the page uses to render just the rows in view.
+
+import { searchKey, type Query, type SortKey, type Transaction, type WorkerRequest, type WorkerResponse } from "./transactions";
+
+const collator = new Intl.Collator("pt-BR", { sensitivity: "base", numeric: true });
+
+let dates: number[] = []; // YYYYMMDD
+let amounts: number[] = [];
+let types: string[] = [];
+let operations: string[] = [];
+let descriptions: string[] = [];
+let searchKeys: string[] = [];
+let indexes: Partial<Record<SortKey, Uint32Array>> = {};
+let query: Query | null = null;
+let resets = 0;
+
+// Ties keep arrival order, so every sort is stable
+const compare: Record<SortKey, (a: number, b: number) => number> = {
+	date: (a, b) => dates[a] - dates[b] || a - b,
+	amount: (a, b) => amounts[a] - amounts[b] || a - b,
+	transaction_type: (a, b) => collator.compare(types[a], types[b]) || a - b,
+	description: (a, b) => collator.compare(descriptions[a], descriptions[b]) || a - b,
+};
+
+function range(start: number, end: number): Uint32Array {
+	const ids = new Uint32Array(end - start);
+	for (let i = 0; i < ids.length; i++) ids[i] = start + i;
+	return ids;
+}
+
+function merge(left: Uint32Array, right: Uint32Array, cmp: (a: number, b: number) => number): Uint32Array {
+	const out = new Uint32Array(left.length + right.length);
+	let i = 0;
+	let j = 0;
+	let k = 0;
+	while (i < left.length && j < right.length) {
+		out[k++] = cmp(left[i], right[j]) <= 0 ? left[i++] : right[j++];
+	}
+	out.set(left.subarray(i), k);
+	out.set(right.subarray(j), k + left.length - i);
+	return out;
+}
+
+function index(key: SortKey): Uint32Array {
+	return (indexes[key] ??= range(0, dates.length).sort(compare[key]));
+}
+
+function append(rows: Transaction[]) {
+	const start = dates.length;
+	for (const row of rows) {
+		const [day, month, year] = row.date.split("/");
+		dates.push(Number(year) * 10000 + Number(month) * 100 + Number(day));
+		amounts.push(row.amount_cents);
+		types.push(row.transaction_type);
+		operations.push(row.operation_type);
+		descriptions.push(row.description);
+		searchKeys.push(searchKey(row.description));
+	}
+	for (const key of Object.keys(indexes) as SortKey[]) {
+		const added = range(start, dates.length).sort(compare[key]);
+		indexes[key] = merge(indexes[key]!, added, compare[key]);
+	}
+}
+
+function run(q: Query): Uint32Array {
+	const order = index(q.sort);
+	const search = searchKey(q.search.trim());
+	const view = new Uint32Array(order.length);
+	let count = 0;
+	for (let n = 0; n < order.length; n++) {
+		const i = order[q.descending ? order.length - 1 - n : n];
+		if (q.operation && operations[i] !== q.operation) continue;
+		if (q.type && types[i] !== q.type) continue;
+		if (search && !searchKeys[i].includes(search)) continue;
+		view[count++] = i;
+	}
+	return view.slice(0, count);
+}
+
+let pending = false;
+
+// Answer once for a burst of messages (chunks arriving faster than a
+// query runs) rather than once per message
+function post() {
+	if (pending) return;
+	pending = true;
+	setTimeout(() => {
+		pending = false;
+		if (!query) return;
+		const view = run(query);
+		const response: WorkerResponse = { kind: "view", view, resets };
+		postMessage(response, [view.buffer]);
+	});
+}
+
+onmessage = (event: MessageEvent<WorkerRequest>) => {
+	const message = event.data;
+	if (message.kind === "reset") {
+		resets++;
+		dates = [];
+		amounts = [];
+		types = [];
+		operations = [];
+		descriptions = [];
+		searchKeys = [];
+		indexes = {};
+	} else if (message.kind === "append") {
+		append(message.rows);
+	} else {
+		query = message.query;
+	}
+	post();
+};
@@ -18,37 +18,46 @@ export const actions = {
         }
 
         try {
-            // Parse each file in parallel
-            const results = await Promise.all(
-                files.map(async (file) => {
-                    const backendForm = new FormData();
-                    backendForm.append('file', file);
+            // One request for every file; the backend parses them in parallel
+            const backendForm = new FormData();
+            for (const file of files) {
+                backendForm.append('files', file);
+            }
 
-                    const response = await fetch('http://localhost:8000/api/parse', {
-                        method: 'POST',
-                        body: backendForm,
-                    });
+            // include=all: the totals come precomputed for all files together
+            const response = await fetch('http://localhost:8000/api/parse/batch?include=all', {
+                method: 'POST',
+                body: backendForm,
+            });
 
-                    if (!response.ok) {
-                        const errorData = await response
-                            .json()
-                            .catch(() => ({ detail: 'Erro desconhecido' }));
-                        return {
-                            success: false as const,
-                            fileName: file.name,
-                            error: errorData.detail || `Erro do servidor: ${response.status}`,
-                        };
-                    }
+            if (!response.ok) {
+                const errorData = await response
+                    .json()
+                    .catch(() => ({ detail: 'Erro desconhecido' }));
+                return {
+                    success: false,
+                    error: errorData.detail || `Erro do servidor: ${response.status}`,
+                };
+            }
 
-                    const data = await response.json();
-                    return {
-                        success: true as const,
-                        fileName: file.name,
-                        bank: data.bank as string,
-                        transactions: data.transactions as Array<Record<string, unknown>>,
-                        totalTransactions: data.total_transactions as number,
-                    };
-                })
+            const data = (await response.json()) as {
+                results: Array<Record<string, unknown>>;
+                summary: Record<string, unknown>;
+            };
+            const results = data.results.map((r) =>
+                r.success
+                    ? {
+                          success: true as const,
+                          fileName: r.file_name as string,
+                          bank: r.bank as string,
+                          transactions: r.transactions as Array<Record<string, unknown>>,
+                          totalTransactions: r.total_transactions as number,
+                      }
+                    : {
+                          success: false as const,
+                          fileName: r.file_name as string,
+                          error: (r.error as string) || 'Erro desconhecido',
+                      }
             );
 
             const successful = results.filter((r) => r.success);
@@ -76,6 +85,7 @@ export const actions = {
                 banks,
                 transactions: allTransactions,
                 totalTransactions: allTransactions.length,
+                summary: data.summary,
                 fileNames: successful.map((r) => r.fileName),
                 errors: failed.length
                     ? failed.map((r) => `${r.fileName}: ${'error' in r ? r.error : 'Erro'}`)